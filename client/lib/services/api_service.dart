@@ -157,17 +157,12 @@ class ApiService {
   // ------ 4. 문제 관리 & OCR (Problems) ------
   // 4-1. 이미지 OCR 요청 (이미지 -> 텍스트 추출 미리보기)
   Future<Map<String, dynamic>> ocrImage(String username, File imageFile) async {
-    final url = Uri.parse('${Constants.baseUrl}/ocr');
-    // 파일을 바이트로 읽은 후 Base64 문자열로 인코딩하여 전송
-    final bytes = await imageFile.readAsBytes();
-    final base64Image = base64Encode(bytes);
-    final dataUri = 'data:image/jpeg;base64,$base64Image';
+    final url = Uri.parse('${Constants.baseUrl}/ocr/upload');
+    // 파일을 Base64로 변환하지 않고 multipart로 스트리밍 전송
+    final request = http.MultipartRequest('POST', url)
+      ..files.add(await http.MultipartFile.fromPath('file', imageFile.path));
 
-    final response = await http.post(
-      url,
-      headers: {'Content-Type': 'application/json'},
-      body: jsonEncode({'username': username, 'image_data': dataUri}),
-    );
+    final response = await http.Response.fromStream(await request.send());
 
     if (response.statusCode == 200) {
       return jsonDecode(utf8.decode(response.bodyBytes));
@@ -177,7 +172,8 @@ class ApiService {
   }
 
   // 4-2. 문제 최종 저장 (OCR 결과 또는 수정된 내용 저장)
-  Future<void> saveProblem(
+  // 반환값: 같은 폴더에 이미 있는 비슷한 문제 수
+  Future<int> saveProblem(
     String username,
     String tempId, // OCR 요청 시 받은 임시 ID
     int folderId,
@@ -204,6 +200,8 @@ class ApiService {
     if (response.statusCode != 201) {
       throw Exception('저장 실패');
     }
+    final data = jsonDecode(utf8.decode(response.bodyBytes));
+    return (data['duplicates'] as List?)?.length ?? 0;
   }
 
   // 4-3. 폴더의 문제 목록 조회
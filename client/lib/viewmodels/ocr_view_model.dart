@@ -22,6 +22,10 @@ class OcrViewModel extends ChangeNotifier {
   // 저장 요청 시 필요한 임시 ID (OCR 요청 시 서버가 발급)
   String? _tempId;
 
+  // 마지막 저장 시 같은 폴더에 이미 있던 비슷한 문제 수 (안내 메시지용)
+  int _lastDuplicateCount = 0;
+  int get lastDuplicateCount => _lastDuplicateCount;
+
   // 1. 이미지 선택(카메라/갤러리) 및 압축 후 OCR 요청
   Future<void> pickAndScanImage(String username, ImageSource source) async {
     try {
@@ -63,7 +67,7 @@ class OcrViewModel extends ChangeNotifier {
 
     try {
       // 사용자가 수정한 내용과 함께 저장 요청
-      await _api.saveProblem(
+      _lastDuplicateCount = await _api.saveProblem(
         username,
         _tempId!,
         folderId,
@@ -488,9 +488,16 @@ class _OcrPreviewScreenState extends State<OcrPreviewScreen> {
 
                       if (success && context.mounted) {
                         await folderVM.loadFolders(userVM.username);
-                        ScaffoldMessenger.of(
-                          context,
-                        ).showSnackBar(const SnackBar(content: Text("저장 완료!")));
+                        final duplicates = ocrVM.lastDuplicateCount;
+                        ScaffoldMessenger.of(context).showSnackBar(
+                          SnackBar(
+                            content: Text(
+                              duplicates > 0
+                                  ? "저장 완료! (같은 폴더에 비슷한 문제 $duplicates개가 있습니다)"
+                                  : "저장 완료!",
+                            ),
+                          ),
+                        );
                         // 첫 화면(홈)까지 팝
                         Navigator.of(
                           context,
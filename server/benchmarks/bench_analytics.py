@@ -0,0 +1,110 @@
+"""
+점수 분석 조회: 원본 기록 스캔 vs 집계(rollup) 테이블 조회 비교 벤치마크.
+
+사용자 1명에게 --days 일 동안 하루 --per-day 개의 시험 기록을 만들고 (기록과 집계 테이블 모두 채움)
+  - raw    : exam_histories 에서 기간 내 행을 모두 읽어 일/주 단위로 합산
+  - rollup : analytics.score_summary (daily_score_rollups 조회)
+의 조회 시간(p50)과 결과 일치 여부를 출력. 기록 1건 저장 시 집계 갱신 비용도 함께 측정.
+
+실행:
+    cd server
+    python -m benchmarks.bench_analytics --days 730 --per-day 50
+"""
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+from benchmarks import fixtures
+from sqlalchemy import select
+import models, crud
+from utils import analytics
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def seed_histories(user_id, days, per_day):
+    rng = random.Random(7)
+    end = datetime.now(timezone.utc)
+    db = fixtures.session()
+    try:
+        for d in range(days):
+            base = end - timedelta(days=days - 1 - d)
+            rows = [{"user_id": user_id, "score": rng.randint(0, 100),
+                     "solved_date": base - timedelta(seconds=rng.randint(0, 86399))} for _ in range(per_day)]
+            db.execute(models.ExamHistory.__table__.insert(), rows)
+            analytics.record_scores(db, user_id, [(row["score"], row["solved_date"]) for row in rows])
+            if d % 50 == 0:
+                db.commit()
+        db.commit()
+    finally:
+        db.close()
+
+def raw_summary(db, user_id, period, start, end):
+    # 집계 테이블 없이 원본 기록을 모두 읽어 합산 (이전 방식)
+    H = models.ExamHistory
+    since = datetime.combine(start, datetime.min.time(), analytics.ANALYTICS_TIMEZONE) - timedelta(days=1)
+    buckets = {}
+    for score, solved_date in db.execute(select(H.score, H.solved_date).where(H.user_id == user_id, H.solved_date >= since)):
+        day = analytics.local_day(solved_date)
+        if day < start or day > end:
+            continue
+        key = day - timedelta(days=day.weekday()) if period == "week" else day
+        agg = buckets.setdefault(key, [0, 0])
+        agg[0] += 1
+        agg[1] += score
+    return {key.isoformat(): round(total / count, 1) for key, (count, total) in sorted(buckets.items())}
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return result, percentile(samples, 0.5) * 1000
+
+def main(days, per_day, repeat):
+    fixtures.reset_schema()
+    username, = fixtures.seed(num_users=1, folders_per_user=1, problems_per_folder=1)
+    crud.invalidate_user(username)
+    db = fixtures.session()
+    user_id = crud.get_user_id(db, username)
+    start_seed = time.perf_counter()
+    seed_histories(user_id, days, per_day)
+    print(f"seeded {days * per_day} histories in {time.perf_counter() - start_seed:.1f}s")
+
+    ok = True
+    try:
+        for period in ("day", "week"):
+            start, end = analytics.resolve_range(period, analytics.local_day(models.utc_now()) - timedelta(days=days - 1), None)
+            raw, raw_ms = timed(lambda: raw_summary(db, user_id, period, start, end), repeat)
+            rolled, rollup_ms = timed(lambda: analytics.score_summary(db, user_id, period, start, end), repeat)
+            same = raw == {item["start"]: item["average"] for item in rolled["data"]}
+            ok = ok and same
+            print(f"{period:<5} buckets={len(rolled['data']):>4}  raw p50={raw_ms:8.2f} ms  rollup p50={rollup_ms:7.2f} ms  "
+                  f"x{raw_ms / rollup_ms:6.1f}  match={same}")
+
+        # 기록 1건 저장 비용: 기록 insert만 vs 기록 insert + 집계 갱신
+        def write(with_rollup):
+            now = models.utc_now()
+            db.add(models.ExamHistory(user_id=user_id, score=77, solved_date=now))
+            if with_rollup:
+                analytics.record_scores(db, user_id, [(77, now)])
+            db.commit()
+        _, plain_ms = timed(lambda: write(False), repeat)
+        _, rollup_ms = timed(lambda: write(True), repeat)
+        print(f"write p50: history only {plain_ms:.2f} ms, history + rollup {rollup_ms:.2f} ms")
+    finally:
+        db.close()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--per-day", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sys.exit(0 if main(args.days, args.per_day, args.repeat) else 1)
@@ -0,0 +1,64 @@
+"""
+DB 커넥션 풀 크기에 따른 대기 시간 벤치마크.
+
+--threads 개의 스레드가 각각 커넥션을 꺼내 간단한 조회 후 --hold-ms 동안 점유하는 요청을 반복할 때,
+풀 크기(pool_size + max_overflow) 조합별로 처리량, 커넥션 평균/최대 대기 시간, 타임아웃 수를 출력.
+pool_pre_ping 사용 시 커넥션을 꺼낼 때마다 추가되는 비용도 함께 비교.
+
+실행:
+    cd server
+    python -m benchmarks.bench_db_pool --threads 32 --requests 50 --hold-ms 5   # DATABASE_URL 미지정 시 임시 SQLite 사용
+"""
+import time
+import argparse
+import threading
+from benchmarks import fixtures   # DATABASE_URL 기본값 설정 (database보다 먼저 import)
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from database import DATABASE_URL, MeteredQueuePool
+
+CONFIGS = [   # (pool_size, max_overflow, pre_ping)
+    (5, 0, True),
+    (5, 10, True),
+    (20, 10, True),
+    (20, 10, False),
+]
+
+
+def run(pool_size, max_overflow, pre_ping, threads, requests, hold, timeout):
+    engine = create_engine(DATABASE_URL, poolclass=MeteredQueuePool, pool_size=pool_size,
+                           max_overflow=max_overflow, pool_pre_ping=pre_ping, pool_timeout=timeout)
+    failures = []
+
+    def worker():
+        for _ in range(requests):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1")).scalar()
+                    time.sleep(hold)
+            except PoolTimeoutError:
+                failures.append(1)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    pool = engine.pool
+    print(f"pool={pool_size:>2}+{max_overflow:<2} pre_ping={str(pre_ping):<5}  {threads * requests / elapsed:7.0f} req/s  "
+          f"avg wait={pool.wait_seconds / pool.checkouts * 1000:7.2f} ms  max wait={pool.max_wait_seconds * 1000:7.1f} ms  "
+          f"timeouts={pool.timeouts}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--hold-ms", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    for pool_size, max_overflow, pre_ping in CONFIGS:
+        run(pool_size, max_overflow, pre_ping, args.threads, args.requests, args.hold_ms / 1000, args.timeout)
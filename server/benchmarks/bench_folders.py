@@ -0,0 +1,54 @@
+"""
+폴더 목록/오답노트 조회 쿼리 수 및 지연 시간 벤치마크.
+
+기존 방식(관계를 Python에서 순회하는 N+1)과 현재 집계 쿼리 방식을 같은 데이터로 비교.
+
+실행:
+    cd server
+    python -m benchmarks.bench_folders --folders 300 --problems 30
+"""
+import argparse
+from benchmarks import fixtures
+from routers import folders, problems
+import crud
+
+
+# 비교용: 변경 전 구현 (user.folders -> f.problems 순회)
+def legacy_get_folders(request, username, db):
+    user = crud.get_user_by_name(db, username)
+    total_wrong_count = 0
+    for f in user.folders:
+        for p in f.problems:
+            if p.is_wrong_note:
+                total_wrong_count += 1
+    return {"folders": [{"id": f.id, "problem_count": len(f.problems)} for f in user.folders], "wrong_note_count": total_wrong_count}
+
+def legacy_get_wrong_notes(request, username, db):
+    user = crud.get_user_by_name(db, username)
+    return {"problems": {p.id: p.problem_text for f in user.folders for p in f.problems if p.is_wrong_note}}
+
+
+def measure(label, func, username):
+    db = fixtures.session()
+    try:
+        with fixtures.count_queries() as stats:
+            func(request=fixtures.request(), username=username, db=db)
+    finally:
+        db.close()
+    print(f"{label:<28} queries={stats['queries']:>6}  latency={stats['seconds'] * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folders", type=int, default=300)
+    parser.add_argument("--problems", type=int, default=30)
+    args = parser.parse_args()
+
+    fixtures.reset_schema()
+    username = fixtures.seed(folders_per_user=args.folders, problems_per_folder=args.problems)[0]
+    print(f"seeded {args.folders} folders x {args.problems} problems ({fixtures.engine.url.drivername})")
+
+    measure("get_folders (legacy)", legacy_get_folders, username)
+    measure("get_folders", folders.get_folders, username)
+    measure("get_wrong_notes (legacy)", legacy_get_wrong_notes, username)
+    measure("get_wrong_notes", problems.get_wrong_notes, username)
@@ -0,0 +1,64 @@
+"""
+로컬 OCR 백엔드(Tesseract) 처리 시간 벤치마크.
+
+저장소의 예제 이미지(img*.jpg)를 동시에 여러 장 요청하여
+  - 전처리(흑백, 축소, 기울기 보정)만의 시간
+  - 프로세스 풀을 거친 인식 전체 시간 (p50/p95)과 인식된 문제 수
+를 출력. Tesseract와 한국어 언어 데이터(kor)가 설치되어 있어야 함.
+
+실행:
+    cd server
+    OCR_LOCAL_WORKERS=2 python -m benchmarks.bench_local_ocr --rounds 3
+"""
+import os
+import glob
+import time
+import asyncio
+import argparse
+from utils import ocr_backends
+from utils.ocr import parse_clova_ocr_response
+
+IMAGE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+async def main(rounds):
+    paths = sorted(glob.glob(os.path.join(IMAGE_DIR, "img*.jpg")))
+    images = [(os.path.basename(p), open(p, "rb").read()) for p in paths]
+
+    for name, data in images:
+        start = time.perf_counter()
+        processed = ocr_backends._preprocess(data, ocr_backends.OCR_LOCAL_MAX_SIDE, ocr_backends.OCR_LOCAL_MAX_SKEW)
+        print(f"preprocess {name:<10} {processed.size[0]}x{processed.size[1]}  {(time.perf_counter() - start) * 1000:6.1f} ms")
+
+    backend = ocr_backends.TesseractOcrBackend()
+    # 첫 요청에서 워커 생성 / 언어 모델 로드 (측정에서 제외)
+    await backend.recognize(images[0][1], "jpg")
+
+    latencies, problems = [], {}
+    async def one(name, data):
+        start = time.perf_counter()
+        response = await backend.recognize(data, "jpg")
+        latencies.append(time.perf_counter() - start)
+        problems[name] = len(parse_clova_ocr_response(response))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(one(name, data) for name, data in images))
+    elapsed = time.perf_counter() - start
+    await backend.close()
+
+    print(f"workers={ocr_backends.OCR_LOCAL_WORKERS} images={len(latencies)} {len(latencies) / elapsed:.2f} images/s  "
+          f"p50={percentile(latencies, 0.5) * 1000:.0f} ms  p95={percentile(latencies, 0.95) * 1000:.0f} ms")
+    print("problems per image:", problems)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
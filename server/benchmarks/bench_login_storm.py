@@ -0,0 +1,77 @@
+"""
+로그인 폭주 중 다른 엔드포인트 지연 시간 벤치마크.
+
+1) 평상시 GET /folders 지연 시간 측정
+2) 여러 사용자의 로그인 요청을 동시에 쏟아붓는 동안 GET /folders 지연 시간 측정
+bcrypt가 이벤트 루프/스레드풀을 점유하면 2)의 p99가 크게 증가함.
+폭주 중 해싱 대기열 한도(HASH_QUEUE_LIMIT)를 넘는 로그인은 503으로 집계됨.
+
+실행:
+    cd server
+    uvicorn main:app --port 8000
+    python -m benchmarks.bench_login_storm --url http://127.0.0.1:8000 --users 200 --concurrency 64
+"""
+import time
+import asyncio
+import argparse
+import httpx
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+async def probe(client, username, stop: asyncio.Event, latencies):
+    # 다른 API의 응답 시간을 일정 간격으로 측정
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/folders", params={"username": username})
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.02)
+
+async def storm(client, usernames, concurrency, duration, statuses):
+    # concurrency개의 작업자가 사용자를 돌아가며 로그인 요청 (사용자별 시도 제한에 걸리지 않도록 분산)
+    deadline = time.perf_counter() + duration
+
+    async def worker(offset):
+        index = offset
+        while time.perf_counter() < deadline:
+            res = await client.post("/login", json={"username": usernames[index % len(usernames)], "password": "bench-password"})
+            statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+            index += concurrency
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+async def phase(client, label, probe_user, duration, usernames=None, concurrency=0):
+    latencies, statuses = [], {}
+    stop = asyncio.Event()
+    probe_task = asyncio.ensure_future(probe(client, probe_user, stop, latencies))
+    if usernames:
+        await storm(client, usernames, concurrency, duration, statuses)
+    else:
+        await asyncio.sleep(duration)
+    stop.set()
+    await probe_task
+    print(f"{label:<14} GET /folders p50={percentile(latencies, 0.5) * 1000:7.1f} ms  "
+          f"p99={percentile(latencies, 0.99) * 1000:7.1f} ms  samples={len(latencies)}"
+          + (f"  login statuses={statuses}" if statuses else ""))
+
+async def main(url, users, concurrency, duration):
+    usernames = [f"storm_user_{i}" for i in range(users)]
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=httpx.Limits(max_connections=concurrency + 8)) as client:
+        # 준비: 벤치마크용 사용자 생성 (이미 있으면 400 무시)
+        for name in usernames:
+            await client.post("/register", json={"username": name, "password": "bench-password"})
+        await phase(client, "baseline", usernames[0], duration)
+        await phase(client, "login storm", usernames[0], duration, usernames, concurrency)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.users, args.concurrency, args.duration))
@@ -0,0 +1,63 @@
+"""
+요청 지표 수집 / 샘플링 프로파일러 오버헤드 벤치마크.
+
+같은 프로세스에서 GET /folders, GET /problems 를 --requests 번씩 호출하며
+  - off      : METRICS_ENABLED=false 와 같은 상태 (미들웨어 통과만)
+  - metrics  : 처리 시간 히스토그램 + 요청별 SQL 집계
+  - profiler : 위 + 스택 샘플링 (PROFILE_INTERVAL_MS 주기)
+의 요청당 평균/p99 시간을 출력.
+
+실행:
+    cd server
+    python -m benchmarks.bench_metrics_overhead --requests 2000
+"""
+import time
+import argparse
+from benchmarks import fixtures
+from fastapi.testclient import TestClient
+import migrations
+from database import engine
+from utils import metrics
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def measure(client, requests, username, folder_id):
+    samples = []
+    for i in range(requests):
+        start = time.perf_counter()
+        if i % 2:
+            client.get("/folders", params={"username": username})
+        else:
+            client.get("/problems", params={"folder_id": folder_id, "limit": 20})
+        samples.append(time.perf_counter() - start)
+    return sum(samples) / len(samples) * 1000, percentile(samples, 0.99) * 1000
+
+def main(requests):
+    fixtures.reset_schema()
+    migrations.upgrade(engine)
+    username, = fixtures.seed(num_users=1, folders_per_user=20, problems_per_folder=50)
+    import main as app_module
+    client = TestClient(app_module.app)
+    folder_id = client.get("/folders", params={"username": username}).json()["folders"][0]["id"]
+    measure(client, 200, username, folder_id)   # 워밍업
+
+    modes = [
+        ("off", False, None),
+        ("metrics", True, None),
+        ("profiler", True, metrics.SamplingProfiler(metrics.PROFILE_INTERVAL_MS / 1000)),
+    ]
+    for name, enabled, profiler in modes:
+        metrics.METRICS_ENABLED = enabled
+        metrics.profiler = profiler
+        mean_ms, p99_ms = measure(client, requests, username, folder_id)
+        print(f"{name:<9} mean={mean_ms:6.3f} ms  p99={p99_ms:6.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.requests)
@@ -0,0 +1,71 @@
+"""
+POST /ocr 처리량 벤치마크.
+
+가짜 OCR 서버(fake_clova_server.py)를 띄운 상태에서 API 서버에 동시 요청을 보내고
+처리량(req/s)과 지연 시간 분포를 출력.
+기본은 요청마다 다른 이미지를 보내 OCR 결과 캐시를 거치지 않는 처리량을 측정하고,
+--cached를 주면 같은 이미지를 반복해 캐시 적중 시 처리량을 따로 측정.
+
+실행:
+    cd server
+    python -m benchmarks.bench_ocr --url http://127.0.0.1:8000 --requests 200 --concurrency 50
+    python -m benchmarks.bench_ocr --url http://127.0.0.1:8000 --requests 200 --concurrency 50 --cached
+"""
+import os
+import time
+import base64
+import asyncio
+import argparse
+import statistics
+import httpx
+
+# 최소 크기의 JPEG (가짜 OCR 서버는 이미지 내용을 해석하지 않음)
+# 내용 해시 기반 OCR 결과 캐시에 걸리지 않도록 기본은 매번 다른 바이트 사용
+def dummy_image() -> bytes:
+    return b"\xff\xd8\xff\xe0" + os.urandom(2048) + b"\xff\xd9"
+
+def request_body(image: bytes) -> dict:
+    return {"username": "bench", "image_data": "data:image/jpeg;base64," + base64.b64encode(image).decode()}
+
+async def run(url: str, total: int, concurrency: int, cached: bool):
+    # --cached: 같은 이미지를 먼저 한 번 보내 캐시를 채운 뒤 모든 요청이 캐시 적중
+    cached_body = request_body(dummy_image()) if cached else None
+    bodies = [cached_body or request_body(dummy_image()) for _ in range(total)]
+    latencies = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=60.0) as client:
+        if cached:
+            (await client.post("/ocr", json=cached_body)).raise_for_status()
+
+        async def one(body):
+            nonlocal errors
+            async with sem:
+                start = time.perf_counter()
+                res = await client.post("/ocr", json=body)
+                latencies.append(time.perf_counter() - start)
+                if res.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(body) for body in bodies))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"scenario     : {'cached (OCR 결과 캐시 적중)' if cached else 'uncached (요청마다 다른 이미지)'}")
+    print(f"requests     : {total} (concurrency {concurrency})")
+    print(f"errors       : {errors}")
+    print(f"elapsed      : {elapsed:.2f}s")
+    print(f"throughput   : {total / elapsed:.1f} req/s")
+    print(f"latency p50  : {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p99  : {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--cached", action="store_true", help="같은 이미지를 반복해 OCR 결과 캐시 적중 처리량 측정")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency, args.cached))
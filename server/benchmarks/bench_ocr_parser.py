@@ -0,0 +1,93 @@
+"""
+OCR 응답 파서 정확도 / 처리량 벤치마크.
+
+benchmarks/ocr_corpus/의 Clova 형식 응답(<이름>.json)을 파싱하여 expected.json과 비교.
+  - legacy : 변경 전 방식 (inferText를 순서대로 이어 붙이고, '①' 또는 한 자리 숫자로 선지 분리, 한 이미지 = 한 문제)
+  - layout : utils/ocr.py (boundingPoly로 줄/단 복원, 여러 문제 분리)
+
+정확도: 문제 수 일치 여부, 지문/선지가 정답과 정확히 같은 문제 수 (공백 정규화 후 비교)
+처리량: 초당 처리한 필드 수, 페이지당 평균 시간
+
+layout은 legacy보다 처리량이 낮음 (이 코퍼스에서 약 1/7~1/8): legacy는 텍스트를 한 번 이어 붙이기만 하지만,
+layout은 필드마다 좌표 계산 + 줄 묶기(기울기 예측) + 단 분리를 수행하기 때문.
+페이지당 1ms 미만이라 OCR 호출(수백 ms~수 초)에 비해 무시할 수준이며, 결과 출력 마지막 줄에 비율을 표시.
+
+실행:
+    cd server
+    python -m benchmarks.make_ocr_corpus   # 코퍼스 (재)생성
+    python -m benchmarks.bench_ocr_parser --repeat 200
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from benchmarks.make_ocr_corpus import CORPUS_DIR
+from utils.ocr import parse_clova_ocr_response
+
+
+def legacy_parse(response_json):
+    fields = response_json['images'][0]['fields']
+    if not fields:
+        return []
+    texts = [field['inferText'] for field in fields]
+    markers = [i for i, text in enumerate(texts) if re.fullmatch(r'[①②③④⑤]|\d', text)]
+    if not markers:
+        return [{"problem": " ".join(texts).strip(), "choices": []}]
+    choices = [" ".join(texts[start:end]).strip() for start, end in zip(markers, markers[1:] + [len(texts)])]
+    return [{"problem": " ".join(texts[:markers[0]]).strip(), "choices": choices}]
+
+def load_corpus():
+    with open(os.path.join(CORPUS_DIR, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    pages = []
+    for name in sorted(expected):
+        with open(os.path.join(CORPUS_DIR, f"{name}.json"), encoding="utf-8") as f:
+            pages.append((name, json.load(f), expected[name]))
+    return pages
+
+def _norm(text):
+    return " ".join(text.split())
+
+def score(parsed, expected):
+    # (정답과 같은 문제 수, 정답 문제 수, 문제 수 일치 여부)
+    exact = 0
+    for got, want in zip(parsed, expected):
+        if _norm(got["problem"]) == _norm(want["problem"]) and [_norm(c) for c in got["choices"]] == [_norm(c) for c in want["choices"]]:
+            exact += 1
+    return exact, len(expected), len(parsed) == len(expected)
+
+def run(label, parse, pages, repeat, verbose):
+    total_exact = total_problems = count_ok = 0
+    for name, response, expected in pages:
+        exact, problems, count_match = score(parse(response), expected)
+        total_exact += exact
+        total_problems += problems
+        count_ok += count_match
+        if verbose:
+            print(f"  {label:<7} {name:<11} problems={problems} exact={exact} count_match={count_match}")
+
+    fields = sum(len(response["images"][0]["fields"]) for _, response, _ in pages)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, response, _ in pages:
+            parse(response)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<7} exact={total_exact:>3}/{total_problems:<3} page count match={count_ok}/{len(pages)}  "
+          f"{fields * repeat / elapsed:>10.0f} fields/s  {elapsed / (repeat * len(pages)) * 1000:6.3f} ms/page")
+    return total_exact, total_problems, fields * repeat / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    pages = load_corpus()
+    _, _, legacy_rate = run("legacy", legacy_parse, pages, args.repeat, args.verbose)
+    exact, problems, layout_rate = run("layout", parse_clova_ocr_response, pages, args.repeat, args.verbose)
+    print(f"layout throughput = {layout_rate / legacy_rate:.2f}x legacy "
+          f"(per-field geometry, line grouping and column detection vs. a plain text join)")
+    sys.exit(0 if exact == problems else 1)
@@ -0,0 +1,101 @@
+"""
+복습 큐 조회/갱신 벤치마크.
+
+사용자 1명에게 문제 수를 바꿔 가며 (기본 10,000 / 100,000개) 모든 문제의 복습 일정을 만들고
+  - wrong-notes : 기존 오답노트 조회 방식 (사용자 폴더 전체 조인 후 is_wrong_note 필터)
+  - due queue   : review.due_problems (user_id, due_at) 인덱스 범위 조회, 20개
+  - folder queue: review.due_problems (folder_id, due_at) 인덱스 범위 조회, 20개
+의 조회 시간(p50)과, 200문제 채점 결과 일괄 반영(review.apply_results) 시간을 출력.
+문제 수가 10배 늘어도 due queue 조회 시간은 거의 같아야 함.
+
+실행:
+    cd server
+    python -m benchmarks.bench_review_queue --sizes 10000 100000
+"""
+import time
+import random
+import argparse
+from datetime import timedelta
+from benchmarks import fixtures
+from sqlalchemy import select, text
+import models, crud
+from utils import review
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 0.5) * 1000
+
+def seed_schedules(db, user_id):
+    # 모든 문제에 대해 지난 30일 ~ 앞으로 30일 사이 무작위 복습 시각
+    rng = random.Random(3)
+    now = models.utc_now()
+    rows = db.execute(select(models.Problem.id, models.Problem.folder_id)
+                      .join(models.Folder).where(models.Folder.user_id == user_id)).all()
+    batch = []
+    for problem_id, folder_id in rows:
+        batch.append({"problem_id": problem_id, "user_id": user_id, "folder_id": folder_id, "repetitions": 1,
+                      "interval_days": 1.0, "ease": 2.5, "lapses": 0, "reviewed_at": now,
+                      "due_at": now + timedelta(minutes=rng.randint(-30 * 1440, 30 * 1440))})
+        if len(batch) >= 5000:
+            db.execute(models.ReviewSchedule.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(models.ReviewSchedule.__table__.insert(), batch)
+    db.commit()
+    return rows
+
+def wrong_notes(db, user_id):
+    return db.query(models.Problem.id, models.Problem.problem_text, models.Problem.choices, models.Problem.correct_answer)\
+        .join(models.Folder, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user_id, models.Problem.is_wrong_note == True)\
+        .order_by(models.Problem.folder_id, models.Problem.created_at).all()
+
+def run(size, folders, repeat):
+    fixtures.reset_schema()
+    username, = fixtures.seed(num_users=1, folders_per_user=folders, problems_per_folder=size // folders)
+    crud.invalidate_user(username)
+    db = fixtures.session()
+    try:
+        user_id = crud.get_user_id(db, username)
+        problems = seed_schedules(db, user_id)
+        folder_id = problems[0][1]
+
+        scan_ms = timed(lambda: wrong_notes(db, user_id), repeat)
+        due_ms = timed(lambda: review.due_problems(db, user_id, 20), repeat)
+        folder_ms = timed(lambda: review.due_problems(db, user_id, 20, folder_id), repeat)
+
+        rng = random.Random(5)
+        def grade():
+            review.apply_results(db, user_id, [(pid, fid, rng.random() < 0.7) for pid, fid in rng.sample(problems, 200)])
+            db.commit()
+        grade_ms = timed(grade, repeat)
+        print(f"{size:>7} wrong-notes p50={scan_ms:8.2f} ms  due queue p50={due_ms:6.2f} ms  "
+              f"folder queue p50={folder_ms:6.2f} ms  grade 200 p50={grade_ms:6.2f} ms")
+
+        if db.get_bind().dialect.name == "sqlite":
+            S = models.ReviewSchedule
+            stmt = select(S.problem_id).where(S.user_id == user_id, S.due_at <= models.utc_now()).order_by(S.due_at).limit(20)
+            sql = str(stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+            for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)):
+                print("        plan:", row[-1])
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--folders", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.folders, args.repeat)
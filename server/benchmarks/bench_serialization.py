@@ -0,0 +1,79 @@
+"""
+문제 목록 응답 직렬화 비용 벤치마크 (문제 1000개당 ms).
+
+GET /problems, /wrong-notes 와 같은 {"problems": {id: {...}}} 응답을
+  - before   : 응답 모델 없이 dict 반환 (FastAPI jsonable_encoder + 표준 json)
+  - model    : response_model 지정 후 dict 반환 (검증 + 파이썬 객체로 직렬화 + 기본 응답 클래스)
+  - after    : utils/responses.model_response (검증 + pydantic-core로 JSON 바이트 직접 생성)
+  - gzip/br  : after + 응답 압축 (br은 brotli 설치 시)
+방식으로 만들 때의 시간과 응답 크기를 출력.
+
+실행:
+    cd server
+    python -m benchmarks.bench_serialization --sizes 1000 10000 --repeat 20
+"""
+import gzip
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from benchmarks import fixtures
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+import schemas
+from utils import responses
+
+
+def make_payload(size, rng):
+    choices = ["① 보기 1", "② 보기 2", "③ 보기 3", "④ 보기 4", "⑤ 보기 5"]
+    return {"problems": {
+        str(uuid.UUID(int=rng.getrandbits(128))): {
+            "problem": f"{i + 1}. 다음 중 {rng.choice(fixtures.SUBJECTS)}에 대한 설명으로 옳은 것을 고르시오.",
+            "choices": choices,
+            "answer": str(rng.randint(1, 5)),
+            "is_wrong_note": rng.random() < 0.2,
+            "memo": None,
+        } for i in range(size)
+    }}
+
+def measure(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+def main(sizes, repeat):
+    rng = random.Random(42)
+    field = create_model_field(name="response", type_=schemas.ProblemListResponse, mode="serialization")
+    adapter = responses._adapter(schemas.ProblemListResponse)
+    print(f"orjson: {'yes' if responses.orjson else 'no (pydantic-core)'}, brotli: {'yes' if responses.brotli else 'no'}")
+
+    for size in sizes:
+        payload = make_payload(size, rng)
+        cases = {
+            "before": lambda: JSONResponse(jsonable_encoder(payload)).body,
+            "model": lambda: responses.FastJSONResponse(asyncio.run(
+                serialize_response(field=field, response_content=payload, exclude_unset=True))).body,
+            "after": lambda: adapter.dump_json(adapter.validate_python(payload), exclude_unset=True),
+            "gzip": lambda: gzip.compress(adapter.dump_json(adapter.validate_python(payload), exclude_unset=True),
+                                          compresslevel=responses.RESPONSE_GZIP_LEVEL, mtime=0),
+        }
+        if responses.brotli:
+            cases["br"] = lambda: responses.brotli.compress(adapter.dump_json(adapter.validate_python(payload), exclude_unset=True),
+                                                            quality=responses.RESPONSE_BROTLI_QUALITY)
+        print(f"-- {size} problems")
+        for name, fn in cases.items():
+            seconds, body = measure(fn, repeat)
+            print(f"{name:<7} {seconds * 1000:8.2f} ms  ({seconds * 1000 / size * 1000:6.2f} ms / 1k problems)  {len(body) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
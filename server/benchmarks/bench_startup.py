@@ -0,0 +1,79 @@
+"""
+워커 시작 시간 벤치마크.
+
+새 파이썬 프로세스를 --runs 번 띄워 각각
+  - import  : main 모듈 import (라우터, 설정, DB 엔진 생성)
+  - startup : lifespan 시작 (스키마 버전 확인)
+  - first   : 첫 요청 (GET /) 응답
+시간의 중앙값을 출력하고, import 직후 무거운 선택 의존성(httpx, passlib, PIL)이 로드되지 않았는지 확인.
+비교용으로 이전처럼 워커마다 drop_all + create_all을 실행했을 때의 DDL 시간도 출력.
+
+실행:
+    cd server
+    python -m benchmarks.bench_startup --runs 5   # DATABASE_URL 미지정 시 임시 SQLite 사용
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from benchmarks import fixtures
+from database import engine
+import migrations
+
+SERVER_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# 자식 프로세스에서 실행: 단계별 시간(ms)과 로드된 모듈 출력
+CHILD = """
+import sys, time, json
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+lazy = [name for name in ("httpx", "passlib", "PIL") if name in sys.modules]
+from fastapi.testclient import TestClient   # (TestClient 자체가 httpx를 import 하므로 그 전에 확인)
+ready = time.perf_counter()
+with TestClient(main.app) as client:
+    started = time.perf_counter()
+    client.get("/")
+    first = time.perf_counter()
+print(json.dumps({"import": (imported - start) * 1000, "startup": (started - ready) * 1000,
+                  "first": (first - started) * 1000, "loaded": lazy}))
+"""
+
+LEGACY = """
+import time, json
+import models
+from database import engine
+start = time.perf_counter()
+models.Base.metadata.drop_all(bind=engine)
+models.Base.metadata.create_all(bind=engine)
+print(json.dumps({"ddl": (time.perf_counter() - start) * 1000}))
+"""
+
+def spawn(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, env=dict(os.environ),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main(runs):
+    print("migrations applied:", migrations.upgrade(engine) or "(none)")
+    samples = [spawn(CHILD) for _ in range(runs)]
+    for key in ("import", "startup", "first"):
+        print(f"{key:<8} median={statistics.median(s[key] for s in samples):7.1f} ms")
+    print("optional deps loaded at import:", samples[-1]["loaded"] or "none")
+
+    # 이전 방식: 워커마다 스키마 삭제/재생성 (데이터도 삭제됨) -> 비교 후 스키마 복구
+    legacy = [spawn(LEGACY)["ddl"] for _ in range(runs)]
+    print(f"legacy drop_all+create_all per worker median={statistics.median(legacy):7.1f} ms (data wiped)")
+    fixtures.reset_schema()
+    with engine.begin() as conn:
+        conn.execute(migrations.schema_migrations.delete())
+    migrations.upgrade(engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,85 @@
+"""
+문제 내보내기/가져오기 처리량 및 메모리 사용량 벤치마크.
+
+문제 수를 바꿔 가며 (기본 10,000 / 100,000개)
+  1) export : 서버 측 커서로 읽어 NDJSON(gzip) 파일로 기록
+  2) import : 사용자의 문제를 지운 뒤 파일에서 일괄 insert로 복원
+  3) reimport: 같은 파일을 다시 가져와 모두 건너뛰는지 확인 (Problem.id 기준 멱등)
+각 단계의 소요 시간을 출력하고, --memory 지정 시 tracemalloc 최대 메모리도 출력
+(문제 수가 늘어도 최대 메모리가 거의 같아야 함, tracemalloc 사용 시 처리 속도는 몇 배 느려짐).
+
+실행:
+    cd server
+    python -m benchmarks.bench_transfer --sizes 10000 100000 --memory
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import tracemalloc
+from benchmarks import fixtures
+from sqlalchemy import delete, select
+import models, crud
+from utils.transfer import export_records, encode_ndjson, import_records, read_lines
+
+
+TRACE_MEMORY = False
+
+def measure(func):
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if TRACE_MEMORY:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+def run(size, folders):
+    fixtures.reset_schema()
+    username, = fixtures.seed(num_users=1, folders_per_user=folders, problems_per_folder=size // folders)
+    crud.invalidate_user(username)   # 스키마를 다시 만들었으므로 이전 실행의 사용자 ID 캐시 제거
+    path = os.path.join(tempfile.gettempdir(), f"snapsolve_export_{size}.ndjson.gz")
+    db = fixtures.session()
+    try:
+        user_id = crud.get_user_id(db, username)
+
+        def export():
+            with open(path, "wb") as f:
+                for chunk in encode_ndjson(export_records(db, user_id, username), compress=True):
+                    f.write(chunk)
+            return os.path.getsize(path)
+        file_size, elapsed, peak = measure(export)
+        print(f"{size:>7} export    {elapsed:6.2f}s  {size / elapsed:>9.0f} rows/s  peak={peak:6.1f} MiB  file={file_size / 1024 / 1024:.1f} MiB")
+
+        folder_ids = select(models.Folder.id).where(models.Folder.user_id == user_id).scalar_subquery()
+        db.execute(delete(models.Problem).where(models.Problem.folder_id.in_(folder_ids)))
+        db.commit()
+
+        def restore():
+            with open(path, "rb") as f:
+                return import_records(db, user_id, read_lines(f))
+        result, elapsed, peak = measure(restore)
+        print(f"{size:>7} import    {elapsed:6.2f}s  {size / elapsed:>9.0f} rows/s  peak={peak:6.1f} MiB  inserted={result['problems_inserted']}")
+        ok = result["problems_inserted"] == size
+
+        result, elapsed, peak = measure(restore)
+        print(f"{size:>7} reimport  {elapsed:6.2f}s  {size / elapsed:>9.0f} rows/s  peak={peak:6.1f} MiB  skipped={result['problems_skipped']}")
+        return ok and result["problems_inserted"] == 0 and result["problems_skipped"] == size
+    finally:
+        db.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--folders", type=int, default=50)
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+    TRACE_MEMORY = args.memory
+    ok = all([run(size, args.folders) for size in args.sizes])
+    sys.exit(0 if ok else 1)
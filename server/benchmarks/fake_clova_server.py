@@ -0,0 +1,67 @@
+"""
+벤치마크용 가짜 Clova OCR 서버.
+
+실제 Clova API 대신 고정된 OCR 응답을 지연 시간(FAKE_OCR_LATENCY)만큼 기다린 뒤 반환.
+FAKE_OCR_ERROR_RATE 비율만큼 503을 반환하여 재시도 동작도 확인할 수 있음.
+
+실행:
+    cd server
+    uvicorn benchmarks.fake_clova_server:app --port 9000
+    (API 서버는 CLOVA_OCR_URL=http://127.0.0.1:9000/ocr, CLOVA_OCR_SECRET=dummy 로 실행)
+"""
+import os
+import time
+import random
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+FAKE_OCR_LATENCY = float(os.getenv("FAKE_OCR_LATENCY", "0.3"))        # 응답 지연 (초)
+FAKE_OCR_ERROR_RATE = float(os.getenv("FAKE_OCR_ERROR_RATE", "0.0"))  # 503 반환 비율 (0~1)
+
+# 문제 1개 + 선지 5개로 구성된 샘플 OCR 필드
+SAMPLE_TEXTS = [
+    "1.", "다음", "중", "옳은", "것은?",
+    "①", "사과", "②", "바나나", "③", "포도", "④", "딸기", "⑤", "수박",
+]
+
+app = FastAPI()
+
+def build_fields(texts):
+    fields = []
+    for i, text in enumerate(texts):
+        x = 20 + (i % 8) * 60
+        y = 20 + (i // 8) * 40
+        fields.append({
+            "valueType": "ALL",
+            "inferText": text,
+            "inferConfidence": 0.99,
+            "type": "NORMAL",
+            "lineBreak": (i % 8) == 7,
+            "boundingPoly": {"vertices": [
+                {"x": x, "y": y}, {"x": x + 50, "y": y},
+                {"x": x + 50, "y": y + 30}, {"x": x, "y": y + 30},
+            ]},
+        })
+    return fields
+
+@app.post("/ocr")
+async def fake_ocr(request: Request):
+    # 업로드 본문은 읽기만 하고 파싱하지 않음 (multipart 파서 의존성 불필요)
+    await request.body()
+    await asyncio.sleep(FAKE_OCR_LATENCY)
+    if random.random() < FAKE_OCR_ERROR_RATE:
+        return JSONResponse(status_code=503, content={"message": "Service Unavailable"})
+
+    return {
+        "version": "V2",
+        "requestId": "fake",
+        "timestamp": int(time.time() * 1000),
+        "images": [{
+            "uid": "fake",
+            "name": "temp_image",
+            "inferResult": "SUCCESS",
+            "message": "SUCCESS",
+            "fields": build_fields(SAMPLE_TEXTS),
+        }],
+    }
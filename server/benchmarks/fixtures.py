@@ -0,0 +1,110 @@
+"""
+벤치마크용 DB 준비/더미 데이터 생성 헬퍼.
+
+DATABASE_URL을 지정하지 않으면 임시 SQLite 파일을 사용.
+database 모듈이 import 시점에 엔진을 만들기 때문에, 반드시 database/models보다 먼저 import 할 것.
+"""
+import os
+import time
+import random
+import tempfile
+from contextlib import contextmanager
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "snapsolve_bench.db") + "?timeout=30"
+
+from sqlalchemy import event, select
+from starlette.requests import Request
+from database import engine, SessionLocal
+import models, migrations
+from utils.text_index import build_search_text
+
+SUBJECTS = ["광합성", "세포 분열", "삼각함수", "미분", "조선 시대", "임진왜란", "관계대명사", "가정법", "원소 주기율", "산과 염기"]
+
+
+def reset_schema():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+
+
+def reset_database():
+    """
+    스키마를 비우고 마이그레이션을 처음부터 적용 (API 서버 워커는 시작 시 스키마 버전을 확인하므로 서버를 띄우는 벤치마크용).
+    """
+    models.Base.metadata.drop_all(bind=engine)
+    migrations.schema_migrations.drop(bind=engine, checkfirst=True)
+    migrations.upgrade(engine)
+
+
+def seed(num_users: int = 1, folders_per_user: int = 100, problems_per_folder: int = 20, wrong_ratio: float = 0.2, seed_value: int = 42):
+    """
+    사용자/폴더/문제 더미 데이터를 bulk insert로 생성하고 사용자 이름 목록을 반환.
+    """
+    rng = random.Random(seed_value)
+    usernames = [f"bench_user_{u}" for u in range(num_users)]
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [
+            {"username": name, "password_hash": "x", "total_solved": 0, "total_correct": 0} for name in usernames
+        ])
+        user_ids = conn.execute(select(models.User.id).where(models.User.username.in_(usernames))).scalars().all()
+
+        conn.execute(models.Folder.__table__.insert(), [
+            {"name": f"폴더 {f}", "color": "0xFF1E2B58", "user_id": user_id}
+            for user_id in user_ids for f in range(folders_per_user)
+        ])
+        folder_ids = conn.execute(select(models.Folder.id).where(models.Folder.user_id.in_(user_ids))).scalars().all()
+
+        # Core insert는 ORM 이벤트를 거치지 않으므로 search_text도 직접 채움
+        choices = ["① 보기 1", "② 보기 2", "③ 보기 3", "④ 보기 4", "⑤ 보기 5"]
+        batch = []
+        for folder_id in folder_ids:
+            for p in range(problems_per_folder):
+                problem_text = f"{p + 1}. 다음 중 {rng.choice(SUBJECTS)}에 대한 설명으로 옳은 것을 고르시오."
+                batch.append({
+                    "id": models.generate_uuid(),
+                    "problem_text": problem_text,
+                    "choices": choices,
+                    "search_text": build_search_text(problem_text, choices, None),
+                    "created_at": models.utc_now(),
+                    "correct_answer": str(rng.randint(1, 5)),
+                    "folder_id": folder_id,
+                    "is_wrong_note": rng.random() < wrong_ratio,
+                    "memo": None,
+                })
+                if len(batch) >= 5000:
+                    conn.execute(models.Problem.__table__.insert(), batch)
+                    batch = []
+        if batch:
+            conn.execute(models.Problem.__table__.insert(), batch)
+    return usernames
+
+
+@contextmanager
+def count_queries():
+    """
+    블록 안에서 실행된 SQL 문 개수와 소요 시간을 측정.
+    사용: with count_queries() as stats: ...  ->  stats["queries"], stats["seconds"]
+    """
+    stats = {"queries": 0, "seconds": 0.0}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        stats["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] = time.perf_counter() - start
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def session():
+    return SessionLocal()
+
+def request(path: str = "/", accept_encoding: str = "") -> Request:
+    """
+    라우터 함수를 직접 호출할 때 넘길 최소 Request (Accept-Encoding 지정 시 압축 응답 경로까지 측정).
+    """
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers})
@@ -0,0 +1,465 @@
+"""
+API 부하 테스트 (전체 라우터, 엔드포인트별 처리량 / p50·p95·p99, JSON 결과 저장).
+
+1) --scale 규모의 더미 데이터 생성 (1k / 100k / 1m 문제, 같은 시드로 항상 같은 데이터)
+2) 가짜 Clova 서버(benchmarks.fake_clova_server)와 API 서버(uvicorn main:app)를 하위 프로세스로 실행
+3) --concurrency 명의 가상 사용자가 워밍업 후 --duration 초 동안 시나리오를 가중치에 따라 반복
+   (폴더/문제 조회, 검색, 시험 출제·채점, 점수 기록, 분석, 복습 큐, OCR -> 문제 저장, 백업, 로그인 ...)
+4) 엔드포인트별 요청 수, 처리량, 오류 수, p50/p95/p99를 출력하고 --out JSON 파일로 저장
+   --compare 로 이전 결과를 지정하면 엔드포인트별 p95/처리량 변화를 출력하고,
+   p95가 --threshold 비율 이상 느려진 엔드포인트가 있으면 종료 코드 1 (요청 수가 --min-requests 미만인 엔드포인트는 제외)
+
+실행:
+    cd server
+    python -m benchmarks.load_test --scale 1k --concurrency 32 --duration 30 --out benchmarks/results/main-1k.json
+    python -m benchmarks.load_test --scale 1k --concurrency 32 --duration 30 --compare benchmarks/results/main-1k.json
+    # DATABASE_URL 미지정 시 임시 SQLite, PostgreSQL은 DATABASE_URL=postgresql://... 지정
+    # --reuse: 같은 규모의 데이터가 이미 있으면 다시 생성하지 않음 (1m 생성은 수 분 소요)
+    # --url: 이미 실행 중인 API 서버 사용 (같은 DATABASE_URL로 실행되어 있어야 함, OCR 설정은 서버 쪽 환경 변수)
+"""
+import os
+import sys
+import json
+import time
+import base64
+import random
+import signal
+import asyncio
+import argparse
+import platform
+import subprocess
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from benchmarks import fixtures
+import httpx
+from sqlalchemy import func, select
+from database import engine
+import models
+from utils import analytics
+
+SERVER_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# 규모별 (사용자 수, 사용자당 폴더 수, 폴더당 문제 수)
+SCALES = {
+    "1k": (10, 10, 10),
+    "100k": (100, 50, 20),
+    "1m": (1000, 50, 20),
+}
+HISTORY_DAYS = 30           # 사용자별로 미리 넣어 두는 점수 기록 일수 (분석/이력 조회용)
+LOGIN_USERS = 64            # 로그인 시나리오용 사용자 수 (사용자별 로그인 시도 제한에 걸리지 않도록 분산)
+LOGIN_PASSWORD = "bench-password"
+PROBLEM_POOL_SIZE = 200     # 사용자별로 기억해 두는 문제 ID 수 (채점/수정 시나리오용)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def fake_image(rng):
+    # OCR 결과 캐시에 걸리지 않도록 매번 다른 바이트 (가짜 Clova 서버는 내용을 보지 않음)
+    return b"\x89PNG\r\n\x1a\n" + rng.randbytes(2048)
+
+
+# ------ 데이터 준비 ------
+def seed_histories(usernames, days):
+    """
+    사용자별로 최근 days일 동안 하루 한 번의 점수 기록과 집계 테이블을 생성.
+    """
+    rng = random.Random(7)
+    now = models.utc_now()
+    db = fixtures.session()
+    try:
+        user_ids = db.execute(select(models.User.id).where(models.User.username.in_(usernames))).scalars().all()
+        for user_id in user_ids:
+            entries = [(rng.randint(40, 100), now - timedelta(days=d)) for d in range(days)]
+            db.execute(models.ExamHistory.__table__.insert(), [
+                {"user_id": user_id, "score": score, "solved_date": solved_at} for score, solved_at in entries
+            ])
+            analytics.record_scores(db, user_id, entries)
+        db.commit()
+    finally:
+        db.close()
+
+def prepare_data(scale, reuse):
+    num_users, folders_per_user, problems_per_folder = SCALES[scale]
+    expected = num_users * folders_per_user * problems_per_folder
+    if reuse:
+        try:
+            with engine.connect() as conn:
+                seeded = conn.execute(select(func.count()).select_from(models.Problem)).scalar()
+        except Exception:
+            seeded = None
+        if seeded == expected:
+            print(f"reusing existing data ({expected} problems)")
+            return
+    start = time.perf_counter()
+    fixtures.reset_database()
+    usernames = fixtures.seed(num_users=num_users, folders_per_user=folders_per_user, problems_per_folder=problems_per_folder)
+    seed_histories(usernames, HISTORY_DAYS)
+    print(f"seeded {num_users} users / {num_users * folders_per_user} folders / {expected} problems "
+          f"in {time.perf_counter() - start:.1f}s")
+
+def load_users():
+    # username -> 폴더 ID 목록 (로그인 전용 사용자 제외)
+    with engine.connect() as conn:
+        rows = conn.execute(select(models.User.username, models.Folder.id)
+                            .join(models.Folder, models.Folder.user_id == models.User.id)
+                            .where(models.User.username.like("bench_user_%"))
+                            .order_by(models.Folder.id)).all()
+    folders = defaultdict(list)
+    for username, folder_id in rows:
+        folders[username].append(folder_id)
+    return [VirtualUser(username, folder_ids) for username, folder_ids in sorted(folders.items())]
+
+
+# ------ 부하 생성 ------
+class VirtualUser:
+    def __init__(self, username, folder_ids):
+        self.username = username
+        self.folder_ids = folder_ids
+        self.problem_ids = []       # 시험 출제 응답에서 얻은 문제 ID
+
+    def remember(self, problem_ids):
+        self.problem_ids = (self.problem_ids + list(problem_ids))[-PROBLEM_POOL_SIZE:]
+
+class LoadClient:
+    """
+    요청을 보내고 엔드포인트(라우트 템플릿)별 응답 시간과 상태 코드를 기록.
+    """
+    def __init__(self, client):
+        self.client = client
+        self.recording = False
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    async def call(self, name, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            res = await self.client.request(method, url, **kwargs)
+            status = res.status_code
+        except httpx.HTTPError as e:
+            res, status = None, type(e).__name__
+        if self.recording:
+            self.samples[name].append(time.perf_counter() - start)
+            self.statuses[name][status] += 1
+        return res if res is not None and res.status_code < 400 else None
+
+async def browse_folders(lc, user, rng):
+    await lc.call("GET /folders", "GET", "/folders", params={"username": user.username})
+
+async def list_problems(lc, user, rng):
+    res = await lc.call("GET /problems", "GET", "/problems", params={"folder_id": rng.choice(user.folder_ids), "limit": 50})
+    if res and res.json().get("next_cursor"):
+        await lc.call("GET /problems", "GET", "/problems", params={
+            "folder_id": res.request.url.params["folder_id"], "limit": 50, "cursor": res.json()["next_cursor"]})
+
+async def wrong_notes(lc, user, rng):
+    await lc.call("GET /wrong-notes", "GET", "/wrong-notes", params={"username": user.username})
+
+async def search(lc, user, rng):
+    await lc.call("GET /problems/search", "GET", "/problems/search", params={"username": user.username, "q": rng.choice(fixtures.SUBJECTS)})
+
+async def take_exam(lc, user, rng):
+    res = await lc.call("POST /exams", "POST", "/exams", json={"username": user.username, "count": 20})
+    if not res:
+        return
+    problem_ids = list(res.json()["problems"])
+    user.remember(problem_ids)
+    if problem_ids:
+        await lc.call("POST /exams/submissions", "POST", "/exams/submissions", json={
+            "username": user.username, "answers": {pid: str(rng.randint(1, 5)) for pid in problem_ids}, "unmark_correct": True})
+
+async def solve_problem(lc, user, rng):
+    if not user.problem_ids:
+        return await take_exam(lc, user, rng)
+    await lc.call("POST /problems/{problem_id}/submissions", "POST", f"/problems/{rng.choice(user.problem_ids)}/submissions",
+                  json={"user_answer": str(rng.randint(1, 5))})
+
+async def edit_problem(lc, user, rng):
+    if not user.problem_ids:
+        return await take_exam(lc, user, rng)
+    await lc.call("PUT /problems/{problem_id}", "PUT", f"/problems/{rng.choice(user.problem_ids)}",
+                  json={"correct_answer": str(rng.randint(1, 5))})
+
+async def update_stats(lc, user, rng):
+    solved = rng.randint(1, 20)
+    await lc.call("PUT /user/stats", "PUT", "/user/stats", json={
+        "username": user.username, "solved_count": solved, "correct_count": rng.randint(0, solved)})
+
+async def record_history(lc, user, rng):
+    await lc.call("POST /history", "POST", "/history", json={"username": user.username, "score": rng.randint(0, 100)})
+
+async def view_history(lc, user, rng):
+    await lc.call("GET /history", "GET", "/history", params={"username": user.username})
+
+async def score_analytics(lc, user, rng):
+    await lc.call("GET /analytics/scores", "GET", "/analytics/scores", params={"username": user.username, "period": rng.choice(["day", "week"])})
+
+async def folder_analytics(lc, user, rng):
+    await lc.call("GET /analytics/folders", "GET", "/analytics/folders", params={"username": user.username})
+
+async def due_reviews(lc, user, rng):
+    await lc.call("GET /reviews/due", "GET", "/reviews/due", params={"username": user.username})
+
+async def folder_lifecycle(lc, user, rng):
+    # 생성 -> 수정 -> 삭제 (데이터 규모 유지)
+    res = await lc.call("POST /folders", "POST", "/folders", json={"username": user.username, "folder_name": f"load {rng.random():.8f}"})
+    if not res:
+        return
+    folder_id = res.json()["id"]
+    await lc.call("PUT /folders/{folder_id}", "PUT", f"/folders/{folder_id}", json={
+        "username": user.username, "new_name": f"load {rng.random():.8f}", "new_color": "0xFF58C1E2"})
+    await lc.call("DELETE /folders/{folder_id}", "DELETE", f"/folders/{folder_id}", params={"username": user.username})
+
+async def ocr_and_save(lc, user, rng):
+    # OCR -> 문제 저장 -> 삭제 (데이터 규모 유지)
+    image_data = "data:image/png;base64," + base64.b64encode(fake_image(rng)).decode()
+    res = await lc.call("POST /ocr", "POST", "/ocr", json={"username": user.username, "image_data": image_data})
+    if not res:
+        return
+    res = await lc.call("POST /problems", "POST", "/problems", json={
+        "username": user.username, "temp_id": res.json()["temp_id"], "folder_id": rng.choice(user.folder_ids),
+        "correct_answer": "1", "allow_duplicate": True})
+    if res:
+        await lc.call("DELETE /problems/{problem_id}", "DELETE", f"/problems/{res.json()['id']}")
+
+async def ocr_upload(lc, user, rng):
+    await lc.call("POST /ocr/upload", "POST", "/ocr/upload",
+                  files={"file": ("page.png", fake_image(rng), "image/png")})
+
+async def ocr_batch(lc, user, rng):
+    await lc.call("POST /ocr/batch", "POST", "/ocr/batch", data={"username": user.username},
+                  files=[("files", (f"page{i}.png", fake_image(rng), "image/png")) for i in range(3)])
+
+async def ocr_stats(lc, user, rng):
+    await lc.call("GET /ocr/stats", "GET", "/ocr/stats")
+
+async def backup(lc, user, rng):
+    # 내보낸 파일을 그대로 다시 가져옴 (이미 있는 문제/기록은 건너뛰므로 데이터 규모 유지)
+    res = await lc.call("GET /export", "GET", "/export", params={"username": user.username, "gzip": True})
+    if res:
+        await lc.call("POST /import", "POST", "/import", data={"username": user.username},
+                      files={"file": ("backup.ndjson.gz", res.content, "application/gzip")})
+
+async def login(lc, user, rng):
+    await lc.call("POST /login", "POST", "/login", json={"username": f"load_login_{rng.randrange(LOGIN_USERS)}", "password": LOGIN_PASSWORD})
+
+# (가중치, 시나리오) - 조회 위주의 실제 사용 비율을 가정
+SCENARIOS = [
+    (20, browse_folders),
+    (15, list_problems),
+    (5, wrong_notes),
+    (5, search),
+    (5, take_exam),
+    (10, solve_problem),
+    (2, edit_problem),
+    (3, update_stats),
+    (2, record_history),
+    (5, view_history),
+    (3, score_analytics),
+    (2, folder_analytics),
+    (5, due_reviews),
+    (2, folder_lifecycle),
+    (3, ocr_and_save),
+    (1, ocr_upload),
+    (1, ocr_batch),
+    (1, ocr_stats),
+    (1, backup),
+    (2, login),
+]
+
+async def virtual_user(lc, users, rng, deadline):
+    weights = [weight for weight, _ in SCENARIOS]
+    scenarios = [scenario for _, scenario in SCENARIOS]
+    while time.perf_counter() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        await scenario(lc, rng.choice(users), rng)
+
+async def drive(url, users, concurrency, warmup, duration, seed):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        lc = LoadClient(client)
+        # 로그인 시나리오용 사용자 (이미 있으면 400 무시)
+        for i in range(LOGIN_USERS):
+            await client.post("/register", json={"username": f"load_login_{i}", "password": LOGIN_PASSWORD})
+
+        rngs = [random.Random(seed * 1000 + i) for i in range(concurrency)]
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(virtual_user(lc, users, rng, deadline) for rng in rngs))
+        lc.recording = True
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(lc, users, rng, start + duration) for rng in rngs))
+        elapsed = time.perf_counter() - start
+        lc.recording = False
+        db_stats = (await client.get("/stats/db")).json()
+    return lc, elapsed, db_stats
+
+
+# ------ 서버 실행 ------
+def start_server(app, port, env, workers=1):
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=SERVER_DIR, env=env,
+    )
+
+def wait_until_ready(url, proc, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버가 시작되지 않았습니다 (exit code {proc.returncode}): {url}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"서버 시작 대기 시간 초과: {url}")
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ------ 결과 ------
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=SERVER_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def summarize(lc, elapsed):
+    endpoints = {}
+    for name in sorted(lc.samples):
+        samples = lc.samples[name]
+        statuses = lc.statuses[name]
+        endpoints[name] = {
+            "requests": len(samples),
+            "rps": round(len(samples) / elapsed, 2),
+            "errors": sum(count for status, count in statuses.items() if not isinstance(status, int) or status >= 400),
+            "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "max_ms": round(max(samples) * 1000, 2),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    errors = sum(e["errors"] for e in endpoints.values())
+    return endpoints, {"requests": total, "rps": round(total / elapsed, 2), "errors": errors}
+
+def print_report(endpoints, total):
+    print(f"{'endpoint':<40} {'reqs':>6} {'rps':>8} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for name, e in endpoints.items():
+        print(f"{name:<40} {e['requests']:>6} {e['rps']:>8.1f} {e['errors']:>5} {e['p50_ms']:>8.1f} {e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f}")
+    print(f"{'TOTAL':<40} {total['requests']:>6} {total['rps']:>8.1f} {total['errors']:>5}")
+
+def compare(endpoints, baseline_path, threshold, min_requests):
+    """
+    이전 결과와 엔드포인트별 p95/처리량 비교. p95가 threshold 비율 이상 늘어난 엔드포인트 목록 반환.
+    (두 결과 모두 요청 수가 min_requests 이상인 엔드포인트만 판정 - 표본이 적으면 p95 편차가 큼)
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\ncompared with {baseline_path} (commit {baseline['meta'].get('commit')}, scale {baseline['meta'].get('scale')})")
+    regressions = []
+    for name, e in endpoints.items():
+        before = baseline["endpoints"].get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = e["p95_ms"] / before["p95_ms"] - 1
+        marker = ""
+        if change >= threshold and min(e["requests"], before["requests"]) >= min_requests:
+            regressions.append(name)
+            marker = "  REGRESSION"
+        print(f"{name:<40} p95 {before['p95_ms']:>8.1f} -> {e['p95_ms']:>8.1f} ms ({change:+6.1%})  "
+              f"rps {before['rps']:>7.1f} -> {e['rps']:>7.1f}{marker}")
+    return regressions
+
+
+def main(args):
+    # SIGTERM(timeout 등)으로 종료될 때도 finally에서 하위 서버 프로세스를 정리
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    prepare_data(args.scale, args.reuse)
+    users = load_users()
+
+    processes = []
+    url = args.url
+    try:
+        if not url:
+            env = dict(os.environ)
+            env["FAKE_OCR_LATENCY"] = str(args.ocr_latency)
+            processes.append(start_server("benchmarks.fake_clova_server:app", args.port + 1, env))
+            wait_until_ready(f"http://127.0.0.1:{args.port + 1}/", processes[-1])
+
+            env.update({"OCR_BACKEND": "clova", "CLOVA_OCR_URL": f"http://127.0.0.1:{args.port + 1}/ocr", "CLOVA_OCR_SECRET": "dummy"})
+            if args.workers > 1:
+                # OCR 임시 결과를 워커끼리 공유 (다른 워커에서 문제 저장 요청을 받을 수 있음)
+                env.setdefault("TEMP_STORE_BACKEND", "sqlite")
+            url = f"http://127.0.0.1:{args.port}"
+            processes.append(start_server("main:app", args.port, env, args.workers))
+            wait_until_ready(url + "/", processes[-1])
+
+        lc, elapsed, db_stats = asyncio.run(drive(url, users, args.concurrency, args.warmup, args.duration, args.seed))
+    finally:
+        for proc in reversed(processes):
+            stop_server(proc)
+
+    endpoints, total = summarize(lc, elapsed)
+    print_report(endpoints, total)
+    num_users, folders_per_user, problems_per_folder = SCALES[args.scale]
+    result = {
+        "meta": {
+            "commit": git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "scale": args.scale,
+            "users": len(users),
+            "problems": num_users * folders_per_user * problems_per_folder,
+            "database": engine.dialect.name,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "warmup": args.warmup,
+            "duration": round(elapsed, 2),
+            "ocr_latency": args.ocr_latency,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "total": total,
+        "endpoints": endpoints,
+        "db_pool": db_stats,
+    }
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"saved {args.out}")
+    if args.compare and compare(endpoints, args.compare, args.threshold, args.min_requests):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=list(SCALES), default="1k")
+    parser.add_argument("--reuse", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8100)   # 가짜 Clova 서버는 port + 1
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--ocr-latency", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-requests", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,232 @@
+"""
+OCR 파서 벤치마크용 코퍼스 생성.
+
+저장소의 예제 이미지(img01~img13)를 줄 단위로 옮겨 적은 내용(글자, 줄 위치, 글자 높이, 기울기)으로
+Clova OCR 응답과 같은 형식(단어별 inferText + boundingPoly + lineBreak)의 JSON을 만들고,
+정답(문제 지문/선지)을 expected.json에 함께 기록.
+  - 좌표는 이미지를 보고 측정한 근삿값 (단어 폭은 글자 수로 추정, 약간의 y 흔들림 포함)
+  - img03은 사진이 휘어 위쪽 줄이 오른쪽으로 갈수록 내려감 -> 줄별 기울기로 재현
+  - two_column은 img11/img12/img13을 2단으로 배치한 합성 페이지 (12번 선지 ③④가 오른쪽 단으로 넘어감)
+  - 필드 순서는 Clova처럼 페이지 전체를 위->아래로 훑은 순서 (2단 페이지에서는 좌우 단이 섞임)
+
+실제 Clova 응답을 기록했다면 같은 디렉터리에 <이름>.json으로 넣고 expected.json에 정답을 추가하면 됨.
+
+실행:
+    cd server
+    python -m benchmarks.make_ocr_corpus
+"""
+import os
+import copy
+import json
+import random
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "ocr_corpus")
+
+# ------ 이미지별 문제 (줄: (x, 윗변 y, 글자 높이, 텍스트[, 기울기]), 좌표는 표시 크기 기준) ------
+# scale: 표시 크기 -> 원본 이미지 픽셀 배율
+PAGES = {
+    "img01": {"size": (2605, 3443), "scale": 1.72, "problems": [
+        {"number": (115, 35, 40, "10"),
+         "stem": [(255, 45, 40, "엔터티의 특징으로 가장 적절하지 않은 것은?")],
+         "choices": [
+             [(262, 150, 40, "① 속성이 없는 엔터티는 있을 수 없다. 엔터티는 반드시 속성을 가져야"), (312, 215, 40, "한다.")],
+             [(262, 278, 40, "② 엔터티는 다른 엔터티와 관계가 있어야 한다. 단, 통계성 엔터티나, 코드성"), (312, 340, 40, "엔터티의 경우 관계를 생략할 수 있다.")],
+             [(262, 403, 40, "③ 객체 지향의 디자인 패턴에는 싱글턴패턴이 있어 하나의 인스턴스를"), (312, 468, 40, "가지는 클래스가 존재한다. 이와 유사하게 엔터티는 한 개의 인스턴스를"), (312, 530, 40, "가지는 것만으로도 충분한 의미를 부여할 수 있다.")],
+             [(258, 595, 40, "④ 데이터로서 존재하지만 업무에서 필요로 하지 않으면 해당 업무의 엔터티로"), (312, 660, 40, "성립될 수 없다.")],
+         ]},
+        {"number": (90, 930, 40, "11"),
+         "stem": [(235, 940, 40, "엔터티의 일반적인 특징으로 가장 적절하지 않은 것은?")],
+         "choices": [
+             [(245, 1058, 40, "① 다른 엔터티와의 관계를 가지지 않는다.")],
+             [(245, 1125, 40, "② 유일한 식별자에 의해 식별이 가능해야 한다.")],
+             [(245, 1193, 40, "③ 엔터티는 업무 프로세스에 의해 이용되어야 한다.")],
+             [(245, 1260, 40, "④ 엔터티는 반드시 속성을 포함해야 한다.")],
+         ]},
+        {"number": (72, 1548, 40, "12"),
+         "stem": [(222, 1558, 40, "발생 시점에 따라 구분할 수 있는 엔터티의 유형으로 적절하지 않은 것은?")],
+         "choices": [
+             [(230, 1680, 40, "① 관계 엔터티(Relation Entity)")],
+             [(230, 1752, 40, "② 행위 엔터티(Active Entity)")],
+             [(230, 1825, 40, "③ 중심 엔터티(Main Entity)")],
+             [(230, 1897, 40, "④ 기본 엔터티(Fundamental Entity)")],
+         ]},
+    ]},
+    "img02": {"size": (3000, 2050), "scale": 1.5, "problems": [
+        {"number": (205, 110, 45, "25"),
+         "stem": [
+             (385, 115, 48, "두 개의 엔터티 사이에서 관계를 도출할 때 확인해야 할 사항을 모두 고른"),
+             (385, 205, 45, "것은?"),
+             (1095, 345, 45, "아 래"),
+             (425, 460, 45, "(가) 두 개의 엔터티 사이에 관심 있는 연관규칙이 존재하는가?"),
+             (425, 525, 45, "(나) 두 개의 엔터티 사이에 정보의 조합이 발생되는가?"),
+             (425, 590, 45, "(다) 업무기술서, 장표에 관계연결에 대한 규칙이 서술되어 있는가?"),
+             (425, 655, 45, "(라) 업무기술서, 장표에 관계연결을 가능하게 하는 동사(Verb)가"),
+             (525, 725, 45, "있는가?"),
+         ],
+         "choices": [
+             [(378, 930, 45, "① (가), (나), (다)")],
+             [(378, 1018, 45, "② (가), (나), (라)")],
+             [(378, 1108, 45, "③ (가), (다), (라)")],
+             [(372, 1195, 45, "④ (가), (나), (다), (라)")],
+         ]},
+    ]},
+    "img03": {"size": (2753, 2323), "scale": 1.38, "problems": [
+        {"number": (140, 115, 45, "77.", 0.042),
+         "stem": [(240, 125, 45, "시각화를 위한 그래픽 디자인 기본 원리인 타이포그래피에 대한 설명으로 부적절한 것은?", 0.042)],
+         "choices": [
+             [(235, 225, 45, "① 서체는 글의 형태를 총칭하는 말로 얼굴에 해당하며, 타이포그래피에서 가장 어려운 일이 서", 0.038), (290, 320, 45, "체를 선택하는 것이다.", 0.035)],
+             [(230, 395, 45, "② 시각적 정보 표현에서는 심리적 무게감에 따라 정보의 위계표현이 힘들기 때문에, 크기를 잘", 0.03), (285, 490, 45, "사용해야 한다.", 0.03)],
+             [(230, 565, 45, "③ 글자가 놓이는 바탕색에 크게 영향을 받으며, 빛으로 글자를 표현하는 경우에는 청색은 후퇴돼", 0.02), (280, 660, 45, "보이기 때문에 자제해야 한다.", 0.02)],
+             [(225, 750, 45, "④ 읽어야 할 다음 글자가 다른 글자보다 근접해 있어야 하며 이 때문에 글자 사이보다 낱말 사이가,", 0.005), (280, 830, 45, "낱말 사이보다 글줄 사이가 넓어야 한다.")],
+         ]},
+        {"number": (110, 1005, 50, "78."),
+         "stem": [(215, 1010, 45, "Tableau에 대한 설명 중 적절하지 않은 것은?")],
+         "choices": [
+             [(210, 1115, 45, "① Tableau는 엑셀, 엑세스, Mysql 등을 데이터 소스로 접근할 수 있다.")],
+             [(205, 1200, 45, "② VizQLTM은 사용자가 데이터베이스와 상호작용하면서 시각적인 결과를 얻기 위해 Tableau"), (265, 1285, 45, "에서 사용할 수 있는 쿼리 언어이다.")],
+             [(205, 1370, 45, "③ Tableau에서는 사용자가 데이터 소스의 필드들을 Dimension이나 Measure로 분할하면,"), (260, 1460, 45, "다양한 분석을 수행하기 어렵다.")],
+             [(200, 1540, 45, "④ Tableau는 몇 번의 클릭만으로 크로스맵과 피벗테이블을 생성할 수 있다.")],
+         ]},
+    ]},
+    "img04": {"size": (3000, 2270), "scale": 1.5, "problems": [
+        {"number": (290, 205, 50, "21"),
+         "stem": [(478, 218, 45, "실행 결과가 다른 하나는?")],
+         "choices": [
+             [(488, 370, 45, "① SELECT DNAME, LOC, DEPTNO"), (568, 455, 45, "FROM DEPT"), (568, 543, 45, "ORDER BY DNAME, LOC, 3 DESC;")],
+             [(488, 630, 45, "② SELECT DNAME, LOC AREA, DEPTNO"), (566, 718, 45, "FROM DEPT"), (566, 805, 45, "ORDER BY DNAME, AREA, DEPTNO DESC;")],
+             [(485, 893, 45, "③ SELECT DNAME, LOC AREA, DEPTNO"), (565, 980, 45, "FROM DEPT"), (565, 1068, 45, "ORDER BY 1, AREA, 3 DESC;")],
+             [(482, 1160, 45, "④ SELECT DNAME DEPT, LOC AREA, DEPTNO"), (560, 1248, 45, "FROM DEPT"), (560, 1335, 45, "ORDER BY DEPT DESC, LOC, 3 DESC;")],
+         ]},
+    ]},
+    "img11": {"size": (2396, 1106), "scale": 1.2, "problems": [
+        {"number": (160, 160, 60, "11"),
+         "stem": [(390, 185, 58, "엔터티의 일반적인 특징으로 가장 적절하지 않은 것은?")],
+         "choices": [
+             [(410, 385, 55, "① 다른 엔터티와의 관계를 가지지 않는다.")],
+             [(410, 490, 55, "② 유일한 식별자에 의해 식별이 가능해야 한다.")],
+             [(410, 595, 55, "③ 엔터티는 업무 프로세스에 의해 이용되어야 한다.")],
+             [(410, 700, 55, "④ 엔터티는 반드시 속성을 포함해야 한다.")],
+         ]},
+    ]},
+    "img12": {"size": (2776, 941), "scale": 1.39, "problems": [
+        {"number": (145, 100, 55, "12"),
+         "stem": [(340, 120, 50, "발생 시점에 따라 구분할 수 있는 엔터티의 유형으로 적절하지 않은 것은?")],
+         "choices": [
+             [(355, 280, 50, "① 관계 엔터티(Relation Entity)")],
+             [(355, 370, 50, "② 행위 엔터티(Active Entity)")],
+             [(355, 460, 50, "③ 중심 엔터티(Main Entity)")],
+             [(355, 550, 50, "④ 기본 엔터티(Fundamental Entity)")],
+         ]},
+    ]},
+    "img13": {"size": (2742, 855), "scale": 1.37, "problems": [
+        {"number": (125, 45, 55, "13"),
+         "stem": [(320, 65, 50, "엔터티에 이름을 부여하는 방법으로 가장 적절하지 않은 것은?")],
+         "choices": [
+             [(330, 235, 50, "① 가능하면 약어를 사용하여 엔터티의 이름을 간결하고 명확하게 한다.")],
+             [(330, 320, 50, "② 현업의 업무 용어를 사용하여 업무상의 의미를 분명하게 한다.")],
+             [(330, 405, 50, "③ 모든 엔터티에서 유일한 이름이 부여되어야 한다.")],
+             [(330, 490, 50, "④ 엔터티가 생성되는 의미대로 자연스럽게 부여하도록 한다.")],
+         ]},
+    ]},
+}
+
+
+def _shift(lines, dx, dy):
+    return [(line[0] + dx, line[1] + dy) + tuple(line[2:]) for line in lines]
+
+def _two_column_page():
+    # 왼쪽 단: 11번 전체 + 12번 지문과 ①② / 오른쪽 단: 12번 ③④ + 13번 전체
+    gutter = 2150
+    p11 = copy.deepcopy(PAGES["img11"]["problems"][0])
+    p12 = copy.deepcopy(PAGES["img12"]["problems"][0])
+    p13 = copy.deepcopy(PAGES["img13"]["problems"][0])
+    p12["number"] = _shift([p12["number"]], 0, 850)[0]
+    p12["stem"] = _shift(p12["stem"], 0, 850)
+    p12["choices"] = [_shift(c, 0, 850) for c in p12["choices"][:2]] + [_shift(c, gutter, -180) for c in p12["choices"][2:]]
+    p13["number"] = _shift([p13["number"]], gutter, 450)[0]
+    p13["stem"] = _shift(p13["stem"], gutter, 450)
+    p13["choices"] = [_shift(c, gutter, 450) for c in p13["choices"]]
+    return {"size": (4200, 1600), "scale": 1.0, "problems": [p11, p12, p13]}
+
+PAGES["two_column"] = _two_column_page()
+
+
+# ------ Clova 응답 형식으로 변환 ------
+def _char_width(ch: str, height: float) -> float:
+    if ch == " ":
+        return height * 0.35
+    return height * (0.5 if ord(ch) < 128 else 0.88)
+
+def _words(line, scale, rng):
+    # 한 줄을 단어 필드로 나누고, 줄 기울기를 반영한 사각형 꼭짓점 생성
+    x, y, height, text = line[:4]
+    slope = line[4] if len(line) > 4 else 0.0
+    jitter = rng.uniform(-0.06, 0.06) * height
+    words = []
+    cursor = x
+    for word in text.split(" "):
+        width = sum(_char_width(ch, height) for ch in word)
+        top = y + jitter + slope * (cursor - x)
+        corners = [(cursor, top), (cursor + width, top + slope * width),
+                   (cursor + width, top + slope * width + height), (cursor, top + height)]
+        words.append({
+            "valueType": "ALL",
+            "boundingPoly": {"vertices": [{"x": round(cx * scale, 1), "y": round(cy * scale, 1)} for cx, cy in corners]},
+            "inferText": word,
+            "inferConfidence": round(rng.uniform(0.93, 1.0), 4),
+            "type": "NORMAL",
+            "lineBreak": False,
+        })
+        cursor += width + _char_width(" ", height)
+    words[-1]["lineBreak"] = True
+    return words
+
+def _page_lines(page):
+    for problem in page["problems"]:
+        yield problem["number"]
+        yield from problem["stem"]
+        for choice in problem["choices"]:
+            yield from choice
+
+def build_response(name: str, page) -> dict:
+    rng = random.Random(name)
+    lines = list(_page_lines(page))
+    # 번호 상자와 지문처럼 같은 높이의 줄은 하나로 묶어 위->아래, 왼쪽->오른쪽 순서로 출력 (Clova 인식 순서 모사)
+    lines.sort(key=lambda line: (round((line[1] + line[2] / 2) / 40), line[0]))
+    fields = []
+    for line in lines:
+        words = _words(line, page["scale"], rng)
+        fields.extend(words)
+    width, height = page["size"]
+    return {
+        "version": "V2",
+        "requestId": f"corpus-{name}",
+        "timestamp": 0,
+        "images": [{
+            "uid": name,
+            "name": "temp_image",
+            "inferResult": "SUCCESS",
+            "message": "SUCCESS",
+            "validationResult": {"result": "NO_REQUESTED"},
+            "convertedImageInfo": {"width": width, "height": height, "pageIndex": 0, "longImage": False},
+            "fields": fields,
+        }],
+    }
+
+def expected_problems(page) -> list:
+    return [{
+        "problem": " ".join(line[3] for line in problem["stem"]),
+        "choices": [" ".join(line[3] for line in choice) for choice in problem["choices"]],
+    } for problem in page["problems"]]
+
+
+if __name__ == "__main__":
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    expected = {}
+    for name, page in PAGES.items():
+        with open(os.path.join(CORPUS_DIR, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(build_response(name, page), f, ensure_ascii=False, indent=1)
+        expected[name] = expected_problems(page)
+    with open(os.path.join(CORPUS_DIR, "expected.json"), "w", encoding="utf-8") as f:
+        json.dump(expected, f, ensure_ascii=False, indent=2)
+    print(f"{len(PAGES)} pages -> {CORPUS_DIR}")
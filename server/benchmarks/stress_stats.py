@@ -0,0 +1,88 @@
+"""
+사용자 통계 동시 갱신 스트레스 테스트.
+
+여러 스레드가 같은 사용자의 통계를 동시에 증가시킨 뒤, 최종 값이 기대값과 정확히 일치하는지 검사.
+  - legacy      : 변경 전 방식 (조회 후 Python에서 += 후 커밋) -> 유실 발생 가능
+  - atomic      : crud.increment_user_stats (UPDATE ... SET total_solved = total_solved + :n)
+  - write-behind: StatsAggregator로 합산 후 주기적으로 일괄 반영
+
+실행:
+    cd server
+    python -m benchmarks.stress_stats --threads 16 --increments 200
+"""
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks import fixtures
+from utils.stats_aggregator import StatsAggregator
+import crud
+
+
+def legacy_increment(username, solved, correct):
+    db = fixtures.session()
+    try:
+        user = crud.get_user_by_name(db, username)
+        user.total_solved += solved
+        user.total_correct += correct
+        db.commit()
+    finally:
+        db.close()
+
+def atomic_increment(username, solved, correct):
+    db = fixtures.session()
+    try:
+        crud.increment_user_stats(db, username, solved, correct)
+        db.commit()
+    finally:
+        db.close()
+
+def read_stats(username):
+    db = fixtures.session()
+    try:
+        user = crud.get_user_by_name(db, username)
+        return user.total_solved, user.total_correct
+    finally:
+        db.close()
+
+def run(username, increment, threads, increments):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(increment, username, 2, 1) for _ in range(threads * increments)]
+        for f in futures:
+            f.result()
+    elapsed = time.perf_counter() - start
+    return elapsed
+
+def report(label, username, expected, elapsed):
+    solved, correct = read_stats(username)
+    lost = expected - solved
+    status = "OK" if lost == 0 and correct * 2 == solved else "LOST UPDATES"
+    print(f"{label:<13} solved={solved:>7} expected={expected:>7} lost={lost:>6}  {elapsed:.2f}s  {status}")
+    return lost == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--increments", type=int, default=200)
+    args = parser.parse_args()
+    expected = args.threads * args.increments * 2
+
+    fixtures.reset_schema()
+    legacy_user, atomic_user, behind_user = fixtures.seed(num_users=3, folders_per_user=0)
+
+    # legacy 방식은 유실 여부만 보여주고 결과 판정에는 포함하지 않음
+    elapsed = run(legacy_user, legacy_increment, args.threads, args.increments)
+    report("legacy", legacy_user, expected, elapsed)
+
+    elapsed = run(atomic_user, atomic_increment, args.threads, args.increments)
+    ok = report("atomic", atomic_user, expected, elapsed)
+
+    aggregator = StatsAggregator(fixtures.session, interval=0.05)
+    aggregator.start()
+    elapsed = run(behind_user, aggregator.add, args.threads, args.increments)
+    aggregator.stop()
+    ok = report("write-behind", behind_user, expected, elapsed) and ok
+
+    sys.exit(0 if ok else 1)
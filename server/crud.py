@@ -1,5 +1,16 @@
+import os
+from typing import Dict, Optional
 from sqlalchemy.orm import Session
 import models
+from utils.temp_store import MemoryTempStore
+
+# ------ 조회 캐시 설정 ------
+RESOLVE_CACHE_TTL = float(os.getenv("RESOLVE_CACHE_TTL", "60"))              # 캐시 유효 시간 (초)
+RESOLVE_CACHE_MAX_ITEMS = int(os.getenv("RESOLVE_CACHE_MAX_ITEMS", "50000"))  # 캐시별 최대 항목 수
+
+# username -> user_id, folder_id -> 소유자 user_id (워커 프로세스별 캐시)
+_user_id_cache = MemoryTempStore(ttl=RESOLVE_CACHE_TTL, max_items=RESOLVE_CACHE_MAX_ITEMS)
+_folder_owner_cache = MemoryTempStore(ttl=RESOLVE_CACHE_TTL, max_items=RESOLVE_CACHE_MAX_ITEMS)
 
 # ------ Helper Functions ------
 # 사용자 이름으로 사용자 객체 조회
@@ -9,3 +20,47 @@ def get_user_by_name(db: Session, username: str):
 # 폴더 ID로 폴더 객체 조회
 def get_folder_by_id(db: Session, folder_id: int):
     return db.query(models.Folder).filter(models.Folder.id == folder_id).first()
+
+# 사용자 이름으로 사용자 ID만 조회 (캐시 우선, ORM 객체 로드 없음)
+def get_user_id(db: Session, username: str) -> Optional[int]:
+    entry = _user_id_cache.get(username)
+    if entry is not None:
+        return entry["id"]
+    user_id = db.query(models.User.id).filter(models.User.username == username).scalar()
+    if user_id is not None:
+        _user_id_cache.set(username, {"id": user_id})
+    return user_id
+
+# 폴더 ID로 소유자 user_id 조회 (캐시 우선). 폴더가 없으면 None
+def get_folder_owner_id(db: Session, folder_id: int) -> Optional[int]:
+    entry = _folder_owner_cache.get(str(folder_id))
+    if entry is not None:
+        return entry["user_id"]
+    owner_id = db.query(models.Folder.user_id).filter(models.Folder.id == folder_id).scalar()
+    if owner_id is not None:
+        _folder_owner_cache.set(str(folder_id), {"user_id": owner_id})
+    return owner_id
+
+# 캐시 무효화 (회원가입, 폴더 삭제 시)
+def invalidate_user(username: str):
+    _user_id_cache.delete(username)
+
+def invalidate_folder(folder_id: int):
+    _folder_owner_cache.delete(str(folder_id))
+
+# 조회 캐시 적중률 통계
+def resolve_cache_stats() -> Dict:
+    result = {}
+    for name, cache in (("user_id", _user_id_cache), ("folder_owner", _folder_owner_cache)):
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        result[name] = {"hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0, **stats}
+    return result
+
+# 사용자 학습 통계 원자적 누적 (UPDATE ... SET total_solved = total_solved + :n)
+# 사용자 조회 없이 한 번의 UPDATE로 처리, 동시 요청에서도 누락 없음. 갱신된 행 수 반환 (0이면 사용자 없음)
+def increment_user_stats(db: Session, username: str, solved_count: int, correct_count: int) -> int:
+    return db.query(models.User).filter(models.User.username == username).update({
+        models.User.total_solved: models.User.total_solved + solved_count,
+        models.User.total_correct: models.User.total_correct + correct_count,
+    }, synchronize_session=False)
@@ -1,8 +1,16 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import time
+import logging
+import threading
+from typing import Dict
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # .env 파일에서 환경 변수 로드 (DB 접속 정보 등)
 load_dotenv()
 
@@ -12,14 +20,70 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
-# PostgreSQL 연결 문자열 생성
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# PostgreSQL 연결 문자열 생성 (DATABASE_URL 환경 변수가 있으면 우선 사용 - 벤치마크/테스트용 SQLite 등)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# 읽기 전용 복제본 (지정 시 조회 API는 get_read_db로 복제본 사용, 미지정 시 기본 DB)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+# ------ 커넥션 풀 설정 ------
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))                  # 유지하는 커넥션 수 (워커 프로세스별)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))           # 풀이 가득 찼을 때 추가로 여는 커넥션 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))         # 커넥션 대기 최대 시간 (초, 초과 시 오류)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))         # 이 시간(초)보다 오래된 커넥션은 다시 연결 (-1이면 사용 안 함)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"   # 커넥션을 꺼낼 때 살아 있는지 확인
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))  # SQL 컴파일 결과 캐시 크기 (0이면 사용 안 함)
+REPLICA_RETRY_AFTER = float(os.getenv("REPLICA_RETRY_AFTER", "30"))  # 복제본 연결 실패 시 기본 DB로 읽는 시간 (초)
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    커넥션 획득 횟수/대기 시간/타임아웃을 기록하는 QueuePool.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
 
-# DB 엔진 생성
-engine = create_engine(DATABASE_URL)
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            with self.metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self.metrics_lock:
+                self.checkouts += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+def _create_engine(url: str):
+    if url.startswith("sqlite") and (url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url):
+        # 메모리 SQLite는 커넥션마다 DB가 달라 풀 설정을 적용하지 않음 (테스트 전용)
+        return create_engine(url, query_cache_size=DB_QUERY_CACHE_SIZE)
+    return create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        query_cache_size=DB_QUERY_CACHE_SIZE,
+    )
+
+# DB 엔진 생성 (기본 DB: 읽기/쓰기, 복제본: 조회 전용)
+engine = _create_engine(DATABASE_URL)
+replica_engine = _create_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else engine
 
 # 세션 팩토리 생성 (DB 작업 시마다 세션을 생성)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
 
 # 모델 클래스들이 상속받을 Base 클래스
 Base = declarative_base()
@@ -31,3 +95,50 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 복제본 연결 실패 시각 (REPLICA_RETRY_AFTER 동안 기본 DB로 읽음)
+_replica_failed_at = 0.0
+
+# Dependency: 조회 전용 API용 세션. 복제본이 있으면 복제본, 연결할 수 없으면 기본 DB 사용
+# (복제 지연이 있으므로 방금 쓴 데이터를 바로 다시 읽어야 하는 API에는 get_db 사용)
+def get_read_db():
+    global _replica_failed_at
+    db = None
+    if replica_engine is not engine and time.monotonic() - _replica_failed_at >= REPLICA_RETRY_AFTER:
+        db = ReplicaSessionLocal()
+        try:
+            db.connection()
+        except OperationalError:
+            logger.warning("복제본 DB에 연결할 수 없어 %s초 동안 기본 DB에서 조회합니다.", REPLICA_RETRY_AFTER, exc_info=True)
+            _replica_failed_at = time.monotonic()
+            db.close()
+            db = None
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 커넥션 풀 상태 및 누적 지표 (풀 크기 조정용)
+def pool_stats() -> Dict:
+    result = {}
+    engines = {"primary": engine} if replica_engine is engine else {"primary": engine, "replica": replica_engine}
+    for name, target in engines.items():
+        pool = target.pool
+        if not isinstance(pool, MeteredQueuePool):
+            result[name] = {"pool": pool.status()}
+            continue
+        with pool.metrics_lock:
+            checkouts, timeouts, wait, max_wait = pool.checkouts, pool.timeouts, pool.wait_seconds, pool.max_wait_seconds
+        result[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "avg_wait_ms": round(wait / checkouts * 1000, 3) if checkouts else 0.0,
+            "max_wait_ms": round(max_wait * 1000, 3),
+        }
+    return result
@@ -1,20 +1,70 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from database import engine
-import models
-from routers import auth, folders, problems, users 
+from fastapi.responses import PlainTextResponse
+from database import engine, pool_stats
+import crud, migrations
+from routers import auth, folders, problems, users, exams, backup, analytics, reviews 
+from utils import ocr_backends, password, metrics, responses
+from utils.upload import BodySizeLimitMiddleware, OCR_MAX_UPLOAD_BYTES, OCR_MAX_BATCH_UPLOAD_BYTES, IMPORT_MAX_UPLOAD_BYTES
+from utils.stats_aggregator import STATS_WRITE_BEHIND
+from shared_data import stats_aggregator, ocr_result_cache, temp_ocr_results
 
-# [주의] 데이터베이스 초기화(drop_all) 코드가 포함되어 있으니 필요시 주석 해제하기 
-models.Base.metadata.drop_all(bind=engine)   
-models.Base.metadata.create_all(bind=engine)
+# 앱 수명 주기: 스키마 버전 확인, 통계 합산기 시작/종료, 종료 시 OCR 백엔드(HTTP 커넥션 풀/로컬 OCR 프로세스) 및 해싱 프로세스 풀 정리
+# 스키마 생성/변경은 워커 시작 전에 'python -m migrations'로 한 번만 실행 (워커는 버전만 확인)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    migrations.check_schema(engine)
+    if STATS_WRITE_BEHIND:
+        stats_aggregator.start()
+    yield
+    if STATS_WRITE_BEHIND:
+        stats_aggregator.stop()
+    await ocr_backends.close_ocr_backend()
+    password.shutdown_executor()
 
-app = FastAPI()
+# 기본 응답 직렬화: orjson(설치된 경우) 또는 pydantic-core (표준 json 모듈보다 빠름)
+app = FastAPI(lifespan=lifespan, default_response_class=responses.FastJSONResponse)
+
+# 요청별 처리 시간 / SQL 수·시간 기록 (/metrics), PROFILE_SLOW_REQUESTS=true면 느린 요청 스택 샘플 저장
+app.add_middleware(metrics.MetricsMiddleware)
+
+# 업로드 경로별 본문 크기 제한 (multipart 파싱/스풀링 전에 수신 바이트 기준으로 413)
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    "/ocr/upload": OCR_MAX_UPLOAD_BYTES + 64 * 1024,    # 이미지 1장 + multipart 헤더/폼 필드 여유분
+    "/ocr/batch": OCR_MAX_BATCH_UPLOAD_BYTES,
+    "/import": IMPORT_MAX_UPLOAD_BYTES,
+})
 
 # 라우터 등록 (기능별 API 분리)
 app.include_router(auth.router)         # 회원가입/로그인
 app.include_router(folders.router)      # 폴더 관리 
 app.include_router(problems.router)     # 문제 및 OCR 관련 
 app.include_router(users.router)        # 사용자 통계 및 히스토리 관리 
+app.include_router(exams.router)        # 시험 출제 및 일괄 채점 
+app.include_router(backup.router)       # 폴더/문제/기록 내보내기 및 가져오기 
+app.include_router(analytics.router)    # 점수 추세 / 폴더별 정답률 분석 
+app.include_router(reviews.router)      # 간격 반복 복습 큐 
 
 @app.get("/")
 def root():
-    return {"message": "SnapSolve API Server Running"}
\ No newline at end of file
+    return {"message": "SnapSolve API Server Running"}
+
+# 캐시 적중률 통계 (캐시 크기 조정용)
+@app.get("/stats/cache")
+def cache_stats():
+    return {
+        "resolve": crud.resolve_cache_stats(),
+        "ocr_cache": ocr_result_cache.stats(),
+        "temp_store": temp_ocr_results.stats(),
+        "hashing": password.hashing_stats(),
+    }
+
+# DB 커넥션 풀 상태 / 대기 시간 (풀 크기 조정용)
+@app.get("/stats/db")
+def db_stats():
+    return pool_stats()
+
+# Prometheus 텍스트 형식 지표 (요청 처리 시간, SQL, OCR 엔진, 처리 단계, 커넥션 풀)
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,113 @@
+"""
+버전별 DB 스키마 마이그레이션.
+
+migrations/vNNNN_설명.py 모듈이 하나의 버전이며 upgrade(conn) 함수를 가짐.
+적용된 버전은 schema_migrations 테이블에 기록되고, 각 버전은 하나의 트랜잭션으로 적용됨.
+배포 시 워커를 띄우기 전에 한 번만 실행:
+    cd server
+    python -m migrations            # 대기 중인 마이그레이션 적용
+    python -m migrations status     # 현재/최신 버전 확인
+워커는 시작 시 버전만 확인하고 (check_schema), 마이그레이션 모듈은 import 하지 않음.
+각 버전은 그 시점의 테이블 정의를 파일 안에 고정해서 작성하고 (models를 import 하지 않음),
+스키마 변경은 기존 파일을 고치지 말고 새 버전으로 추가할 것.
+마이그레이션 도입 전 create_all로 만들어진 DB에도 적용되므로 존재 여부를 확인하며 작성
+(checkfirst, add_column_if_missing, create_missing_indexes).
+"""
+import os
+import re
+import pkgutil
+import logging
+import importlib
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# ------ 마이그레이션 설정 ------
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "false").lower() == "true"   # (개발용) 워커 시작 시 직접 적용
+
+_ADVISORY_LOCK_KEY = 72_410_018     # PostgreSQL: 여러 곳에서 동시에 실행해도 한 번에 하나만 적용
+_MODULE_NAME = re.compile(r"^v(\d{4})_\w+$")
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def available() -> List[Tuple[int, str]]:
+    # 파일 이름만으로 (버전, 모듈 이름) 목록 생성 (모듈 import 없음)
+    found = []
+    for module in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(module.name)
+        if match:
+            found.append((int(match.group(1)), module.name))
+    return sorted(found)
+
+def latest_version() -> int:
+    versions = available()
+    return versions[-1][0] if versions else 0
+
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return 0
+    return conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version.desc()).limit(1)).scalar() or 0
+
+def _lock(conn: Connection):
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """
+    target 버전(기본: 최신)까지 적용하지 않은 마이그레이션을 순서대로 적용하고 적용한 버전 목록 반환.
+    """
+    with engine.begin() as conn:
+        _lock(conn)
+        _metadata.create_all(conn, checkfirst=True)
+
+    applied = []
+    for version, name in available():
+        if target is not None and version > target:
+            break
+        with engine.begin() as conn:
+            _lock(conn)
+            # 잠금을 얻은 뒤 다시 확인 (다른 프로세스가 먼저 적용했을 수 있음)
+            if conn.execute(select(schema_migrations.c.version).where(schema_migrations.c.version == version)).first():
+                continue
+            logger.info("마이그레이션 적용: %s", name)
+            importlib.import_module(f"{__name__}.{name}").upgrade(conn)
+            conn.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.now(timezone.utc)))
+        applied.append(version)
+    return applied
+
+def check_schema(engine: Engine):
+    """
+    워커 시작 시 호출: DB 스키마 버전이 최신이 아니면 시작하지 않음 (MIGRATE_ON_STARTUP=true면 직접 적용).
+    """
+    if MIGRATE_ON_STARTUP:
+        upgrade(engine)
+        return
+    with engine.connect() as conn:
+        current = current_version(conn)
+    latest = latest_version()
+    if current < latest:
+        raise RuntimeError(f"DB 스키마가 최신이 아닙니다 (현재 v{current}, 필요 v{latest}). "
+                           "워커 실행 전에 'python -m migrations'를 실행하세요.")
+
+
+# ------ 마이그레이션 작성용 헬퍼 ------
+def add_column_if_missing(conn: Connection, table: str, column: str, ddl_type: str):
+    if column not in {c["name"] for c in inspect(conn).get_columns(table)}:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+def create_missing_indexes(conn: Connection, table: Table):
+    # create_all은 테이블을 새로 만들 때만 인덱스를 만들므로, 기존 테이블에 나중에 추가된 인덱스를 채움
+    existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(conn)
@@ -0,0 +1,20 @@
+import sys
+import logging
+import argparse
+from database import engine
+from migrations import upgrade, current_version, latest_version
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m migrations")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status"], default="upgrade")
+    parser.add_argument("--target", type=int, default=None, help="이 버전까지만 적용")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "status":
+        with engine.connect() as conn:
+            print(f"current=v{current_version(conn)} latest=v{latest_version()}")
+        sys.exit(0)
+
+    applied = upgrade(engine, args.target)
+    print(f"applied: {', '.join(f'v{v}' for v in applied) or '(none)'}")
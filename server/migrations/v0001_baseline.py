@@ -0,0 +1,51 @@
+"""
+기준 스키마: 마이그레이션 도입 전 최초 테이블 (users, folders, problems, exam_histories).
+이후 모델이 바뀌어도 이 파일은 그대로 두고, 변경은 다음 버전 파일로 추가할 것.
+create_all로 이미 테이블이 만들어진 DB에서는 건너뜀.
+"""
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, MetaData, String, Table, Text, func
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(50), unique=True, index=True, nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("total_solved", Integer),
+    Column("total_correct", Integer),
+)
+
+folders = Table(
+    "folders", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, index=True),
+    Column("color", String),
+    Column("user_id", Integer, ForeignKey("users.id")),
+)
+
+problems = Table(
+    "problems", metadata,
+    Column("id", String, primary_key=True),
+    Column("problem_text", Text, nullable=False),
+    Column("choices", JSON),
+    Column("correct_answer", String, nullable=False),
+    Column("folder_id", Integer, ForeignKey("folders.id")),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("is_wrong_note", Boolean),
+    Column("memo", Text, nullable=True),
+)
+
+exam_histories = Table(
+    "exam_histories", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("score", Integer, nullable=False),
+    Column("solved_date", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def upgrade(conn: Connection):
+    metadata.create_all(conn, checkfirst=True)
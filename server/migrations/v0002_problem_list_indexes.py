@@ -0,0 +1,35 @@
+"""
+폴더 목록 집계 / 문제 목록 키셋 페이지네이션 / 오답노트 조회용 인덱스.
+"""
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+from migrations import create_missing_indexes
+
+metadata = MetaData()
+
+folders = Table(
+    "folders", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Index("ix_folders_user_id", "user_id"),
+)
+
+problems = Table(
+    "problems", metadata,
+    Column("id", String, primary_key=True),
+    Column("folder_id", Integer),
+    Column("created_at", DateTime(timezone=True)),
+    Column("is_wrong_note", Boolean),
+    # 폴더별 문제 목록 페이지네이션용 (folder_id, created_at, id) 복합 인덱스
+    Index("ix_problems_folder_created", "folder_id", "created_at", "id"),
+    # 오답노트 문제만 담는 부분 인덱스
+    Index("ix_problems_wrong_note", "folder_id",
+          postgresql_where=text("is_wrong_note"), sqlite_where=text("is_wrong_note = 1")),
+)
+
+
+def upgrade(conn: Connection):
+    create_missing_indexes(conn, folders)
+    create_missing_indexes(conn, problems)
+    # 복합 인덱스로 대체된 folder_id 단일 인덱스 (이전 create_all로 만들어진 DB에만 있음)
+    conn.execute(text("DROP INDEX IF EXISTS ix_problems_folder_id"))
@@ -0,0 +1,14 @@
+"""
+문제 검색용 정규화 텍스트 컬럼(problems.search_text)과 PostgreSQL 트라이그램 인덱스.
+값은 v0004에서 채움.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from migrations import add_column_if_missing
+
+
+def upgrade(conn: Connection):
+    add_column_if_missing(conn, "problems", "search_text", "TEXT")
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_problems_search_trgm ON problems USING gin (search_text gin_trgm_ops)"))
@@ -0,0 +1,39 @@
+"""
+검색용 텍스트(search_text)가 비어 있는 기존 문제 채우기 (id 순서로 배치 처리).
+정규화 규칙은 이 버전 시점의 utils.text_index를 복사해 고정 (이후 규칙이 바뀌어도 이 파일은 그대로 둘 것).
+"""
+import re
+from typing import Iterable, Optional
+from sqlalchemy import JSON, String, Text, bindparam, column, select, table
+from sqlalchemy.engine import Connection
+
+BATCH_SIZE = 1000
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join(_TOKEN_PATTERN.findall((text or "").lower()))
+
+def _build_search_text(problem_text: Optional[str], choices: Optional[Iterable[str]], memo: Optional[str]) -> str:
+    parts = [problem_text or ""] + list(choices or []) + [memo or ""]
+    return _normalize(" ".join(parts))
+
+problems = table("problems", column("id", String), column("problem_text", Text), column("choices", JSON),
+                 column("memo", Text), column("search_text", Text))
+
+
+def upgrade(conn: Connection):
+    P = problems
+    update = P.update().where(P.c.id == bindparam("b_id")).values(search_text=bindparam("b_search_text"))
+    last_id = ""
+    while True:
+        rows = conn.execute(
+            select(P.c.id, P.c.problem_text, P.c.choices, P.c.memo)
+            .where(P.c.search_text.is_(None), P.c.id > last_id)
+            .order_by(P.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [{"b_id": problem_id, "b_search_text": _build_search_text(problem_text, choices, memo)}
+                              for problem_id, problem_text, choices, memo in rows])
+        last_id = rows[-1][0]
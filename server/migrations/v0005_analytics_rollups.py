@@ -0,0 +1,46 @@
+"""
+점수/폴더 분석용: 시험 기록 (user_id, solved_date) 인덱스와 일별 집계(rollup) 테이블.
+이전 기록으로 점수 집계를 채우는 작업은 v0006.
+"""
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, Table
+from sqlalchemy.engine import Connection
+from migrations import create_missing_indexes
+
+metadata = MetaData()
+
+# 외래 키 대상 (이미 있는 테이블, 생성하지 않음)
+users = Table("users", metadata, Column("id", Integer, primary_key=True))
+folders = Table("folders", metadata, Column("id", Integer, primary_key=True))
+
+exam_histories = Table(
+    "exam_histories", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("solved_date", DateTime(timezone=True)),
+    Index("ix_exam_histories_user_date", "user_id", "solved_date"),
+)
+
+daily_score_rollups = Table(
+    "daily_score_rollups", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("exam_count", Integer, nullable=False),
+    Column("score_sum", Integer, nullable=False),
+    Column("score_min", Integer, nullable=False),
+    Column("score_max", Integer, nullable=False),
+)
+
+folder_daily_rollups = Table(
+    "folder_daily_rollups", metadata,
+    Column("folder_id", Integer, ForeignKey("folders.id"), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("solved_count", Integer, nullable=False),
+    Column("correct_count", Integer, nullable=False),
+    Index("ix_folder_daily_rollups_user_day", "user_id", "day"),
+)
+
+
+def upgrade(conn: Connection):
+    create_missing_indexes(conn, exam_histories)
+    metadata.create_all(conn, tables=[daily_score_rollups, folder_daily_rollups], checkfirst=True)
@@ -0,0 +1,53 @@
+"""
+기존 시험 기록(exam_histories)으로 일별 점수 집계(daily_score_rollups) 다시 만들기.
+폴더별 정답률 집계와 복습 일정은 문제별 채점 기록이 없어 이전 데이터로 만들 수 없음.
+날짜 경계는 이 버전 시점의 기본값(Asia/Seoul)으로 고정 (ANALYTICS_TIMEZONE 환경 변수와 무관).
+"""
+from typing import Dict, List, Tuple
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import Date, DateTime, Integer, column, delete, select, table
+from sqlalchemy.engine import Connection
+
+BATCH_SIZE = 1000
+TIMEZONE = ZoneInfo("Asia/Seoul")
+
+def _local_day(value: datetime) -> date:
+    # 시간대 없는 값은 UTC로 간주
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(TIMEZONE).date()
+
+exam_histories = table("exam_histories", column("user_id", Integer), column("score", Integer),
+                       column("solved_date", DateTime(timezone=True)))
+daily_score_rollups = table("daily_score_rollups", column("user_id", Integer), column("day", Date),
+                            column("exam_count", Integer), column("score_sum", Integer),
+                            column("score_min", Integer), column("score_max", Integer))
+
+
+def upgrade(conn: Connection):
+    H = exam_histories
+    R = daily_score_rollups
+    conn.execute(delete(R))
+
+    days: Dict[Tuple[int, date], List[int]] = {}
+    histories = conn.execute(
+        select(H.c.user_id, H.c.score, H.c.solved_date)
+        .where(H.c.user_id.is_not(None), H.c.solved_date.is_not(None))
+        .execution_options(yield_per=BATCH_SIZE)
+    )
+    for user_id, score, solved_date in histories:
+        key = (user_id, _local_day(solved_date))
+        agg = days.get(key)
+        if agg is None:
+            days[key] = [1, score, score, score]
+        else:
+            agg[0] += 1
+            agg[1] += score
+            agg[2] = min(agg[2], score)
+            agg[3] = max(agg[3], score)
+
+    rows = [{"user_id": user_id, "day": day, "exam_count": count, "score_sum": total, "score_min": low, "score_max": high}
+            for (user_id, day), (count, total, low, high) in days.items()]
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(R.insert(), rows[start:start + BATCH_SIZE])
@@ -0,0 +1,31 @@
+"""
+간격 반복 복습 일정 (SM-2) 테이블과 복습 큐 조회용 인덱스.
+"""
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+# 외래 키 대상 (이미 있는 테이블, 생성하지 않음)
+users = Table("users", metadata, Column("id", Integer, primary_key=True))
+folders = Table("folders", metadata, Column("id", Integer, primary_key=True))
+problems = Table("problems", metadata, Column("id", String, primary_key=True))
+
+review_schedules = Table(
+    "review_schedules", metadata,
+    Column("problem_id", String, ForeignKey("problems.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("folder_id", Integer, ForeignKey("folders.id"), nullable=False),
+    Column("repetitions", Integer, nullable=False),
+    Column("interval_days", Float, nullable=False),
+    Column("ease", Float, nullable=False),
+    Column("lapses", Integer, nullable=False),
+    Column("due_at", DateTime(timezone=True), nullable=False),
+    Column("reviewed_at", DateTime(timezone=True), nullable=False),
+    Index("ix_review_schedules_user_due", "user_id", "due_at"),
+    Index("ix_review_schedules_folder_due", "folder_id", "due_at"),
+)
+
+
+def upgrade(conn: Connection):
+    metadata.create_all(conn, tables=[review_schedules], checkfirst=True)
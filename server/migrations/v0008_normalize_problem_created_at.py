@@ -0,0 +1,18 @@
+"""
+SQLite: 앱에서 created_at을 넣기 전에 server_default(CURRENT_TIMESTAMP)로 저장된 문제의 시각을
+앱이 저장하는 형식('YYYY-MM-DD HH:MM:SS.ffffff')으로 맞춤.
+SQLite는 시각을 문자열로 비교하므로 소수점 이하가 없는 값이 섞여 있으면
+같은 시각의 문제들이 (created_at, id) 키셋 커서 경계에서 빠지거나 중복됨.
+PostgreSQL은 timestamptz로 저장하므로 해당 없음.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection):
+    if conn.dialect.name != "sqlite":
+        return
+    conn.execute(text(
+        "UPDATE problems SET created_at = created_at || '.000000' "
+        "WHERE created_at IS NOT NULL AND length(created_at) = 19"
+    ))
@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, DateTime, Date, JSON, Boolean, Index, text, event, DDL
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
+from utils.text_index import build_search_text
 import uuid
+from datetime import datetime, timezone
 
 # 문제 ID 생성을 위한 UUID 함수
 def generate_uuid():
     return str(uuid.uuid4())
 
+# 현재 시각 (UTC)
+def utc_now():
+    return datetime.now(timezone.utc)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -30,7 +36,7 @@ class Folder(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     color = Column(String, default="0xFF1E2B58")    # 폴더 색상 코드 
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     owner = relationship("User", back_populates="folders")
     # 폴더 삭제 시 내부 문제도 함께 삭제 (cascade)
@@ -44,12 +50,34 @@ class Problem(Base):
     choices = Column(JSON, default=[])                              # 객관식 선지 (리스트 형태 JSON)
     correct_answer = Column(String, nullable=False)                 # 정답 
     folder_id = Column(Integer, ForeignKey("folders.id"))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 페이지네이션 정렬 키: DB 종류와 관계없이 마이크로초 단위로 일관되게 저장되도록 애플리케이션에서도 값 지정
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
     is_wrong_note = Column(Boolean, default=False)                  # 오답노트 포함 여부 
     memo = Column(Text, nullable=True)                              # 사용자 메모 
+    search_text = Column(Text, nullable=True)                       # 검색용 정규화 텍스트 (지문 + 선지 + 메모)
     
     folder = relationship("Folder", back_populates="problems")
 
+    __table_args__ = (
+        # 폴더별 문제 목록 페이지네이션용 (folder_id, created_at, id) 복합 인덱스
+        Index("ix_problems_folder_created", "folder_id", "created_at", "id"),
+        # 오답노트 문제만 담는 부분 인덱스 (오답노트 조회/개수 집계용)
+        Index("ix_problems_wrong_note", "folder_id",
+              postgresql_where=text("is_wrong_note"), sqlite_where=text("is_wrong_note = 1")),
+    )
+
+# 문제 저장/수정 시 검색용 텍스트 자동 갱신
+@event.listens_for(Problem, "before_insert")
+@event.listens_for(Problem, "before_update")
+def _update_search_text(mapper, connection, target):
+    target.search_text = build_search_text(target.problem_text, target.choices, target.memo)
+
+# PostgreSQL: pg_trgm 확장 및 검색용 트라이그램 GIN 인덱스 (다른 DB에서는 생성하지 않음)
+event.listen(Problem.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+event.listen(Problem.__table__, "after_create", DDL(
+    "CREATE INDEX IF NOT EXISTS ix_problems_search_trgm ON problems USING gin (search_text gin_trgm_ops)"
+).execute_if(dialect="postgresql"))
+
 class ExamHistory(Base):
     __tablename__ = "exam_histories"
 
@@ -58,4 +86,53 @@ class ExamHistory(Base):
     score = Column(Integer, nullable=False) # 점수 (0~100)
     solved_date = Column(DateTime(timezone=True), server_default=func.now()) # 시험 본 날짜
 
-    owner = relationship("User", back_populates="histories")
\ No newline at end of file
+    owner = relationship("User", back_populates="histories")
+
+    __table_args__ = (
+        # 사용자별 기간 조회 / 최근 기록 조회용 (user_id, solved_date) 복합 인덱스
+        Index("ix_exam_histories_user_date", "user_id", "solved_date"),
+    )
+
+# ------ 통계 집계(rollup) 테이블: 기록 저장 시 증분 갱신, 분석 API는 원본 대신 이 테이블을 조회 ------
+class DailyScoreRollup(Base):
+    __tablename__ = "daily_score_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)                # ANALYTICS_TIMEZONE 기준 날짜
+    exam_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    score_min = Column(Integer, nullable=False)
+    score_max = Column(Integer, nullable=False)
+
+class FolderDailyRollup(Base):
+    __tablename__ = "folder_daily_rollups"
+
+    folder_id = Column(Integer, ForeignKey("folders.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    solved_count = Column(Integer, nullable=False, default=0)     # 채점된 문제 수
+    correct_count = Column(Integer, nullable=False, default=0)    # 맞힌 문제 수
+
+    __table_args__ = (
+        Index("ix_folder_daily_rollups_user_day", "user_id", "day"),
+    )
+
+# ------ 간격 반복 복습 일정 (SM-2): 문제당 1행, 채점할 때마다 갱신 ------
+class ReviewSchedule(Base):
+    __tablename__ = "review_schedules"
+
+    problem_id = Column(String, ForeignKey("problems.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)       # 복습 큐 조회용 (문제 -> 폴더 -> 사용자 조인 없이)
+    folder_id = Column(Integer, ForeignKey("folders.id"), nullable=False)   # 폴더별 복습 큐 조회용
+    repetitions = Column(Integer, nullable=False, default=0)    # 연속 정답 횟수
+    interval_days = Column(Float, nullable=False, default=0)    # 현재 복습 간격 (일)
+    ease = Column(Float, nullable=False, default=2.5)           # 난이도 계수 (최소 1.3)
+    lapses = Column(Integer, nullable=False, default=0)         # 틀린 횟수
+    due_at = Column(DateTime(timezone=True), nullable=False)    # 다음 복습 시각
+    reviewed_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # 다음 복습 N개: (user_id, due_at) 인덱스 범위 조회로 처리
+        Index("ix_review_schedules_user_due", "user_id", "due_at"),
+        Index("ix_review_schedules_folder_due", "folder_id", "due_at"),
+    )
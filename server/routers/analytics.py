@@ -0,0 +1,50 @@
+from datetime import date
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+from database import get_db
+import crud
+from utils import analytics
+from utils.responses import FastJSONResponse
+
+router = APIRouter(tags=["Analytics"])
+
+# 집계 결과에 ETag를 붙여 응답, 클라이언트가 같은 ETag를 보내면 본문 없이 304
+def _cacheable(request: Request, payload: Dict) -> Response:
+    etag = analytics.make_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={analytics.ANALYTICS_CACHE_MAX_AGE}, must-revalidate"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(payload, headers=headers)
+
+# ------ 일/주 단위 점수 집계 및 추세 (GET) ------
+@router.get("/analytics/scores")
+def get_score_analytics(
+    request: Request,
+    username: str = Query(...),
+    period: str = Query("day", pattern="^(day|week)$"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+):
+    user_id = crud.get_user_id(db, username)
+    if not user_id:
+        raise HTTPException(status_code=404, detail="사용자 없음")
+    start, end = analytics.resolve_range(period, start, end)
+    return _cacheable(request, analytics.score_summary(db, user_id, period, start, end))
+
+# ------ 폴더별 정답률 (GET) ------
+@router.get("/analytics/folders")
+def get_folder_analytics(
+    request: Request,
+    username: str = Query(...),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+):
+    user_id = crud.get_user_id(db, username)
+    if not user_id:
+        raise HTTPException(status_code=404, detail="사용자 없음")
+    start, end = analytics.resolve_range("day", start, end)
+    return _cacheable(request, analytics.folder_accuracy(db, user_id, start, end))
@@ -1,31 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 from database import get_db
+from utils.password import hash_password, verify_password, check_login_rate, record_login_failure, reset_login_rate
 import models, schemas, crud  
 
 router = APIRouter(tags=["Auth"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt 연산은 전용 프로세스 풀(utils/password.py)에서 실행하고,
+# DB 작업은 스레드풀에서 실행하여 이벤트 루프를 막지 않음
 
 # ------ 회원가입 ------
 @router.post("/register", status_code=201)
-def register_user(request: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register_user(request: schemas.UserCreate, db: Session = Depends(get_db)):
     # 이미 존재하는 사용자인지 확인
-    if crud.get_user_by_name(db, request.username):
+    if await run_in_threadpool(crud.get_user_id, db, request.username):
         raise HTTPException(status_code=400, detail="이미 존재하는 사용자입니다.")
     
     # 비밀번호 해싱 후 저장
-    hashed_password = pwd_context.hash(request.password)
+    hashed_password = await hash_password(request.password)
     new_user = models.User(username=request.username, password_hash=hashed_password)
-    db.add(new_user)
-    db.commit()
+    try:
+        await run_in_threadpool(_save_user, db, new_user)
+    except IntegrityError:
+        # 동시에 같은 이름으로 가입한 경우
+        raise HTTPException(status_code=400, detail="이미 존재하는 사용자입니다.")
+    crud.invalidate_user(request.username)
     return {"message": "회원가입 성공"}
 
+def _save_user(db: Session, user: models.User):
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+
 # ------ 로그인 ------
 @router.post("/login")
-def login_user(request: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = crud.get_user_by_name(db, request.username)
+async def login_user(request: schemas.UserLogin, http_request: Request, db: Session = Depends(get_db)):
+    # (클라이언트 IP, 사용자)별 시도 횟수 + 전체 실패 횟수 제한 (bcrypt 연산 전에 차단)
+    client_ip = http_request.client.host if http_request.client else ""
+    check_login_rate(client_ip, request.username)
+
+    user = await run_in_threadpool(crud.get_user_by_name, db, request.username)
     # 사용자 존재 여부 및 비밀번호 일치 여부 확인
-    if not user or not pwd_context.verify(request.password, user.password_hash):
+    if not user or not await verify_password(request.password, user.password_hash):
+        record_login_failure()
         raise HTTPException(status_code=401, detail="로그인 실패")
+    reset_login_rate(client_ip, request.username)
     return {"message": "로그인 성공", "username": user.username}
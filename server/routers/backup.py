@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, File, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from database import get_db, SessionLocal
+import crud
+from utils.search import invalidate_user_index
+from utils.transfer import export_records, encode_ndjson, import_records, read_lines
+
+router = APIRouter(tags=["Backup"])
+
+# ------ 폴더/문제/시험 기록 내보내기 (NDJSON 스트리밍, gzip 선택) ------
+# 서버 측 커서로 조금씩 읽어 바로 전송하므로 문제 수와 관계없이 메모리 사용량 일정
+@router.get("/export")
+def export_data(username: str = Query(...), gzip: bool = Query(False), db: Session = Depends(get_db)):
+    user_id = crud.get_user_id(db, username)
+    if not user_id:
+        raise HTTPException(status_code=404, detail="사용자 없음")
+
+    def stream():
+        # 응답 전송이 끝날 때까지 사용할 전용 세션 (요청 세션은 응답 시작 전에 닫힐 수 있음)
+        session = SessionLocal()
+        try:
+            yield from encode_ndjson(export_records(session, user_id, username), compress=gzip)
+        finally:
+            session.close()
+
+    filename = "snapsolve-export.ndjson" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream(),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# ------ 내보내기 파일 가져오기 (NDJSON 또는 gzip, 일괄 insert) ------
+# 같은 파일을 다시 가져와도 이미 있는 문제(Problem.id)는 건너뜀, 잘못된 레코드는 결과의 errors로 보고
+@router.post("/import")
+def import_data(username: str = Form(...), file: UploadFile = File(...), db: Session = Depends(get_db)):
+    user_id = crud.get_user_id(db, username)
+    if not user_id:
+        raise HTTPException(status_code=404, detail="사용자 없음")
+
+    result = import_records(db, user_id, read_lines(file.file))
+    invalidate_user_index(user_id)
+    return result
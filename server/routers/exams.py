@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database import get_db
+import models, schemas, crud
+from utils import analytics, review
+from utils.responses import model_response
+
+router = APIRouter(tags=["Exams"])
+
+# ------ 시험 문제 출제 (POST) ------
+# 선택한 폴더(또는 오답노트)에서 N개의 문제를 한 번의 쿼리로 무작위 추출
+@router.post("/exams", response_model=schemas.ExamResponse)
+def create_exam(request: schemas.ExamCreate, http_request: Request, db: Session = Depends(get_db)):
+    user_id = crud.get_user_id(db, request.username)
+    if not user_id: raise HTTPException(status_code=404, detail="사용자 없음")
+
+    query = db.query(models.Problem.id, models.Problem.problem_text, models.Problem.choices)\
+        .join(models.Folder, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user_id)
+    if request.folder_ids:
+        query = query.filter(models.Problem.folder_id.in_(request.folder_ids))
+    if request.wrong_notes_only:
+        query = query.filter(models.Problem.is_wrong_note == True)
+    rows = query.order_by(func.random()).limit(request.count).all()
+
+    # 정답은 채점 시 서버에서 확인하므로 출제 응답에는 포함하지 않음
+    return model_response(http_request, schemas.ExamResponse, {
+        "problems": {
+            problem_id: {"problem": problem_text, "choices": choices}
+            for problem_id, problem_text, choices in rows
+        }
+    })
+
+# ------ 시험 답안 일괄 채점 (POST) ------
+# 채점, 사용자 통계 누적, 점수 기록, 오답노트 반영을 하나의 트랜잭션으로 처리
+@router.post("/exams/submissions", response_model=schemas.ExamResult)
+def submit_exam(request: schemas.ExamSubmit, http_request: Request, db: Session = Depends(get_db)):
+    user_id = crud.get_user_id(db, request.username)
+    if not user_id: raise HTTPException(status_code=404, detail="사용자 없음")
+    if not request.answers:
+        raise HTTPException(status_code=400, detail="제출된 답안이 없습니다.")
+
+    # 제출된 문제들의 정답을 한 번에 조회 (본인 폴더의 문제만)
+    rows = db.query(models.Problem.id, models.Problem.correct_answer, models.Problem.folder_id)\
+        .join(models.Folder, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user_id, models.Problem.id.in_(list(request.answers)))\
+        .all()
+    if len(rows) != len(request.answers):
+        raise HTTPException(status_code=404, detail="문제 없음")
+
+    results = {}
+    graded = []             # (problem_id, folder_id, 정답 여부) -> 복습 일정 갱신
+    correct_ids, wrong_ids = [], []
+    folder_results = {}     # folder_id -> [푼 문제 수, 맞힌 문제 수]
+    for problem_id, correct_answer, folder_id in rows:
+        is_correct = (correct_answer == request.answers[problem_id])
+        (correct_ids if is_correct else wrong_ids).append(problem_id)
+        graded.append((problem_id, folder_id, is_correct))
+        counts = folder_results.setdefault(folder_id, [0, 0])
+        counts[0] += 1
+        counts[1] += is_correct
+        results[problem_id] = {"is_correct": is_correct, "answer": correct_answer}
+
+    total = len(rows)
+    correct_count = len(correct_ids)
+    score = int(correct_count / total * 100)
+
+    # 통계 누적 (원자적 UPDATE), 점수 기록 및 집계 테이블 반영, 복습 일정 일괄 갱신, 오답노트 상태 일괄 변경
+    solved_at = models.utc_now()
+    crud.increment_user_stats(db, request.username, total, correct_count)
+    db.add(models.ExamHistory(user_id=user_id, score=score, solved_date=solved_at))
+    analytics.record_scores(db, user_id, [(score, solved_at)])
+    analytics.record_folder_results(db, user_id, solved_at, folder_results)
+    review.apply_results(db, user_id, graded, solved_at)
+    if request.mark_wrong_notes and wrong_ids:
+        db.query(models.Problem).filter(models.Problem.id.in_(wrong_ids))\
+            .update({models.Problem.is_wrong_note: True}, synchronize_session=False)
+    if request.unmark_correct and correct_ids:
+        db.query(models.Problem).filter(models.Problem.id.in_(correct_ids))\
+            .update({models.Problem.is_wrong_note: False}, synchronize_session=False)
+    db.commit()
+
+    return model_response(http_request, schemas.ExamResult,
+                          {"score": score, "total": total, "correct_count": correct_count, "results": results})
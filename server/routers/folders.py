@@ -1,22 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 import models, schemas, crud
+from utils.search import invalidate_user_index
+from utils.responses import model_response
 
 router = APIRouter(tags=["Folders"])
 
 # ------ 폴더 목록 조회 (GET) ------
-@router.get("/folders")
-def get_folders(username: str = Query(...), db: Session = Depends(get_db)):
+@router.get("/folders", response_model=schemas.FolderListResponse)
+def get_folders(request: Request, username: str = Query(...), db: Session = Depends(get_read_db)):
     user = crud.get_user_by_name(db, username)
     if not user: raise HTTPException(status_code=404, detail="사용자 없음")
     
+    # 폴더별 문제 수/오답노트 수를 한 번의 집계 쿼리로 계산 (COUNT ... GROUP BY folder_id)
+    rows = db.query(
+            models.Folder.id,
+            models.Folder.name,
+            models.Folder.color,
+            func.count(models.Problem.id),
+            func.count(case((models.Problem.is_wrong_note == True, 1))),
+        )\
+        .outerjoin(models.Problem, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user.id)\
+        .group_by(models.Folder.id)\
+        .order_by(models.Folder.id).all()
+
     # 전체 오답노트(별표) 개수 계산
-    total_wrong_count = 0
-    for f in user.folders:
-        for p in f.problems:
-            if p.is_wrong_note:
-                total_wrong_count += 1
+    total_wrong_count = sum(r[4] for r in rows)
     
     # 전체 정답률 계산 (0으로 나누기 방지)
     accuracy = 0
@@ -24,26 +36,26 @@ def get_folders(username: str = Query(...), db: Session = Depends(get_db)):
         accuracy = int((user.total_correct / user.total_solved) * 100)
 
     # 폴더 리스트와 통계 정보를 함께 반환
-    return {
+    return model_response(request, schemas.FolderListResponse, {
         "folders": [
             {
-                "id": f.id,
-                "name": f.name, 
-                "color": f.color, 
-                "problem_count": len(f.problems)
-            } for f in user.folders
+                "id": folder_id,
+                "name": name, 
+                "color": color, 
+                "problem_count": problem_count
+            } for folder_id, name, color, problem_count, _ in rows
         ],
         "wrong_note_count": total_wrong_count,
         "accuracy": accuracy
-    }
+    })
 
 # ------ 폴더 생성 (POST) ------
 @router.post("/folders", status_code=201)
 def create_folder(request: schemas.FolderCreate, db: Session = Depends(get_db)):
-    user = crud.get_user_by_name(db, request.username)
-    if not user: raise HTTPException(status_code=404, detail="사용자 없음")
+    user_id = crud.get_user_id(db, request.username)
+    if not user_id: raise HTTPException(status_code=404, detail="사용자 없음")
 
-    new_folder = models.Folder(name=request.folder_name, user_id=user.id, color=request.color)
+    new_folder = models.Folder(name=request.folder_name, user_id=user_id, color=request.color)
     db.add(new_folder)
     db.commit()
     return {"message": "폴더 생성 완료", "id": new_folder.id}
@@ -51,11 +63,10 @@ def create_folder(request: schemas.FolderCreate, db: Session = Depends(get_db)):
 # ------ 폴더 수정 (PUT) ------
 @router.put("/folders/{folder_id}")
 def update_folder(folder_id: int, request: schemas.FolderUpdate, db: Session = Depends(get_db)):
-    folder = crud.get_folder_by_id(db, folder_id)
-    if not folder: raise HTTPException(status_code=404, detail="폴더 없음")
-    
-    folder.name = request.new_name
-    folder.color = request.new_color
+    # 폴더 객체를 로드하지 않고 바로 UPDATE
+    updated = db.query(models.Folder).filter(models.Folder.id == folder_id)\
+        .update({models.Folder.name: request.new_name, models.Folder.color: request.new_color}, synchronize_session=False)
+    if not updated: raise HTTPException(status_code=404, detail="폴더 없음")
     db.commit()
     return {"message": "수정 완료"}
 
@@ -67,10 +78,15 @@ def delete_folder(folder_id: int, username: str = Query(...), db: Session = Depe
         raise HTTPException(status_code=404, detail="폴더 없음")
     
     # 소유권 확인 
-    user = crud.get_user_by_name(db, username)
-    if not user or folder.user_id != user.id:
+    user_id = crud.get_user_id(db, username)
+    if not user_id or folder.user_id != user_id:
         raise HTTPException(status_code=403, detail="권한 없음")
 
+    # 폴더별 정답률 집계와 복습 일정도 함께 삭제
+    db.query(models.FolderDailyRollup).filter(models.FolderDailyRollup.folder_id == folder_id).delete(synchronize_session=False)
+    db.query(models.ReviewSchedule).filter(models.ReviewSchedule.folder_id == folder_id).delete(synchronize_session=False)
     db.delete(folder)
     db.commit()
+    crud.invalidate_folder(folder_id)
+    invalidate_user_index(user_id)
     return Response(status_code=204)
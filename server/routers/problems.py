@@ -1,99 +1,294 @@
-import os
-import uuid
 import json
-import time
+import uuid
 import base64
-import requests
-from fastapi import APIRouter, Depends, HTTPException, Query, Response 
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, Form, File, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 import models, schemas, crud  
-from shared_data import temp_ocr_results
+from shared_data import temp_ocr_results, ocr_result_cache
 from utils.ocr import parse_clova_ocr_response 
+from utils.search import search_problems, find_duplicate_problems, index_problem, unindex_problem
+from utils.pagination import encode_cursor, decode_cursor
+from utils.upload import check_upload_size, image_format_of
+from utils.ocr_client import OCR_BATCH_WINDOW
+from utils.ocr_backends import get_ocr_backend, ocr_backend_stats
+from utils.responses import model_response
+from utils import review, metrics, analytics
 
 router = APIRouter(tags=["Problems"])
 
-# ------ OCR 처리 (CLOVA OCR API 연동) ------
+# ------ OCR 처리 (OCR_BACKEND 설정에 따라 Clova API 또는 로컬 엔진) ------
+# 비동기 엔드포인트: OCR 응답을 기다리는 동안 스레드풀 워커를 점유하지 않음
 @router.post("/ocr") 
-def ocr_problem(request: schemas.OcrRequest): 
-    api_url = os.getenv("CLOVA_OCR_URL")
-    secret_key = os.getenv("CLOVA_OCR_SECRET")
-    if not api_url or not secret_key:
-        raise HTTPException(status_code=500, detail="OCR API 환경 변수가 설정되지 않았습니다.")
-    
+async def ocr_problem(request: schemas.OcrRequest): 
     # Base64 이미지 디코딩
     try:
-        header, encoded = request.image_data.split(",", 1)
-        image_bytes = base64.b64decode(encoded)
-        image_format = header.split(';')[0].split('/')[-1]
+        with metrics.timed("base64_decode"):
+            header, encoded = request.image_data.split(",", 1)
+            image_bytes = base64.b64decode(encoded)
+            image_format = header.split(';')[0].split('/')[-1]
     except:
         raise HTTPException(status_code=400, detail="잘못된 이미지 데이터 형식입니다.")
     
-    # Clova OCR API 요청 구성
-    request_json = {'images': [{'format': image_format, 'name': 'temp_image'}],'requestId': str(uuid.uuid4()),'version': 'V2','timestamp': int(round(time.time() * 1000))}
-    payload = {'message': json.dumps(request_json)}
-    files = [('file', image_bytes)]
-    headers = {'X-OCR-SECRET': secret_key}
-
-    # API 요청 전송
-    response = requests.post(api_url, headers=headers, data=payload, files=files)
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=f"OCR API 오류: {response.text}")
-    
-    # 결과 파싱 (utils/ocr.py 사용)
-    ocr_response_json = response.json()
-    parsed_data = parse_clova_ocr_response(ocr_response_json)
+    cache_key = ocr_result_cache.make_key(image_bytes)
+    return await _ocr_to_temp(cache_key, image_bytes, image_format)
+
+# ------ OCR 처리 (multipart 스트리밍 업로드) ------
+# 업로드 파일은 메모리/임시 파일에 스풀링되고, Clova로 전송할 때 파일에서 바로 스트리밍 (Base64 변환 없음)
+@router.post("/ocr/upload")
+async def ocr_problem_upload(file: UploadFile = File(...)):
+    check_upload_size(file)
+    cache_key = ocr_result_cache.make_key_from_file(file.file)
+    return await _ocr_to_temp(cache_key, file.file, image_format_of(file))
+
+# OCR 실행 후 임시 저장소에 결과를 저장하고 temp_id 반환 (/ocr, /ocr/upload 공통)
+async def _ocr_to_temp(cache_key: str, image, image_format: str):
+    # 같은 이미지의 OCR 결과가 캐시에 있으면 API 호출 생략
+    parsed_data = ocr_result_cache.get(cache_key)
+    if parsed_data is None:
+        # OCR 백엔드 호출 (utils/ocr_backends.py - 엔진과 상관없이 Clova 응답 형식으로 반환)
+        ocr_response_json = await get_ocr_backend().recognize(image, image_format)
+
+        # 결과 파싱 (utils/ocr.py 사용)
+        with metrics.timed("ocr_parse"):
+            parsed_data = parse_clova_ocr_response(ocr_response_json)
+        ocr_result_cache.set(cache_key, parsed_data)
     if not parsed_data:
         raise HTTPException(status_code=400, detail="이미지에서 텍스트를 추출하지 못했거나, 문제 형식을 인식할 수 없습니다.")
     
     # 임시 저장소(temp_ocr_results)에 결과 저장하고 temp_id 반환
-    problem_data = parsed_data[0]
-    temp_id = str(uuid.uuid4())
-    temp_ocr_results[temp_id] = problem_data
-    return {"temp_id": temp_id, "preview": problem_data}
+    return _store_temp(parsed_data)
+
+# 인식된 문제마다 temp_id를 발급 (temp_id/preview는 첫 번째 문제, problems에 페이지의 전체 문제)
+def _store_temp(parsed_data: List[dict]) -> dict:
+    problems = []
+    for problem_data in parsed_data:
+        temp_id = str(uuid.uuid4())
+        temp_ocr_results.set(temp_id, problem_data)
+        problems.append({"temp_id": temp_id, "preview": problem_data})
+    return {**problems[0], "problems": problems}
+
+# ------ 다중 이미지 OCR (multipart 업로드, NDJSON 스트리밍 응답) ------
+# 각 이미지의 결과를 완료되는 순서대로 한 줄씩 전송 -> 클라이언트가 미리보기를 점진적으로 표시
+@router.post("/ocr/batch")
+async def ocr_problems_batch(username: str = Form(...), files: List[UploadFile] = File(...)):
+    if not files:
+        raise HTTPException(status_code=400, detail="이미지가 없습니다.")
+    for f in files:
+        check_upload_size(f)
+
+    # 업로드 파일은 응답 스트리밍 전에 닫히므로 미리 읽어 둠
+    images = [(await f.read(), image_format_of(f)) for f in files]
+    cache_keys = [ocr_result_cache.make_key(image_bytes) for image_bytes, _ in images]
+
+    async def ocr_chunk(indices: List[int]):
+        # 백엔드의 images_per_request 단위로 묶어서 요청, 결과는 (index, 결과) 목록으로 반환
+        try:
+            responses = await get_ocr_backend().recognize_many([images[i] for i in indices])
+        except HTTPException as e:
+            return [(i, e) for i in indices]
+        results = []
+        for i, single in zip(indices, responses):
+            try:
+                with metrics.timed("ocr_parse"):
+                    parsed_data = parse_clova_ocr_response(single) if single else []
+            except HTTPException as e:
+                results.append((i, e))
+                continue
+            ocr_result_cache.set(cache_keys[i], parsed_data)
+            results.append((i, parsed_data))
+        return results
+
+    def to_line(index: int, result) -> bytes:
+        if isinstance(result, HTTPException):
+            line = {"index": index, "filename": files[index].filename, "status_code": result.status_code, "error": result.detail}
+        elif not result:
+            line = {"index": index, "filename": files[index].filename, "status_code": 400, "error": "이미지에서 텍스트를 추출하지 못했거나, 문제 형식을 인식할 수 없습니다."}
+        else:
+            line = {"index": index, "filename": files[index].filename, **_store_temp(result)}
+        return (json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8")
+
+    async def stream():
+        # 캐시에 있는 이미지는 즉시 전송
+        misses = []
+        for i, key in enumerate(cache_keys):
+            cached = ocr_result_cache.get(key)
+            if cached is None:
+                misses.append(i)
+            else:
+                yield to_line(i, cached)
+
+        # 나머지는 최대 OCR_BATCH_WINDOW개의 Clova 요청을 동시에 진행
+        window = asyncio.Semaphore(OCR_BATCH_WINDOW)
+        async def bounded(indices):
+            async with window:
+                return await ocr_chunk(indices)
+
+        per_request = get_ocr_backend().images_per_request
+        chunks = [misses[i:i + per_request] for i in range(0, len(misses), per_request)]
+        tasks = [asyncio.ensure_future(bounded(chunk)) for chunk in chunks]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for i, result in await finished:
+                    yield to_line(i, result)
+        finally:
+            # 클라이언트 연결이 끊기면 남은 OCR 요청 취소
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+# ------ OCR 캐시/임시 저장소 통계 조회 (GET) ------
+@router.get("/ocr/stats")
+def get_ocr_stats():
+    return {"backend": ocr_backend_stats(), "cache": ocr_result_cache.stats(), "temp_store": temp_ocr_results.stats()}
 
 # ------ 문제 최종 저장 ------
 @router.post("/problems", status_code=201)
 def save_problem(request: schemas.SaveProblemRequest, db: Session = Depends(get_db)):
     # 임시 ID로 OCR 데이터 조회 (유효성 검사)
-    if request.temp_id not in temp_ocr_results:
+    ocr_data = temp_ocr_results.get(request.temp_id)
+    if ocr_data is None:
         raise HTTPException(status_code=404, detail="임시 데이터 만료")
     
-    ocr_data = temp_ocr_results.pop(request.temp_id)
-    folder = crud.get_folder_by_id(db, request.folder_id)
-    if not folder: raise HTTPException(status_code=404, detail="폴더 없음")
+    owner_id = crud.get_folder_owner_id(db, request.folder_id)
+    if not owner_id:
+        raise HTTPException(status_code=404, detail="폴더 없음")
 
     # 클라이언트에서 수정한 값이 있으면 우선 사용, 없으면 OCR 원본 사용
     final_text = request.problem_text if request.problem_text else ocr_data['problem']
     final_choices = request.choices if request.choices else ocr_data['choices']
 
+    # 같은 폴더에 거의 같은 문제가 있으면 저장은 하되 응답에 알림 (변형 문제 등 의도적인 저장 허용)
+    duplicates = [] if request.allow_duplicate else find_duplicate_problems(db, request.folder_id, final_text, final_choices)
+
+    # 임시 데이터 사용 처리 (동시에 같은 temp_id로 저장하는 경우 한 번만 성공)
+    if temp_ocr_results.pop(request.temp_id) is None:
+        raise HTTPException(status_code=404, detail="임시 데이터 만료")
+
     new_prob = models.Problem(
         problem_text=final_text,
         choices=final_choices,
         correct_answer=request.correct_answer,
-        folder_id=folder.id,
+        folder_id=request.folder_id,
         memo=request.memo
     )
     db.add(new_prob)
-    db.commit()
-    return {"message": "저장 완료", "id": new_prob.id}
+    try:
+        db.commit()
+    except IntegrityError:
+        # 다른 워커에서 폴더가 삭제되어 캐시가 오래된 경우
+        db.rollback()
+        crud.invalidate_folder(request.folder_id)
+        raise HTTPException(status_code=404, detail="폴더 없음")
+    index_problem(owner_id, new_prob.id, new_prob.search_text)
+    return {
+        "message": "저장 완료",
+        "id": new_prob.id,
+        "duplicates": [{"id": problem_id, "similarity": round(score, 3)} for problem_id, score in duplicates],
+    }
 
 # ------ 폴더 내 문제 목록 조회 (GET) ------
-@router.get("/problems")
-def get_problems(folder_id: int = Query(...), db: Session = Depends(get_db)):
-    folder = crud.get_folder_by_id(db, folder_id)
-    if not folder: raise HTTPException(status_code=404, detail="폴더 없음")
-    
+# 응답 필드명 -> 컬럼 매핑 (fields= 파라미터로 일부만 선택 가능)
+PROBLEM_FIELD_COLUMNS = {
+    "problem": models.Problem.problem_text,
+    "choices": models.Problem.choices,
+    "answer": models.Problem.correct_answer,
+    "is_wrong_note": models.Problem.is_wrong_note,
+    "memo": models.Problem.memo,
+}
+
+@router.get("/problems", response_model=schemas.ProblemListResponse)
+def get_problems(
+    request: Request,
+    folder_id: int = Query(...),
+    limit: Optional[int] = Query(None, ge=1, le=500),   # 지정 시 키셋 페이지네이션 (created_at, id 순)
+    cursor: Optional[str] = Query(None),                # 이전 응답의 next_cursor
+    fields: Optional[str] = Query(None),                # 응답 필드 선택 (예: fields=problem,is_wrong_note)
+    db: Session = Depends(get_read_db),
+):
+    if not crud.get_folder_owner_id(db, folder_id):
+        raise HTTPException(status_code=404, detail="폴더 없음")
+
+    # 요청한 필드에 해당하는 컬럼만 조회
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in PROBLEM_FIELD_COLUMNS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"알 수 없는 필드: {', '.join(unknown)}")
+    else:
+        selected = list(PROBLEM_FIELD_COLUMNS)
+    columns = [PROBLEM_FIELD_COLUMNS[f] for f in selected]
+
+    query = db.query(models.Problem.id, models.Problem.created_at, *columns)\
+        .filter(models.Problem.folder_id == folder_id)\
+        .order_by(models.Problem.created_at, models.Problem.id)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(models.Problem.created_at, models.Problem.id) > (cursor_created_at, cursor_id))
+    # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+    rows = query.limit(limit + 1).all() if limit else query.all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+
     problems = {}
-    for p in folder.problems:
-        problems[p.id] = {
-            "problem": p.problem_text,
-            "choices": p.choices,
-            "answer": p.correct_answer,
-            "is_wrong_note": p.is_wrong_note,
-            "memo": p.memo
+    for row in rows:
+        problems[row[0]] = dict(zip(selected, row[2:]))
+
+    response = {"problems": problems}
+    if limit:
+        response["next_cursor"] = next_cursor
+    return model_response(request, schemas.ProblemListResponse, response)
+
+# ------ 문제 검색 (GET) ------
+# 지문/선지/메모 대상 부분 일치 + 유사도 검색 (PostgreSQL: pg_trgm 인덱스, 그 외: 메모리 역색인)
+@router.get("/problems/search", response_model=schemas.SearchResponse)
+def search_problems_api(
+    request: Request,
+    username: str = Query(...),
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    user_id = crud.get_user_id(db, username)
+    if not user_id: raise HTTPException(status_code=404, detail="사용자 없음")
+
+    matches = search_problems(db, user_id, q, limit)
+    if not matches:
+        return {"problems": {}}
+
+    # 점수순 결과에 문제 내용 채우기 (한 번의 IN 쿼리)
+    rows = db.query(
+            models.Problem.id,
+            models.Problem.problem_text,
+            models.Problem.choices,
+            models.Problem.correct_answer,
+            models.Problem.folder_id,
+        )\
+        .filter(models.Problem.id.in_([problem_id for problem_id, _ in matches])).all()
+    by_id = {row[0]: row for row in rows}
+
+    problems = {}
+    for problem_id, score in matches:
+        if problem_id not in by_id:
+            continue
+        _, problem_text, choices, correct_answer, folder_id = by_id[problem_id]
+        problems[problem_id] = {
+            "problem": problem_text,
+            "choices": choices,
+            "answer": correct_answer,
+            "folder_id": folder_id,
+            "score": round(score, 3)
         }
-    return {"problems": problems}
+    return model_response(request, schemas.SearchResponse, {"problems": problems})
 
 # ------ 문제 수정 (PUT) ------
 @router.put("/problems/{problem_id}")
@@ -104,6 +299,8 @@ def update_problem(problem_id: str, request: schemas.UpdateProblemRequest, db: S
     if request.problem_text: problem.problem_text = request.problem_text
     if request.correct_answer: problem.correct_answer = request.correct_answer
     db.commit()
+    if request.problem_text:
+        index_problem(crud.get_folder_owner_id(db, problem.folder_id), problem.id, problem.search_text)
     return {"message": "수정 완료"}
 
 # ------ 문제 삭제 (DELETE) ------
@@ -113,8 +310,11 @@ def delete_problem(problem_id: str, db: Session = Depends(get_db)):
     if not problem: 
         raise HTTPException(status_code=404, detail="문제 없음")
     
+    folder_id = problem.folder_id
+    db.query(models.ReviewSchedule).filter(models.ReviewSchedule.problem_id == problem_id).delete(synchronize_session=False)
     db.delete(problem)
     db.commit()
+    unindex_problem(crud.get_folder_owner_id(db, folder_id), problem_id)
     return Response(status_code=204)
 
 # ------ 문제 정답 채점 (POST) ------
@@ -125,27 +325,42 @@ def check_answer(problem_id: str, request: schemas.SolveRequest, db: Session = D
         raise HTTPException(status_code=404, detail="문제 없음")
     
     is_correct = (problem.correct_answer == request.user_answer)
+    # 채점 결과를 복습 일정과 폴더별 정답률 집계에 반영
+    owner_id = crud.get_folder_owner_id(db, problem.folder_id)
+    if owner_id:
+        solved_at = models.utc_now()
+        review.apply_results(db, owner_id, [(problem.id, problem.folder_id, is_correct)], solved_at)
+        analytics.record_folder_results(db, owner_id, solved_at, {problem.folder_id: (1, int(is_correct))})
+        db.commit()
     # 채점 결과 리턴 (200 OK 사용 - 결과를 리턴해야 하므로)
     return {"result": "정답" if is_correct else "오답", "is_correct": is_correct}
 
 # ------ 오답노트 조회 (GET) ------
-@router.get("/wrong-notes")
-def get_wrong_notes(username: str = Query(...), db: Session = Depends(get_db)):
-    user = crud.get_user_by_name(db, username)
-    if not user: raise HTTPException(status_code=404, detail="사용자 없음")
+@router.get("/wrong-notes", response_model=schemas.ProblemListResponse)
+def get_wrong_notes(request: Request, username: str = Query(...), db: Session = Depends(get_read_db)):
+    user_id = crud.get_user_id(db, username)
+    if not user_id: raise HTTPException(status_code=404, detail="사용자 없음")
     
-    # 모든 폴더를 순회하며 is_wrong_note=True인 문제 수집
+    # 사용자 폴더와 조인하여 is_wrong_note=True인 문제만 한 번에 조회 (필요한 컬럼만 로드)
+    rows = db.query(
+            models.Problem.id,
+            models.Problem.problem_text,
+            models.Problem.choices,
+            models.Problem.correct_answer,
+        )\
+        .join(models.Folder, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user_id, models.Problem.is_wrong_note == True)\
+        .order_by(models.Problem.folder_id, models.Problem.created_at).all()
+
     wrong_problems = {}
-    for folder in user.folders:
-        for p in folder.problems:
-            if p.is_wrong_note:
-                wrong_problems[p.id] = {
-                    "problem": p.problem_text,
-                    "choices": p.choices,
-                    "answer": p.correct_answer,
-                    "is_wrong_note": True
-                }
-    return {"problems": wrong_problems}
+    for problem_id, problem_text, choices, correct_answer in rows:
+        wrong_problems[problem_id] = {
+            "problem": problem_text,
+            "choices": choices,
+            "answer": correct_answer,
+            "is_wrong_note": True
+        }
+    return model_response(request, schemas.ProblemListResponse, {"problems": wrong_problems})
 
 
 # ------ 오답노트 상태 일괄 변경 (PATCH) ------
@@ -0,0 +1,26 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from database import get_db
+import crud, schemas
+from utils import review
+from utils.responses import model_response
+
+router = APIRouter(tags=["Reviews"])
+
+# ------ 복습할 문제 조회 (GET) ------
+# 간격 반복(SM-2) 일정상 복습 시각이 지난 문제를 오래된 순으로 N개 (채점은 /exams/submissions)
+@router.get("/reviews/due", response_model=schemas.DueReviewResponse)
+def get_due_reviews(
+    request: Request,
+    username: str = Query(...),
+    folder_id: Optional[int] = Query(None),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    user_id = crud.get_user_id(db, username)
+    if not user_id: raise HTTPException(status_code=404, detail="사용자 없음")
+    if folder_id is not None and crud.get_folder_owner_id(db, folder_id) != user_id:
+        raise HTTPException(status_code=404, detail="폴더 없음")
+
+    return model_response(request, schemas.DueReviewResponse, review.due_problems(db, user_id, limit, folder_id))
@@ -1,19 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 import models, schemas, crud
+from shared_data import stats_aggregator
+from utils.stats_aggregator import STATS_WRITE_BEHIND
+from utils import analytics
+from utils.responses import model_response
 
 router = APIRouter(tags=["Users & Stats"])
 
 # ------ 학습 통계 업데이트 (PUT) ------
 @router.put("/user/stats")
 def update_user_stats(request: schemas.UserStatsUpdate, db: Session = Depends(get_db)):
-    user = crud.get_user_by_name(db, request.username)
-    if not user: raise HTTPException(status_code=404, detail="사용자 없음")
-    
-    # 기존 통계에 누적 합산
-    user.total_solved += request.solved_count
-    user.total_correct += request.correct_count
+    # 쓰기 지연 모드: 사용자 확인 후(캐시 우선) 증가분을 메모리에 합산해 두고 주기적으로 일괄 반영
+    if STATS_WRITE_BEHIND:
+        if not crud.get_user_id(db, request.username):
+            raise HTTPException(status_code=404, detail="사용자 없음")
+        stats_aggregator.add(request.username, request.solved_count, request.correct_count)
+        return {"message": "통계 업데이트 완료"}
+
+    # 기존 통계에 누적 합산 (원자적 UPDATE, 사용자 조회 불필요)
+    if not crud.increment_user_stats(db, request.username, request.solved_count, request.correct_count):
+        raise HTTPException(status_code=404, detail="사용자 없음")
     
     db.commit()
     return {"message": "통계 업데이트 완료"}
@@ -21,32 +29,35 @@ def update_user_stats(request: schemas.UserStatsUpdate, db: Session = Depends(ge
 # ------ 시험 점수 기록 생성 (POST) ------
 @router.post("/history", status_code=201)
 def create_history(request: schemas.HistoryCreate, db: Session = Depends(get_db)):
-    user = crud.get_user_by_name(db, request.username)
-    if not user: raise HTTPException(status_code=404)
+    user_id = crud.get_user_id(db, request.username)
+    if not user_id: raise HTTPException(status_code=404)
     
-    new_history = models.ExamHistory(user_id=user.id, score=request.score)
+    # 집계 테이블과 같은 날짜로 반영되도록 저장 시각을 애플리케이션에서 지정
+    new_history = models.ExamHistory(user_id=user_id, score=request.score, solved_date=models.utc_now())
     db.add(new_history)
+    analytics.record_scores(db, user_id, [(new_history.score, new_history.solved_date)])
     db.commit()
     return {"message": "기록됨"}
 
 # ------ 시험 점수 이력 조회 (GET) ------
-@router.get("/history")
-def get_histories(username: str = Query(...), db: Session = Depends(get_db)):
-    user = crud.get_user_by_name(db, username)
-    if not user:
+@router.get("/history", response_model=schemas.HistoryListResponse)
+def get_histories(request: Request, username: str = Query(...), db: Session = Depends(get_read_db)):
+    user_id = crud.get_user_id(db, username)
+    if not user_id:
         raise HTTPException(status_code=404, detail="사용자 없음")
     
-    # 날짜순 정렬 후 최근 10개만
-    histories = db.query(models.ExamHistory)\
-        .filter(models.ExamHistory.user_id == user.id)\
-        .order_by(models.ExamHistory.solved_date.asc())\
+    # 최근 10개를 (user_id, solved_date) 인덱스로 조회한 뒤 날짜순으로 정렬
+    histories = db.query(models.ExamHistory.solved_date, models.ExamHistory.score)\
+        .filter(models.ExamHistory.user_id == user_id)\
+        .order_by(models.ExamHistory.solved_date.desc())\
         .limit(10).all()
+    histories.reverse()
         
-    return {
+    return model_response(request, schemas.HistoryListResponse, {
         "data": [
             {
-                "date": h.solved_date.strftime("%m/%d"), # "10/25" 형식
+                "date": analytics.local_day(h.solved_date).strftime("%m/%d"), # "10/25" 형식 (분석 API와 같은 시간대)
                 "score": h.score
             } for h in histories
         ]
-    }
\ No newline at end of file
+    })
\ No newline at end of file
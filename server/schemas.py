@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 # ------ User ------
 # 회원가입 
@@ -46,6 +47,7 @@ class SaveProblemRequest(BaseModel):
     problem_text: Optional[str] = None      # 사용자가 수정한 문제 텍스트
     choices: Optional[List[str]] = None     # 사용자가 수정한 선지 
     memo: Optional[str] = None 
+    allow_duplicate: bool = False           # True: 같은 폴더의 비슷한 문제 확인 생략
 
 class UpdateProblemRequest(BaseModel):
     problem_text: Optional[str] = None
@@ -64,6 +66,19 @@ class OcrRequest(BaseModel):
     username: str
     image_data: str         # Base64 인코딩된 이미지 문자열
 
+# ------ Exam (시험 출제/일괄 채점) ------
+class ExamCreate(BaseModel):
+    username: str
+    folder_ids: Optional[List[int]] = None          # 출제 대상 폴더 (None이면 전체 폴더)
+    wrong_notes_only: bool = False                  # True: 오답노트 문제에서만 출제
+    count: int = Field(20, ge=1, le=200)            # 출제 문제 수
+
+class ExamSubmit(BaseModel):
+    username: str
+    answers: Dict[str, str]                         # problem_id -> 사용자 답 (미응답은 빈 문자열)
+    mark_wrong_notes: bool = True                   # 틀린 문제를 오답노트에 추가
+    unmark_correct: bool = False                    # 맞힌 문제를 오답노트에서 제거
+
 # ------ History (시험 결과 기록) ------
 class HistoryCreate(BaseModel):
     username: str
@@ -71,4 +86,90 @@ class HistoryCreate(BaseModel):
 
 class HistoryResponse(BaseModel):
     date: str  # "2023-10-25"
-    score: int
\ No newline at end of file
+    score: int
+
+class HistoryListResponse(BaseModel):
+    data: List[HistoryResponse]
+
+# ------ Backup (가져오기 파일의 레코드 한 줄, utils/transfer.py에서 검증) ------
+class ImportFolderRecord(BaseModel):
+    id: int
+    name: str
+    color: Optional[str] = None
+
+class ImportProblemRecord(BaseModel):
+    id: str
+    folder_id: int
+    problem_text: str
+    choices: Optional[List[str]] = None     # null은 빈 목록으로 저장
+    correct_answer: str
+    is_wrong_note: bool = False
+    memo: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class ImportHistoryRecord(BaseModel):
+    score: int
+    solved_date: Optional[datetime] = None
+
+# ------ 응답 모델 (목록/조회 API, utils/responses.py의 model_response로 직렬화) ------
+class FolderItem(BaseModel):
+    id: int
+    name: Optional[str]
+    color: Optional[str]
+    problem_count: int
+
+class FolderListResponse(BaseModel):
+    folders: List[FolderItem]
+    wrong_note_count: int
+    accuracy: int
+
+# /problems는 fields=로 일부 필드만 선택할 수 있으므로 모든 필드가 선택 항목 (선택하지 않은 필드는 응답에서 제외)
+class ProblemItem(BaseModel):
+    problem: Optional[str] = None
+    choices: Optional[List[str]] = None
+    answer: Optional[str] = None
+    is_wrong_note: Optional[bool] = None
+    memo: Optional[str] = None
+
+class ProblemListResponse(BaseModel):
+    problems: Dict[str, ProblemItem]        # problem_id -> 문제
+    next_cursor: Optional[str] = None       # limit 지정 시에만 포함 (마지막 페이지면 null)
+
+class SearchResultItem(BaseModel):
+    problem: str
+    choices: Optional[List[str]]
+    answer: str
+    folder_id: int
+    score: float
+
+class SearchResponse(BaseModel):
+    problems: Dict[str, SearchResultItem]   # 점수 높은 순
+
+class ExamProblem(BaseModel):
+    problem: str
+    choices: Optional[List[str]]
+
+class ExamResponse(BaseModel):
+    problems: Dict[str, ExamProblem]
+
+class ExamResultItem(BaseModel):
+    is_correct: bool
+    answer: str
+
+class ExamResult(BaseModel):
+    score: int
+    total: int
+    correct_count: int
+    results: Dict[str, ExamResultItem]
+
+class DueReviewItem(BaseModel):
+    problem: str
+    choices: Optional[List[str]]
+    folder_id: int
+    due_at: str             # ISO 8601 (UTC)
+    interval_days: float
+    lapses: int
+
+class DueReviewResponse(BaseModel):
+    problems: Dict[str, DueReviewItem]      # 복습 시각이 오래된 순
+    next_due_at: Optional[str] = None
@@ -1,3 +1,16 @@
-# OCR로 분석된 데이터를 '저장' 버튼을 누르기 전까지 임시로 보관하는 딕셔너리
+from utils.temp_store import create_temp_store
+from utils.ocr_cache import create_ocr_cache
+from utils.ocr_backends import OCR_BACKEND
+from utils.stats_aggregator import StatsAggregator
+from database import SessionLocal
+
+# OCR로 분석된 데이터를 '저장' 버튼을 누르기 전까지 임시로 보관하는 저장소
 # Key: temp_id (UUID), Value: 파싱된 문제 데이터
-temp_ocr_results = {}
\ No newline at end of file
+# TEMP_STORE_BACKEND=sqlite 설정 시 여러 워커 프로세스가 같은 저장소를 공유
+temp_ocr_results = create_temp_store()
+
+# 이미지 해시 -> 파싱된 OCR 결과 캐시 (중복 업로드 시 OCR 엔진 호출 생략, 엔진별로 키 구분)
+ocr_result_cache = create_ocr_cache(namespace=OCR_BACKEND)
+
+# 사용자 통계 증가분 합산기 (STATS_WRITE_BEHIND=true일 때 주기적으로 DB 반영)
+stats_aggregator = StatsAggregator(SessionLocal)
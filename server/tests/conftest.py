@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# 서버 모듈은 import 시점에 환경 변수를 읽으므로 테스트용 SQLite DB를 먼저 지정
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
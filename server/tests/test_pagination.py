@@ -0,0 +1,42 @@
+"""
+GET /problems 키셋 페이지네이션: 마이그레이션 전 SQLite에 초 단위로 저장된 created_at이
+같은 문제들도 페이지 경계에서 빠지거나 중복되지 않아야 함.
+
+실행:
+    cd server
+    python -m pytest -q tests
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+import database
+import migrations
+
+
+def test_equal_legacy_timestamps_page_without_gaps():
+    engine = database.engine
+    # v0008(created_at 형식 통일) 이전 스키마에 server_default 형식의 같은 시각으로 문제 저장
+    migrations.upgrade(engine, target=7)
+    problem_ids = [f"legacy-{i}" for i in range(7)]
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, username, password_hash) VALUES (1, 'legacy', 'x')"))
+        conn.execute(text("INSERT INTO folders (id, name, user_id) VALUES (1, 'legacy', 1)"))
+        for problem_id in problem_ids:
+            conn.execute(text("INSERT INTO problems (id, problem_text, correct_answer, folder_id, created_at) "
+                              "VALUES (:id, 'q', '1', 1, '2024-01-01 10:00:00')"), {"id": problem_id})
+    migrations.upgrade(engine)
+
+    import main
+    client = TestClient(main.app)
+    seen, cursor = [], None
+    while True:
+        params = {"folder_id": 1, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        res = client.get("/problems", params=params)
+        assert res.status_code == 200
+        body = res.json()
+        seen += list(body["problems"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == problem_ids
@@ -0,0 +1,186 @@
+import os
+import json
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+from fastapi import HTTPException
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+import models
+
+# ------ 학습 분석(rollup) 설정 ------
+ANALYTICS_TIMEZONE = ZoneInfo(os.getenv("ANALYTICS_TIMEZONE", "Asia/Seoul"))     # 일/주 경계 기준 시간대
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "731"))               # 한 번에 조회 가능한 최대 기간 (일)
+ANALYTICS_CACHE_MAX_AGE = int(os.getenv("ANALYTICS_CACHE_MAX_AGE", "0"))      # 응답 Cache-Control max-age (초)
+TREND_FLAT_SLOPE = 0.5   # 기간당 평균 점수 변화가 이 값 미만이면 "flat"
+
+# 기간 미지정 시 기본 조회 범위
+_DEFAULT_SPAN = {"day": timedelta(days=29), "week": timedelta(weeks=11)}
+
+
+def local_day(value: datetime) -> date:
+    # 시간대 없는 값은 UTC로 간주
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(ANALYTICS_TIMEZONE).date()
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+# ------ 집계 테이블 증분 갱신 (기록 저장과 같은 트랜잭션에서 호출) ------
+def _upsert(db: Session, table, keys: List[str], rows: List[Dict], add: List[str], lowest: List[str] = (), highest: List[str] = ()):
+    """
+    키가 없으면 insert, 있으면 add 컬럼은 더하고 lowest/highest 컬럼은 최솟값/최댓값으로 갱신.
+    PostgreSQL/SQLite는 ON CONFLICT DO UPDATE 한 번으로 처리 (동시 요청에서도 누락 없음).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table)
+        new = stmt.excluded
+        values = {c: table.c[c] + new[c] for c in add}
+        values.update({c: case((new[c] < table.c[c], new[c]), else_=table.c[c]) for c in lowest})
+        values.update({c: case((new[c] > table.c[c], new[c]), else_=table.c[c]) for c in highest})
+        db.execute(stmt.on_conflict_do_update(index_elements=keys, set_=values), rows)
+        return
+
+    # 그 외 DB: 행 단위 UPDATE 후 없으면 INSERT
+    for row in rows:
+        where = [table.c[k] == row[k] for k in keys]
+        values = {c: table.c[c] + row[c] for c in add}
+        values.update({c: case((table.c[c] > row[c], row[c]), else_=table.c[c]) for c in lowest})
+        values.update({c: case((table.c[c] < row[c], row[c]), else_=table.c[c]) for c in highest})
+        if db.execute(table.update().where(*where).values(values)).rowcount == 0:
+            db.execute(table.insert(), [row])
+
+def record_scores(db: Session, user_id: int, entries: Iterable[Tuple[int, datetime]]):
+    """
+    시험 점수 기록 (score, solved_date)들을 날짜별로 합산해 DailyScoreRollup에 반영.
+    """
+    days: Dict[date, List[int]] = {}
+    for score, solved_at in entries:
+        day = local_day(solved_at)
+        agg = days.get(day)
+        if agg is None:
+            days[day] = [1, score, score, score]
+        else:
+            agg[0] += 1
+            agg[1] += score
+            agg[2] = min(agg[2], score)
+            agg[3] = max(agg[3], score)
+    if not days:
+        return
+    rows = [{"user_id": user_id, "day": day, "exam_count": count, "score_sum": total, "score_min": low, "score_max": high}
+            for day, (count, total, low, high) in days.items()]
+    _upsert(db, models.DailyScoreRollup.__table__, ["user_id", "day"], rows,
+            add=["exam_count", "score_sum"], lowest=["score_min"], highest=["score_max"])
+
+def record_folder_results(db: Session, user_id: int, solved_at: datetime, results: Dict[int, Tuple[int, int]]):
+    """
+    채점 결과를 폴더별 (푼 문제 수, 맞힌 문제 수)로 FolderDailyRollup에 반영.
+    """
+    if not results:
+        return
+    day = local_day(solved_at)
+    rows = [{"folder_id": folder_id, "day": day, "user_id": user_id, "solved_count": solved, "correct_count": correct}
+            for folder_id, (solved, correct) in results.items()]
+    _upsert(db, models.FolderDailyRollup.__table__, ["folder_id", "day"], rows, add=["solved_count", "correct_count"])
+
+
+# ------ 조회 ------
+def resolve_range(period: str, start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """
+    조회 기간 결정. 미지정 시 오늘(ANALYTICS_TIMEZONE)까지 최근 30일 / 12주, 주 단위는 월요일부터.
+    """
+    end = end or local_day(models.utc_now())
+    start = start or end - _DEFAULT_SPAN[period]
+    if start > end:
+        raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+    if (end - start).days + 1 > ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {ANALYTICS_MAX_DAYS}일입니다.")
+    return (_week_start(start) if period == "week" else start), end
+
+def _trend(series: List[Dict], start: date, step_days: int) -> Dict:
+    # 기간 평균 점수의 최소제곱 기울기 (기간당 점수 변화량)
+    if len(series) < 2:
+        return {"slope": 0.0, "direction": "flat"}
+    xs = [(date.fromisoformat(item["start"]) - start).days / step_days for item in series]
+    ys = [item["average"] for item in series]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+    direction = "flat" if abs(slope) < TREND_FLAT_SLOPE else ("up" if slope > 0 else "down")
+    return {"slope": round(slope, 2), "direction": direction}
+
+def score_summary(db: Session, user_id: int, period: str, start: date, end: date) -> Dict:
+    """
+    일/주 단위 점수 집계 (기록이 있는 기간만), 전체 요약, 추세.
+    """
+    R = models.DailyScoreRollup
+    rows = db.execute(
+        select(R.day, R.exam_count, R.score_sum, R.score_min, R.score_max)
+        .where(R.user_id == user_id, R.day >= start, R.day <= end)
+        .order_by(R.day)
+    ).all()
+
+    buckets: Dict[date, List[int]] = {}
+    for day, count, total, low, high in rows:
+        key = _week_start(day) if period == "week" else day
+        agg = buckets.get(key)
+        if agg is None:
+            buckets[key] = [count, total, low, high]
+        else:
+            agg[0] += count
+            agg[1] += total
+            agg[2] = min(agg[2], low)
+            agg[3] = max(agg[3], high)
+
+    series = [{"start": key.isoformat(), "exams": count, "average": round(total / count, 1), "min": low, "max": high}
+              for key, (count, total, low, high) in buckets.items()]
+    exams = sum(agg[0] for agg in buckets.values())
+    return {
+        "period": period,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "summary": {
+            "exams": exams,
+            "average": round(sum(agg[1] for agg in buckets.values()) / exams, 1) if exams else None,
+            "best": max((agg[3] for agg in buckets.values()), default=None),
+            "worst": min((agg[2] for agg in buckets.values()), default=None),
+        },
+        "trend": _trend(series, start, 7 if period == "week" else 1),
+        "data": series,
+    }
+
+def folder_accuracy(db: Session, user_id: int, start: date, end: date) -> Dict:
+    """
+    기간 내 폴더별 채점 문제 수 / 정답 수 / 정답률(%). 삭제된 폴더는 제외.
+    """
+    R = models.FolderDailyRollup
+    rows = db.execute(
+        select(R.folder_id, models.Folder.name, func.sum(R.solved_count), func.sum(R.correct_count))
+        .join(models.Folder, R.folder_id == models.Folder.id)
+        .where(R.user_id == user_id, R.day >= start, R.day <= end)
+        .group_by(R.folder_id, models.Folder.name)
+        .order_by(R.folder_id)
+    ).all()
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "data": [
+            {"folder_id": folder_id, "folder_name": name, "solved": int(solved), "correct": int(correct),
+             "accuracy": round(correct / solved * 100, 1) if solved else None}
+            for folder_id, name, solved, correct in rows
+        ],
+    }
+
+def make_etag(payload: Dict) -> str:
+    # 같은 조회 결과면 같은 ETag (응답 본문 기준)
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
@@ -0,0 +1,294 @@
+import os
+import re
+import sys
+import time
+import logging
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# ------ 지표 수집 / 프로파일러 설정 ------
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"              # 요청별 지표 수집 여부
+PROFILE_SLOW_REQUESTS = os.getenv("PROFILE_SLOW_REQUESTS", "false").lower() == "true"  # 느린 요청 스택 샘플 저장 여부
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "1000"))         # 이 시간(ms) 이상 걸린 요청의 샘플을 저장
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))    # 스택 샘플링 주기 (ms)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")                    # 샘플 저장 디렉터리 (.folded 파일)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))        # 보관할 최대 파일 수 (오래된 것부터 삭제)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ------ Prometheus 텍스트 형식 히스토그램 ------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    """
+    레이블별 누적 버킷 히스토그램 (Prometheus histogram 형식으로 출력).
+    """
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List] = {}   # 레이블 값 -> [버킷별 개수, 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        for key, counts, total, count in sorted(snapshot):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total:.6f}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "요청 처리 시간 (응답 본문 전송 완료까지)", ("method", "route", "status"))
+REQUEST_SQL_QUERIES = Histogram("http_request_sql_queries", "요청당 실행한 SQL 문 수", ("route",), QUERY_COUNT_BUCKETS)
+REQUEST_SQL_SECONDS = Histogram("http_request_sql_seconds", "요청당 SQL 실행 시간 합계", ("route",))
+SQL_LATENCY = Histogram("db_query_duration_seconds", "SQL 문 하나의 실행 시간")
+OCR_LATENCY = Histogram("ocr_backend_duration_seconds", "OCR 엔진 호출 시간", ("backend", "outcome"))
+STAGE_LATENCY = Histogram("stage_duration_seconds", "처리 단계별 시간 (base64_decode, ocr_parse, json_render, compress)", ("stage",))
+_HISTOGRAMS = (REQUEST_LATENCY, REQUEST_SQL_QUERIES, REQUEST_SQL_SECONDS, SQL_LATENCY, OCR_LATENCY, STAGE_LATENCY)
+
+_inflight = 0
+
+
+# ------ 요청별 SQL 집계 (SQLAlchemy 엔진 이벤트) ------
+class RequestStats:
+    __slots__ = ("sql_queries", "sql_seconds")
+
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+
+# 스레드풀에서 실행되는 동기 엔드포인트에도 컨텍스트가 복사되므로 같은 객체에 누적됨
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    if not METRICS_ENABLED:
+        return
+    SQL_LATENCY.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_queries += 1
+        stats.sql_seconds += elapsed
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+class timed:
+    """
+    처리 단계 시간 기록: with metrics.timed("ocr_parse"): ...
+    """
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if METRICS_ENABLED:
+            STAGE_LATENCY.observe(time.perf_counter() - self.start, self.stage)
+
+
+# ------ 느린 요청 스택 샘플링 프로파일러 ------
+class SamplingProfiler:
+    """
+    요청이 처리 중인 동안 PROFILE_INTERVAL_MS마다 모든 스레드의 스택을 샘플링해 최근 샘플을 보관하고,
+    PROFILE_SLOW_MS 이상 걸린 요청이 끝나면 그 구간의 샘플을 flamegraph용 collapsed 형식(.folded)으로 저장.
+    서버 코드가 포함된 스택만 보관하며, 동시에 처리된 다른 요청의 스택이 섞일 수 있음.
+    """
+    def __init__(self, interval: float, buffer_seconds: float = 60.0):
+        self.interval = interval
+        self._samples: Deque[Tuple[float, str]] = deque(maxlen=max(1000, int(buffer_seconds / interval) * 8))
+        self._active = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)     # 처리 중인 요청이 생기면 샘플링 스레드를 깨움
+        self._thread: Optional[threading.Thread] = None
+        self.dumps = 0
+
+    def begin(self):
+        with self._lock:
+            self._active += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def end(self):
+        with self._lock:
+            self._active -= 1
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            # 확인과 대기를 같은 락 안에서 해야 그 사이의 begin() 알림을 놓치지 않음
+            with self._wakeup:
+                self._wakeup.wait_for(lambda: self._active > 0)
+            now = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = _collapse(frame)
+                if stack:
+                    self._samples.append((now, stack))
+            time.sleep(self.interval)
+
+    def collect(self, start: float, end: float) -> Counter:
+        return Counter(stack for at, stack in list(self._samples) if start <= at <= end)
+
+    def dump(self, start: float, end: float, method: str, route: str, elapsed_ms: float) -> Optional[str]:
+        stacks = self.collect(start, end)
+        if not stacks:
+            return None
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{method}{route}").strip("_")
+        path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{name}_{elapsed_ms:.0f}ms.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.dumps += 1
+        files = sorted(os.path.join(PROFILE_DIR, n) for n in os.listdir(PROFILE_DIR) if n.endswith(".folded"))
+        for old in files[:-PROFILE_MAX_FILES]:
+            os.remove(old)
+        return path
+
+def _collapse(frame, limit: int = 64) -> Optional[str]:
+    # 바깥 -> 안쪽 순서 "파일:함수" 목록, 서버 코드 프레임이 하나도 없으면 (대기 중인 스레드 등) 제외
+    names = []
+    ours = False
+    while frame is not None and len(names) < limit:
+        code = frame.f_code
+        filename = code.co_filename
+        if filename.startswith(SERVER_DIR) and "site-packages" not in filename and not filename.endswith("metrics.py"):
+            ours = True
+            filename = os.path.relpath(filename, SERVER_DIR)
+        else:
+            filename = os.path.basename(filename)
+        names.append(f"{filename}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names)) if ours else None
+
+profiler = SamplingProfiler(PROFILE_INTERVAL_MS / 1000) if PROFILE_SLOW_REQUESTS else None
+
+
+# ------ ASGI 미들웨어 ------
+class MetricsMiddleware:
+    """
+    요청마다 경로 템플릿(/problems/{problem_id})별 처리 시간, SQL 문 수/시간을 기록.
+    StreamingResponse는 본문 전송이 끝날 때까지의 시간을 기록.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _inflight
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        _inflight += 1
+        if profiler is not None:
+            profiler.begin()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            end = time.perf_counter()
+            _inflight -= 1
+            _current.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"   # 매칭되지 않은 경로는 하나로 묶음 (레이블 수 제한)
+            REQUEST_LATENCY.observe(end - start, scope["method"], path, str(status))
+            REQUEST_SQL_QUERIES.observe(stats.sql_queries, path)
+            REQUEST_SQL_SECONDS.observe(stats.sql_seconds, path)
+            if profiler is not None:
+                profiler.end()
+                elapsed_ms = (end - start) * 1000
+                if elapsed_ms >= PROFILE_SLOW_MS:
+                    try:
+                        saved = await run_in_threadpool(profiler.dump, start, end, scope["method"], path, elapsed_ms)
+                        if saved:
+                            logger.info("느린 요청 스택 샘플 저장: %s", saved)
+                    except OSError:
+                        logger.warning("스택 샘플 저장 실패", exc_info=True)
+
+
+# ------ /metrics 출력 ------
+def render_metrics() -> str:
+    import database
+    lines = []
+    for histogram in _HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines += ["# HELP http_requests_in_flight 처리 중인 요청 수", "# TYPE http_requests_in_flight gauge",
+              f"http_requests_in_flight {_inflight}"]
+
+    # DB 커넥션 풀 (database.MeteredQueuePool)
+    pools = {"primary": database.engine.pool}
+    if database.replica_engine is not database.engine:
+        pools["replica"] = database.replica_engine.pool
+    gauges = [
+        ("db_pool_checked_out", "gauge", "사용 중인 커넥션 수", lambda p: p.checkedout()),
+        ("db_pool_checkouts_total", "counter", "커넥션 획득 횟수", lambda p: p.checkouts),
+        ("db_pool_wait_seconds_total", "counter", "커넥션 획득 대기 시간 합계", lambda p: round(p.wait_seconds, 6)),
+        ("db_pool_timeouts_total", "counter", "커넥션 대기 시간 초과 횟수", lambda p: p.timeouts),
+    ]
+    for name, kind, documentation, read in gauges:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        for engine_name, pool in pools.items():
+            if isinstance(pool, database.MeteredQueuePool):
+                lines.append(f'{name}{{engine="{engine_name}"}} {read(pool)}')
+    return "\n".join(lines) + "\n"
@@ -1,55 +1,261 @@
 import re
+from array import array
+from itertools import accumulate
+from statistics import median
 from fastapi import HTTPException
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from utils.upload import INVALID_IMAGE_DETAIL
+
+# ------ OCR 결과 파싱 패턴 (모듈 로드 시 한 번만 컴파일) ------
+_CHOICE_MARKER = re.compile(r"([①②③④⑤])\s*(.*)", re.S)            # 필드가 선지 번호로 시작 ('①', '①서체는')
+_PROBLEM_NUMBER = re.compile(r"(\d{1,3})(?:([.)])\s*(.*))?", re.S)   # 문제 번호 ('25', '77.', '77.시각화를')
+
+# ------ 레이아웃 분석 임계값 (모두 글자 높이 대비 비율) ------
+_LINE_MERGE_RATIO = 0.5     # 같은 줄로 묶을 y 중심 차이
+_NUMBER_MARGIN_RATIO = 2.0  # 문제 번호가 단의 왼쪽 끝에서 떨어질 수 있는 최대 거리
+_NUMBER_GAP_RATIO = 0.6     # 점 없는 번호(네모 박스 번호)와 본문 사이 최소 간격
+_GUTTER_RATIO = 1.5         # 2단 편집으로 판단할 단 사이 최소 간격
+_GUTTER_BINS = 200          # 단 사이 여백 탐지용 x축 구간 수
+
+class _NoGeometry(Exception):
+    # 좌표가 없거나 쓸 수 없는 응답 -> lineBreak 기반 파싱으로 대체
+    pass
+
+
+def _box(vertices: List[Dict]) -> Tuple[float, float, float, float, float, float, float, float]:
+    # 꼭짓점이 4개가 아닌 상자: (x0, x1, y0, y1, 윗변 시작 x, y, 윗변 끝 x, y)
+    if not vertices:
+        raise _NoGeometry("empty boundingPoly")
+    xs = [p['x'] for p in vertices]
+    ys = [p['y'] for p in vertices]
+    top = 1 if len(vertices) > 1 else 0
+    return min(xs), max(xs), min(ys), max(ys), xs[0], ys[0], xs[top], ys[top]
+
+
+# ------ 필드 좌표 (필드별 dict 대신 열 단위 배열로 보관) ------
+class _Layout:
+    __slots__ = ("texts", "x0", "x1", "yc", "height", "slope")
+
+    def __init__(self, fields: List[Dict]):
+        # boundingPoly가 없거나, 꼭짓점이 비어 있거나 x/y가 빠진 필드가 있으면 _NoGeometry
+        # 필드마다 한 번만 순회하며 모든 열을 채움 (꼭짓점 4개인 일반적인 상자는 언패킹으로 바로 계산)
+        texts, x0s, x1s, ycs, heights, slopes = [], [], [], [], [], []
+        try:
+            for field in fields:
+                texts.append(field['inferText'])
+                vertices = field['boundingPoly']['vertices']
+                try:
+                    a, b, c, d = vertices
+                except ValueError:
+                    x0, x1, y0, y1, ax, ay, bx, by = _box(vertices)
+                else:
+                    ax, bx, cx, dx = a['x'], b['x'], c['x'], d['x']
+                    ay, by, cy, dy = a['y'], b['y'], c['y'], d['y']
+                    x0, x1 = min(ax, bx, cx, dx), max(ax, bx, cx, dx)
+                    y0, y1 = min(ay, by, cy, dy), max(ay, by, cy, dy)
+                # 윗변(0->1번 꼭짓점) 기울기: 사진이 기울거나 휘어도 같은 줄을 따라갈 수 있도록 사용
+                slope = (by - ay) / (bx - ax) if bx > ax else 0.0
+                # 기울어진 상자는 세로 폭이 커지므로 기울기만큼 빼서 글자 높이 추정
+                height = (y1 - y0) - abs(slope) * (x1 - x0)
+                x0s.append(x0)
+                x1s.append(x1)
+                ycs.append((y0 + y1) / 2)
+                heights.append(height if height > 1.0 else 1.0)
+                slopes.append(slope)
+        except (KeyError, TypeError) as e:
+            raise _NoGeometry(e)
+        self.texts = texts
+        self.x0, self.x1, self.yc = array("d", x0s), array("d", x1s), array("d", ycs)
+        self.height, self.slope = array("d", heights), array("d", slopes)
+
+
+def _split_columns(layout: _Layout, line_height: float) -> Optional[float]:
+    """
+    필드가 덮는 x 구간을 누적(차분 배열 + 누적합)하여 페이지 가운데의 빈 세로 띠를 찾음.
+    2단 편집이면 단 경계 x 좌표, 아니면 None 반환.
+    """
+    n = len(layout.texts)
+    left, right = min(layout.x0), max(layout.x1)
+    width = right - left
+    if n < 4 or width <= 0:
+        return None
+
+    scale = _GUTTER_BINS / width
+    diff = array("i", bytes(4 * (_GUTTER_BINS + 1)))
+    for a, b in zip(layout.x0, layout.x1):
+        diff[int((a - left) * scale)] += 1
+        diff[min(_GUTTER_BINS, int((b - left) * scale) + 1)] -= 1
+    coverage = list(accumulate(diff))
+
+    # 가운데 영역(25%~75%)에서 거의 비어 있는 가장 긴 구간 탐색 (단을 가로지르는 제목 몇 개는 허용)
+    allowance = n // 50
+    best_start, best_len, run_start = 0, 0, None
+    lo, hi = _GUTTER_BINS // 4, _GUTTER_BINS * 3 // 4
+    for b in range(lo, hi + 1):
+        if b < hi and coverage[b] <= allowance:
+            if run_start is None:
+                run_start = b
+        elif run_start is not None:
+            if b - run_start > best_len:
+                best_start, best_len = run_start, b - run_start
+            run_start = None
+    if best_len / scale < _GUTTER_RATIO * line_height:
+        return None
+
+    split = left + (best_start + best_len / 2) / scale
+    left_count = sum(1 for a, b in zip(layout.x0, layout.x1) if a + b < 2 * split)
+    if min(left_count, n - left_count) < n * 0.2:
+        return None
+    return split
+
+
+def _group_lines(layout: _Layout, indices: List[int], line_height: float) -> List[List[int]]:
+    """
+    필드를 x 순서로 훑으며, 각 줄의 마지막 필드 기울기로 예측한 y 위치에 가장 가까운 줄에 붙임.
+    반환값은 위에서 아래 순서의 줄 목록 (각 줄은 왼쪽에서 오른쪽 순서의 필드 인덱스).
+    """
+    x0, x1, yc, slope = layout.x0, layout.x1, layout.yc, layout.slope
+    tolerance = line_height * _LINE_MERGE_RATIO
+    # 예측 y는 줄의 마지막 y에서 (최대 기울기 x 단 너비) 이상 벗어날 수 없으므로,
+    # 줄을 마지막 y 기준 reach 간격 버킷에 넣고 인접 버킷의 줄만 비교 (전체 줄 순회 대신)
+    left = min(map(x0.__getitem__, indices))
+    span = max(map(x1.__getitem__, indices)) - left
+    reach = tolerance + max(map(abs, map(slope.__getitem__, indices))) * span
+    buckets: Dict[int, List[list]] = {}
+    lines = []  # [필드 목록, 마지막 x 중심, 마지막 y 중심, 기울기, 오른쪽 끝, 생성 순서]
+    for i in sorted(indices, key=x0.__getitem__):
+        xc = (x0[i] + x1[i]) / 2
+        y = yc[i]
+        b = int(y // reach)
+        best, best_distance = None, tolerance
+        for candidates in (buckets.get(b - 1), buckets.get(b), buckets.get(b + 1)):
+            if not candidates:
+                continue
+            for line in candidates:
+                if x0[i] < line[4] - tolerance:
+                    continue  # 같은 줄에서 겹치는 위치 -> 다른 줄
+                distance = abs(y - (line[2] + line[3] * (xc - line[1])))
+                # 거리가 같으면 나중에 생긴 줄 우선
+                if distance < best_distance or (distance == best_distance and (best is None or line[5] > best[5])):
+                    best, best_distance = line, distance
+        if best is None:
+            line = [[i], xc, y, slope[i], x1[i], len(lines)]
+            lines.append(line)
+            buckets.setdefault(b, []).append(line)
+        else:
+            old = int(best[2] // reach)
+            best[0].append(i)
+            best[1], best[2], best[4] = xc, y, x1[i]
+            best[3] = (best[3] + slope[i]) / 2
+            if old != b:
+                buckets[old].remove(best)
+                buckets.setdefault(b, []).append(best)
+
+    # 단의 왼쪽 끝에서의 y 위치로 줄 순서 결정
+    lines.sort(key=lambda line: line[2] - line[3] * (line[1] - left))
+    return [line[0] for line in lines]
+
+
+# ------ 문제 / 선지 분리 ------
+def _problem_number(text: str, margin_ok: bool, gap_ok: bool) -> Optional[str]:
+    # 줄 맨 앞 필드가 문제 번호이면 번호 뒤에 붙은 본문('77.시각화를' -> '시각화를') 반환, 아니면 None
+    if not margin_ok:
+        return None
+    m = _PROBLEM_NUMBER.fullmatch(text)
+    if m is None or (m.group(2) is None and not gap_ok):
+        return None
+    return m.group(3) or ""
+
+def _build_problem(tokens: List[str]) -> Dict:
+    stem, choices = [], []
+    for token in tokens:
+        m = _CHOICE_MARKER.match(token)
+        if m:
+            choices.append([m.group(1)] + ([m.group(2)] if m.group(2) else []))
+        elif choices:
+            choices[-1].append(token)
+        else:
+            stem.append(token)
+    return {"problem": " ".join(stem).strip(), "choices": [" ".join(choice) for choice in choices]}
+
+def _segment(lines: List[Tuple[List[str], Optional[str]]]) -> List[List[str]]:
+    """
+    (줄의 토큰 목록, 문제 번호 뒤 본문 또는 None) 목록을 문제 단위 토큰 목록으로 나눔.
+    번호가 없는 줄은 직전 문제에 이어 붙임 (왼쪽 단 끝에서 오른쪽 단으로 넘어가는 선지 포함).
+    """
+    problems, current = [], None
+    for tokens, rest in lines:
+        if rest is not None:
+            current = [rest] if rest else []
+            problems.append(current)
+            tokens = tokens[1:]
+        elif current is None:
+            current = []
+            problems.append(current)
+        current.extend(tokens)
+    return problems
+
+def _layout_lines(layout: _Layout) -> List[Tuple[List[str], Optional[str]]]:
+    # 좌표 기반: 단 분리 -> 단별 줄 묶기 -> 단 왼쪽 끝 근처의 번호로 문제 시작 판정
+    n = len(layout.texts)
+    line_height = median(layout.height)
+    split = _split_columns(layout, line_height)
+    if split is None:
+        columns = [list(range(n))]
+    else:
+        header, left, right = [], [], []
+        for i in range(n):
+            (left if layout.x1[i] < split else right if layout.x0[i] > split else header).append(i)
+        columns = [c for c in (header, left, right) if c]
+
+    result = []
+    for column in columns:
+        column_left = min(layout.x0[i] for i in column)
+        for line in _group_lines(layout, column, line_height):
+            first = line[0]
+            margin_ok = layout.x0[first] - column_left <= _NUMBER_MARGIN_RATIO * line_height
+            gap_ok = len(line) == 1 or layout.x0[line[1]] - layout.x1[first] >= _NUMBER_GAP_RATIO * line_height
+            tokens = [layout.texts[i] for i in line]
+            result.append((tokens, _problem_number(tokens[0], margin_ok, gap_ok)))
+    return result
+
+def _line_break_lines(fields: List[Dict]) -> List[Tuple[List[str], Optional[str]]]:
+    # 좌표가 없는 응답: Clova 인식 순서와 lineBreak 표시로 줄을 나누고, 점이 붙은 번호('12.')만 문제 시작으로 인정
+    result, tokens = [], []
+    for field in fields:
+        tokens.append(field['inferText'])
+        if field.get('lineBreak'):
+            result.append(tokens)
+            tokens = []
+    if tokens:
+        result.append(tokens)
+    return [(line, _problem_number(line[0], True, False)) for line in result]
+
 
 # ------ Naver Clova OCR 파싱 함수 ------
 def parse_clova_ocr_response(response_json: Dict) -> List[Dict]:
     """
     Naver Clova OCR 응답 JSON을 파싱하여 문제와 선지로 분리.
-    한 이미지에 하나의 문제가 있다고 가정.
+    boundingPoly 좌표로 줄/단(2단 편집)을 복원하고, 한 이미지에 있는 여러 문제를 순서대로 반환.
     """
     try:
-        fields = response_json['images'][0]['fields']
+        image = response_json['images'][0]
+        # Clova는 디코딩할 수 없는 이미지(손상/잘린 파일, 지원하지 않는 형식)에 inferResult=ERROR를 반환
+        if image.get('inferResult') == 'ERROR':
+            raise HTTPException(status_code=400, detail=INVALID_IMAGE_DETAIL)
+        fields = image['fields']
         if not fields:
             return []
 
-        # 인식된 모든 텍스트 추출
-        texts = [field['inferText'] for field in fields]
-
-        # 선지 번호(예: '①', '2')를 나타내는 텍스트 필드의 인덱스를 찾습니다.
-        # 정규식: 문자열 전체가 원 문자 또는 한 자리 숫자로만 구성된 경우
-        choice_marker_indices = [
-            i for i, text in enumerate(texts)
-            if re.fullmatch(r'[①②③④⑤]|\d', text)
-        ]
-
-        # 선지 번호를 찾지 못한 경우: 전체를 문제 지문으로 간주
-        if not choice_marker_indices:
-            # 선지를 찾지 못한 경우, 전체를 문제로 간주
-            problem_text = " ".join(texts)
-            return [{"problem": problem_text.strip(), "choices": []}]
-
-        # 첫 번째 선지 번호가 시작되는 위치 파악
-        first_choice_index_in_texts = choice_marker_indices[0]
-
-        # 1. 문제 텍스트: 첫 선지 번호 이전까지의 모든 텍스트
-        problem_text = " ".join(texts[:first_choice_index_in_texts]).strip()
-
-        # 2. 선지 텍스트 파싱
-        choices = []
-        for i in range(len(choice_marker_indices)):
-            start_index = choice_marker_indices[i]
-            
-            # 현재 선지의 끝 인덱스 결정 (다음 선지 시작 전까지, 마지막이면 끝까지)
-            if i + 1 < len(choice_marker_indices):
-                end_index = choice_marker_indices[i + 1]
-            else:
-                end_index = len(texts)
-            
-            choice_text = " ".join(texts[start_index:end_index]).strip()
-            choices.append(choice_text)
-
-        return [{"problem": problem_text, "choices": choices}]
+        try:
+            layout = _Layout(fields)
+        except _NoGeometry:
+            lines = _line_break_lines(fields)
+        else:
+            lines = _layout_lines(layout)
+
+        parsed = [_build_problem(tokens) for tokens in _segment(lines)]
+        return [p for p in parsed if p["problem"] or p["choices"]]
 
     except (KeyError, IndexError) as e:
         # OCR 응답 구조가 예상과 다를 경우 예외 처리
@@ -0,0 +1,357 @@
+import io
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from utils import ocr_client, metrics
+from utils.upload import INVALID_IMAGE_DETAIL
+
+# ------ OCR 백엔드 설정 ------
+OCR_BACKEND = os.getenv("OCR_BACKEND", "clova").lower()                     # 사용할 OCR 엔진 (clova | tesseract)
+OCR_FALLBACK_BACKEND = os.getenv("OCR_FALLBACK_BACKEND", "").lower()        # 기본 엔진이 5xx로 실패하면 사용할 엔진 (빈 값이면 사용 안 함)
+OCR_LOCAL_WORKERS = int(os.getenv("OCR_LOCAL_WORKERS", str(min(2, os.cpu_count() or 1))))  # 로컬 OCR 전용 프로세스 수
+OCR_LOCAL_QUEUE_LIMIT = int(os.getenv("OCR_LOCAL_QUEUE_LIMIT", "16"))       # 실행 중 + 대기 중 로컬 OCR 작업 허용 수 (초과 시 503)
+OCR_LOCAL_TIMEOUT = float(os.getenv("OCR_LOCAL_TIMEOUT", "30"))             # 이미지 1장 로컬 OCR 제한 시간 (초)
+OCR_LOCAL_MAX_SIDE = int(os.getenv("OCR_LOCAL_MAX_SIDE", "2000"))           # 전처리 시 긴 변 최대 픽셀 (이보다 크면 축소)
+OCR_LOCAL_MAX_SKEW = float(os.getenv("OCR_LOCAL_MAX_SKEW", "5"))            # 기울기 보정 탐색 범위 (±도, 0이면 보정 안 함)
+OCR_TESSERACT_LANG = os.getenv("OCR_TESSERACT_LANG", "kor+eng")             # Tesseract 언어 데이터
+
+ImageInput = Union[bytes, BinaryIO]
+
+class InvalidImageError(ValueError):
+    # 로컬 OCR 워커에서 이미지를 디코딩하지 못함 (손상/잘린 파일, 지원하지 않는 형식) -> 400
+    pass
+
+
+# ------ 백엔드 인터페이스 ------
+class OcrBackend:
+    """
+    OCR 엔진 공통 인터페이스.
+    결과는 엔진과 상관없이 Clova OCR 응답 형식({'images': [{'fields': [...]}]})으로 반환하여
+    parse_clova_ocr_response를 그대로 사용.
+    """
+    name = "base"
+    images_per_request = 1   # recognize_many 한 번에 묶어 처리할 이미지 수
+
+    async def recognize(self, image: ImageInput, image_format: str) -> Dict:
+        raise NotImplementedError
+
+    async def recognize_many(self, images: List[Tuple[ImageInput, str]]) -> List[Optional[Dict]]:
+        # 이미지별 단일 응답 목록 (요청 순서), 기본 구현은 이미지마다 recognize 호출
+        return list(await asyncio.gather(*(self.recognize(image, fmt) for image, fmt in images)))
+
+    async def close(self):
+        pass
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+
+class ClovaOcrBackend(OcrBackend):
+    # Naver Clova OCR API (utils/ocr_client.py - 커넥션 풀 공유, 타임아웃/재시도 적용)
+    name = "clova"
+    images_per_request = ocr_client.OCR_IMAGES_PER_REQUEST
+
+    async def recognize(self, image: ImageInput, image_format: str) -> Dict:
+        return await ocr_client.request_clova_ocr(image, image_format)
+
+    async def recognize_many(self, images: List[Tuple[ImageInput, str]]) -> List[Optional[Dict]]:
+        response_json = await ocr_client.request_clova_ocr_multi(images)
+        return ocr_client.split_clova_ocr_response(response_json, len(images))
+
+    async def close(self):
+        await ocr_client.close_client()
+
+
+class TesseractOcrBackend(OcrBackend):
+    """
+    로컬 Tesseract 엔진. 전용 프로세스 풀에서 전처리(흑백, 축소, 기울기 보정) 후 인식하여
+    이벤트 루프와 API 스레드풀을 점유하지 않고, 이미지당 CPU 사용 시간을 제한.
+    """
+    name = "tesseract"
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # 워커마다 엔진(언어 모델)을 한 번만 로드하도록 initializer 사용
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=OCR_LOCAL_WORKERS,
+                initializer=_init_worker,
+                initargs=(OCR_TESSERACT_LANG, OCR_LOCAL_MAX_SIDE, OCR_LOCAL_MAX_SKEW, OCR_LOCAL_TIMEOUT),
+            )
+        return self._executor
+
+    async def recognize(self, image: ImageInput, image_format: str) -> Dict:
+        image_bytes = image if isinstance(image, bytes) else await run_in_threadpool(_read_all, image)
+
+        # 대기열이 가득 차면 즉시 503 반환 (요청이 무한정 쌓이지 않도록)
+        with self._lock:
+            if self._inflight >= OCR_LOCAL_QUEUE_LIMIT:
+                raise HTTPException(status_code=503, detail="OCR 요청이 많아 잠시 후 다시 시도해주세요.", headers={"Retry-After": "1"})
+            self._inflight += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._get_executor(), _recognize_local, image_bytes)
+            return await asyncio.wait_for(future, OCR_LOCAL_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="로컬 OCR 처리 시간 초과")
+        except InvalidImageError:
+            raise HTTPException(status_code=400, detail=INVALID_IMAGE_DETAIL)
+        except BrokenProcessPool:
+            # 워커가 비정상 종료되면 다음 요청에서 풀을 새로 생성
+            await self.close()
+            raise HTTPException(status_code=500, detail="로컬 OCR 워커가 종료되었습니다.")
+        except (OSError, RuntimeError, ValueError) as e:
+            raise HTTPException(status_code=500, detail=f"로컬 OCR 실패: {e}")
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"backend": self.name, "workers": OCR_LOCAL_WORKERS, "inflight": self._inflight, "queue_limit": OCR_LOCAL_QUEUE_LIMIT}
+
+
+class FallbackOcrBackend(OcrBackend):
+    # 기본 엔진이 서버 측 오류(5xx: 설정 누락, 연결 실패, 시간 초과 등)로 실패하면 보조 엔진으로 재요청
+    def __init__(self, primary: OcrBackend, fallback: OcrBackend):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self.images_per_request = primary.images_per_request
+        self.fallbacks = 0
+
+    async def recognize(self, image: ImageInput, image_format: str) -> Dict:
+        try:
+            return await self.primary.recognize(image, image_format)
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise
+            self.fallbacks += 1
+            if not isinstance(image, bytes):
+                image.seek(0)
+            return await self.fallback.recognize(image, image_format)
+
+    async def recognize_many(self, images: List[Tuple[ImageInput, str]]) -> List[Optional[Dict]]:
+        try:
+            return await self.primary.recognize_many(images)
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise
+            self.fallbacks += 1
+            return await self.fallback.recognize_many(images)
+
+    async def close(self):
+        await self.primary.close()
+        await self.fallback.close()
+
+    def stats(self) -> Dict:
+        return {"backend": self.name, "fallbacks": self.fallbacks, "primary": self.primary.stats(), "fallback": self.fallback.stats()}
+
+
+class MeasuredOcrBackend(OcrBackend):
+    # 엔진 호출 시간을 결과(ok / 상태 코드)별로 기록 (/metrics의 ocr_backend_duration_seconds)
+    def __init__(self, inner: OcrBackend):
+        self.inner = inner
+        self.name = inner.name
+        self.images_per_request = inner.images_per_request
+
+    async def recognize(self, image: ImageInput, image_format: str) -> Dict:
+        return await self._measure(self.inner.recognize(image, image_format))
+
+    async def recognize_many(self, images: List[Tuple[ImageInput, str]]) -> List[Optional[Dict]]:
+        return await self._measure(self.inner.recognize_many(images))
+
+    async def _measure(self, call):
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await call
+        except HTTPException as e:
+            outcome = str(e.status_code)
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            metrics.OCR_LATENCY.observe(time.perf_counter() - start, self.name, outcome)
+
+    async def close(self):
+        await self.inner.close()
+
+    def stats(self) -> Dict:
+        return self.inner.stats()
+
+
+# ------ 설정에 따른 백엔드 선택 ------
+_BACKENDS = {"clova": ClovaOcrBackend, "tesseract": TesseractOcrBackend}
+_backend: Optional[OcrBackend] = None
+
+def _create_backend(name: str) -> OcrBackend:
+    if name not in _BACKENDS:
+        raise HTTPException(status_code=500, detail=f"알 수 없는 OCR 백엔드: {name}")
+    return MeasuredOcrBackend(_BACKENDS[name]())
+
+def get_ocr_backend() -> OcrBackend:
+    global _backend
+    if _backend is None:
+        backend = _create_backend(OCR_BACKEND)
+        if OCR_FALLBACK_BACKEND and OCR_FALLBACK_BACKEND != OCR_BACKEND:
+            backend = FallbackOcrBackend(backend, _create_backend(OCR_FALLBACK_BACKEND))
+        _backend = backend
+    return _backend
+
+# 앱 종료 시 커넥션 풀 / 워커 프로세스 정리 (main.py lifespan에서 호출)
+async def close_ocr_backend():
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+def ocr_backend_stats() -> Dict:
+    return _backend.stats() if _backend is not None else {"backend": OCR_BACKEND}
+
+def _read_all(fileobj: BinaryIO) -> bytes:
+    fileobj.seek(0)
+    return fileobj.read()
+
+
+# ------ 워커 프로세스에서 실행되는 함수 ------
+# 엔진과 설정은 프로세스마다 initializer에서 한 번만 준비
+_engine = None
+_engine_error: Optional[str] = None
+_settings: Dict = {}
+
+def _init_worker(lang: str, max_side: int, max_skew: float, timeout: float):
+    global _engine, _engine_error
+    # Tesseract 내부 OpenMP 스레드가 코어를 과점하지 않도록 프로세스당 1스레드로 제한
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    _settings.update(lang=lang, max_side=max_side, max_skew=max_skew, timeout=timeout)
+    try:
+        _engine = _load_engine(lang)
+    except Exception as e:
+        # initializer에서 예외가 나면 풀 전체가 깨지므로 기록만 하고 요청 시 오류 반환
+        _engine_error = f"{type(e).__name__}: {e}"
+
+def _load_engine(lang: str):
+    # tesserocr가 있으면 언어 모델을 메모리에 유지하는 API 객체 사용, 없으면 pytesseract(CLI 호출)
+    try:
+        import tesserocr
+        return tesserocr.PyTessBaseAPI(lang=lang)
+    except ImportError:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return pytesseract
+
+def _recognize_local(image_bytes: bytes) -> Dict:
+    # 손상된 이미지는 엔진 상태와 상관없이 요청 오류(400)가 되도록 디코딩을 먼저 수행
+    image = _preprocess(image_bytes, _settings["max_side"], _settings["max_skew"])
+    if _engine is None:
+        raise RuntimeError(_engine_error or "로컬 OCR 엔진이 초기화되지 않았습니다.")
+    if hasattr(_engine, "SetImage"):
+        words = _words_tesserocr(_engine, image)
+    else:
+        words = _words_pytesseract(_engine, image, _settings["lang"], _settings["timeout"])
+    return _to_clova_response(words, image.size)
+
+def _preprocess(image_bytes: bytes, max_side: int, max_skew: float):
+    from PIL import Image, ImageOps
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        # JPEG는 디코딩 단계에서 축소 (전체 해상도로 풀지 않음)
+        image.draft("L", (max_side, max_side))
+        image = ImageOps.exif_transpose(image).convert("L")
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise InvalidImageError(f"{type(e).__name__}: {e}") from None
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+    angle = _estimate_skew(image, max_skew)
+    if angle:
+        image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    return ImageOps.autocontrast(image, cutoff=1)
+
+def _estimate_skew(image, max_skew: float, step: float = 0.5) -> float:
+    """
+    작은 사본을 각도별로 회전시켜 가로줄 투영(행 평균)의 변화가 가장 큰 각도를 찾음.
+    글줄이 수평일 때 행 평균이 글줄/줄 간격에서 가장 뚜렷하게 갈라짐.
+    """
+    if max_skew <= 0:
+        return 0.0
+    from PIL import Image, ImageOps
+    small = image.copy()
+    small.thumbnail((600, 600), Image.BILINEAR)
+    small = ImageOps.invert(small)
+    best_angle, best_score = 0.0, -1.0
+    steps = int(max_skew / step)
+    for k in range(-steps, steps + 1):
+        angle = k * step
+        rotated = small.rotate(angle, resample=Image.NEAREST, fillcolor=0)
+        rows = list(rotated.resize((1, rotated.height), Image.BOX).getdata())
+        score = sum((a - b) ** 2 for a, b in zip(rows, rows[1:]))
+        if score > best_score:
+            best_angle, best_score = angle, score
+    return best_angle if abs(best_angle) >= step else 0.0
+
+def _words_pytesseract(pytesseract, image, lang: str, timeout: float) -> List[Tuple]:
+    data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT, timeout=timeout)
+    # 단어(level 5)만 사용하고, 다음 단어와 (블록, 문단, 줄) 번호가 다르면 줄 끝으로 표시
+    items = [i for i, text in enumerate(data["text"]) if data["level"][i] == 5 and text.strip()]
+    keys = [(data["block_num"][i], data["par_num"][i], data["line_num"][i]) for i in items]
+    return [
+        (data["text"][i].strip(), data["left"][i], data["top"][i], data["width"][i], data["height"][i],
+         float(data["conf"][i]), n + 1 == len(items) or keys[n + 1] != keys[n])
+        for n, i in enumerate(items)
+    ]
+
+def _words_tesserocr(api, image) -> List[Tuple]:
+    import tesserocr
+    api.SetImage(image)
+    api.Recognize()
+    words = []
+    iterator = api.GetIterator()
+    level = tesserocr.RIL.WORD
+    for item in tesserocr.iterate_level(iterator, level):
+        text = (item.GetUTF8Text(level) or "").strip()
+        box = item.BoundingBox(level)
+        if not text or box is None:
+            continue
+        left, top, right, bottom = box
+        line_break = item.IsAtFinalElement(tesserocr.RIL.TEXTLINE, level)
+        words.append((text, left, top, right - left, bottom - top, item.Confidence(level), line_break))
+    return words
+
+def _to_clova_response(words: List[Tuple], size: Tuple[int, int]) -> Dict:
+    # (텍스트, left, top, width, height, 신뢰도(0~100), 줄 끝 여부) -> Clova OCR 응답 형식
+    fields = [{
+        "valueType": "ALL",
+        "boundingPoly": {"vertices": [
+            {"x": float(left), "y": float(top)}, {"x": float(left + width), "y": float(top)},
+            {"x": float(left + width), "y": float(top + height)}, {"x": float(left), "y": float(top + height)},
+        ]},
+        "inferText": text,
+        "inferConfidence": round(max(conf, 0.0) / 100, 4),
+        "type": "NORMAL",
+        "lineBreak": line_break,
+    } for text, left, top, width, height, conf, line_break in words]
+    return {
+        "version": "V2",
+        "images": [{
+            "name": "temp_image",
+            "inferResult": "SUCCESS",
+            "convertedImageInfo": {"width": size[0], "height": size[1], "pageIndex": 0},
+            "fields": fields,
+        }],
+    }
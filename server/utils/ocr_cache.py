@@ -0,0 +1,58 @@
+import os
+import hashlib
+from typing import BinaryIO, Dict, List, Optional
+from utils.temp_store import TempStore, MemoryTempStore, SqliteTempStore
+
+# ------ OCR 결과 캐시 설정 ------
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+OCR_CACHE_TTL = float(os.getenv("OCR_CACHE_TTL", "86400"))               # 캐시 유효 시간 (초)
+OCR_CACHE_MAX_ITEMS = int(os.getenv("OCR_CACHE_MAX_ITEMS", "2000"))       # 최대 항목 수
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 최대 총 크기 (바이트)
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH")                              # 설정 시 SQLite 파일에 영구 저장
+
+
+class OcrResultCache:
+    """
+    이미지 바이트의 해시를 키로 parse_clova_ocr_response 결과를 보관하는 캐시.
+    같은 페이지를 여러 번 촬영해도 OCR 엔진 호출은 한 번만 발생.
+    """
+    def __init__(self, store: TempStore, enabled: bool = True, namespace: str = ""):
+        self.store = store
+        self.enabled = enabled
+        # OCR 엔진마다 결과가 다르므로 엔진 이름을 키 앞에 붙여 구분 (엔진을 바꿔도 이전 결과를 재사용하지 않음)
+        self.prefix = f"{namespace}:" if namespace else ""
+
+    def make_key(self, image_bytes: bytes) -> str:
+        return self.prefix + hashlib.sha256(image_bytes).hexdigest()
+
+    def make_key_from_file(self, fileobj: BinaryIO, chunk_size: int = 64 * 1024) -> str:
+        # 업로드 파일을 메모리에 올리지 않고 청크 단위로 해시 계산 후 처음 위치로 되돌림
+        digest = hashlib.sha256()
+        fileobj.seek(0)
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            digest.update(chunk)
+        fileobj.seek(0)
+        return self.prefix + digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        if not self.enabled:
+            return None
+        entry = self.store.get(key)
+        return entry["parsed"] if entry else None
+
+    def set(self, key: str, parsed: List[Dict]):
+        if self.enabled and parsed:
+            self.store.set(key, {"parsed": parsed})
+
+    def stats(self) -> Dict:
+        stats = self.store.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return {"enabled": self.enabled, "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0, **stats}
+
+
+def create_ocr_cache(namespace: str = "") -> OcrResultCache:
+    if OCR_CACHE_PATH:
+        store = SqliteTempStore(path=OCR_CACHE_PATH, ttl=OCR_CACHE_TTL, max_items=OCR_CACHE_MAX_ITEMS, max_bytes=OCR_CACHE_MAX_BYTES, table="ocr_result_cache")
+    else:
+        store = MemoryTempStore(ttl=OCR_CACHE_TTL, max_items=OCR_CACHE_MAX_ITEMS, max_bytes=OCR_CACHE_MAX_BYTES)
+    return OcrResultCache(store, enabled=OCR_CACHE_ENABLED, namespace=namespace)
@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple, Union
+from fastapi import HTTPException
+
+if TYPE_CHECKING:
+    import httpx    # 실제 import는 첫 OCR 요청 시 (워커 시작 시간 단축)
+
+# ------ OCR 클라이언트 설정 (환경 변수로 조정 가능) ------
+OCR_CONNECT_TIMEOUT = float(os.getenv("OCR_CONNECT_TIMEOUT", "3.0"))   # 연결 타임아웃 (초)
+OCR_READ_TIMEOUT = float(os.getenv("OCR_READ_TIMEOUT", "30.0"))        # 응답 대기 타임아웃 (초)
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "8"))       # 동시에 진행 가능한 OCR 요청 수
+OCR_MAX_RETRIES = int(os.getenv("OCR_MAX_RETRIES", "2"))               # 5xx/네트워크 오류 시 재시도 횟수
+OCR_RETRY_BACKOFF = float(os.getenv("OCR_RETRY_BACKOFF", "0.5"))       # 재시도 기본 대기 시간 (초, 지수 증가)
+OCR_BATCH_WINDOW = int(os.getenv("OCR_BATCH_WINDOW", "4"))             # 배치 OCR 요청 하나가 동시에 진행하는 OCR 호출 수
+OCR_IMAGES_PER_REQUEST = int(os.getenv("OCR_IMAGES_PER_REQUEST", "1")) # Clova 요청 1회에 묶어 보낼 이미지 수 (요금제/도메인이 지원하는 경우)
+
+# 워커 프로세스 내에서 공유되는 커넥션 풀 클라이언트와 동시 요청 제한 세마포어
+_client: Optional["httpx.AsyncClient"] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+def get_client() -> "httpx.AsyncClient":
+    global _client
+    if _client is None:
+        import httpx
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(OCR_READ_TIMEOUT, connect=OCR_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=OCR_MAX_CONCURRENCY, max_keepalive_connections=OCR_MAX_CONCURRENCY),
+        )
+    return _client
+
+def get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(OCR_MAX_CONCURRENCY)
+    return _semaphore
+
+# 앱 종료 시 커넥션 풀 정리 (main.py lifespan에서 호출)
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# ------ Clova OCR API 비동기 호출 ------
+async def request_clova_ocr(image_bytes: Union[bytes, BinaryIO], image_format: str) -> Dict:
+    """
+    Clova OCR API에 이미지를 전송하고 응답 JSON을 반환.
+    image_bytes에 파일 객체를 넘기면 메모리 복사 없이 파일에서 바로 스트리밍 전송.
+    5xx 응답 및 네트워크 오류는 지수 백오프로 재시도.
+    """
+    return await request_clova_ocr_multi([(image_bytes, image_format)])
+
+async def request_clova_ocr_multi(images: List[Tuple[Union[bytes, BinaryIO], str]]) -> Dict:
+    """
+    여러 이미지를 하나의 Clova OCR 요청으로 전송.
+    응답의 images 항목 이름은 'image_{순번}' (단일 이미지는 'temp_image').
+    """
+    api_url = os.getenv("CLOVA_OCR_URL")
+    secret_key = os.getenv("CLOVA_OCR_SECRET")
+    if not api_url or not secret_key:
+        raise HTTPException(status_code=500, detail="OCR API 환경 변수가 설정되지 않았습니다.")
+
+    # Clova OCR API 요청 구성
+    names = ['temp_image'] if len(images) == 1 else [f'image_{i}' for i in range(len(images))]
+    request_json = {'images': [{'format': fmt, 'name': name} for (_, fmt), name in zip(images, names)],'requestId': str(uuid.uuid4()),'version': 'V2','timestamp': int(round(time.time() * 1000))}
+    payload = {'message': json.dumps(request_json)}
+    files = [('file', image_bytes) for image_bytes, _ in images]
+    headers = {'X-OCR-SECRET': secret_key}
+
+    import httpx
+    client = get_client()
+    async with get_semaphore():
+        for attempt in range(OCR_MAX_RETRIES + 1):
+            try:
+                response = await client.post(api_url, headers=headers, data=payload, files=files)
+            except httpx.TimeoutException:
+                if attempt < OCR_MAX_RETRIES:
+                    await _backoff(attempt)
+                    continue
+                raise HTTPException(status_code=504, detail="OCR API 응답 시간 초과")
+            except httpx.HTTPError as e:
+                if attempt < OCR_MAX_RETRIES:
+                    await _backoff(attempt)
+                    continue
+                raise HTTPException(status_code=502, detail=f"OCR API 연결 실패: {e}")
+
+            # 5xx는 일시적 오류로 보고 재시도
+            if response.status_code >= 500 and attempt < OCR_MAX_RETRIES:
+                await _backoff(attempt)
+                continue
+            if response.status_code != 200:
+                raise HTTPException(status_code=response.status_code, detail=f"OCR API 오류: {response.text}")
+            return response.json()
+
+def split_clova_ocr_response(response_json: Dict, count: int) -> List[Optional[Dict]]:
+    """
+    다중 이미지 응답을 요청 순서대로 이미지별 단일 응답({'images': [...]})으로 분리.
+    parse_clova_ocr_response를 이미지마다 그대로 사용할 수 있도록 함. 누락된 이미지는 None.
+    """
+    images = response_json.get('images', [])
+    if count == 1:
+        return [response_json if images else None]
+    by_name = {image.get('name'): image for image in images}
+    return [
+        {**response_json, 'images': [by_name[f'image_{i}']]} if f'image_{i}' in by_name else None
+        for i in range(count)
+    ]
+
+async def _backoff(attempt: int):
+    # 지수 백오프 + 지터 (동시 재시도 몰림 방지)
+    delay = OCR_RETRY_BACKOFF * (2 ** attempt)
+    await asyncio.sleep(delay + random.uniform(0, delay / 2))
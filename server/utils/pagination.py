@@ -0,0 +1,19 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+from fastapi import HTTPException
+
+# ------ 키셋 페이지네이션 커서 (created_at, id) ------
+# 커서는 마지막으로 전달한 항목의 정렬 키를 인코딩한 불투명 문자열
+
+def encode_cursor(created_at: datetime, item_id) -> str:
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), item_id
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서 값입니다.")
@@ -0,0 +1,128 @@
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+# ------ 비밀번호 해싱 실행기 설정 ------
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(min(4, os.cpu_count() or 1))))  # bcrypt 전용 프로세스 수 (0이면 스레드풀 사용)
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))          # 실행 중 + 대기 중 작업 허용 수 (초과 시 503)
+LOGIN_RATE_LIMIT = int(os.getenv("LOGIN_RATE_LIMIT", "5"))           # (클라이언트 IP, 사용자)별 로그인 시도 허용 횟수
+LOGIN_RATE_WINDOW = float(os.getenv("LOGIN_RATE_WINDOW", "10"))      # 로그인 시도 집계 구간 (초)
+LOGIN_GLOBAL_FAILURE_LIMIT = int(os.getenv("LOGIN_GLOBAL_FAILURE_LIMIT", "500"))  # 워커 전체 로그인 실패 허용 횟수 (구간당, 0이면 제한 없음)
+LOGIN_RATE_MAX_KEYS = int(os.getenv("LOGIN_RATE_MAX_KEYS", "10000"))        # 시도 기록을 유지할 (IP, 사용자) 최대 개수
+
+# ------ 워커 프로세스에서 실행되는 함수 ------
+# CryptContext는 각 프로세스에서 처음 사용할 때 한 번만 생성
+_pwd_context = None
+
+def _context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+def _hash(password: str) -> str:
+    return _context().hash(password)
+
+def _verify(password: str, password_hash: str) -> bool:
+    return _context().verify(password, password_hash)
+
+
+# ------ 실행기 / 입장 제어 ------
+_executor: Optional[ProcessPoolExecutor] = None
+_inflight = 0
+_lock = threading.Lock()
+_login_attempts: "OrderedDict[Tuple[str, str], deque]" = OrderedDict()   # 마지막 시도가 오래된 순서
+_global_failures: deque = deque()     # 워커 전체 로그인 실패 시각 (성공한 로그인은 세지 않음)
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    if HASH_POOL_SIZE <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=HASH_POOL_SIZE)
+    return _executor
+
+# 앱 종료 시 워커 프로세스 정리 (main.py lifespan에서 호출)
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def _submit(func, *args):
+    # 대기열이 가득 차면 즉시 503 반환 (요청이 무한정 쌓이지 않도록)
+    global _inflight
+    with _lock:
+        if _inflight >= HASH_QUEUE_LIMIT:
+            raise HTTPException(status_code=503, detail="요청이 많아 잠시 후 다시 시도해주세요.", headers={"Retry-After": "1"})
+        _inflight += 1
+    try:
+        executor = _get_executor()
+        if executor is None:
+            return await run_in_threadpool(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    finally:
+        with _lock:
+            _inflight -= 1
+
+async def hash_password(password: str) -> str:
+    return await _submit(_hash, password)
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await _submit(_verify, password, password_hash)
+
+# (클라이언트 IP, 사용자)별 시도 횟수 + 워커 전체 실패 횟수 제한 (초과 시 429, bcrypt 연산 전에 차단)
+# 정상 사용자의 로그인 폭주는 전체 제한에 걸리지 않고, 해싱 대기열 한도(HASH_QUEUE_LIMIT)를 넘으면 503으로 처리
+def check_login_rate(client_ip: str, username: str):
+    now = time.monotonic()
+    cutoff = now - LOGIN_RATE_WINDOW
+    key = (client_ip, username)
+    with _lock:
+        # 집계 구간이 지난 항목은 가장 오래된 것부터 정리하고, 그래도 많으면 오래된 항목부터 제거 (TTL + LRU)
+        while _login_attempts:
+            oldest_key, oldest = next(iter(_login_attempts.items()))
+            if oldest[-1] >= cutoff and len(_login_attempts) < LOGIN_RATE_MAX_KEYS:
+                break
+            del _login_attempts[oldest_key]
+
+        while _global_failures and _global_failures[0] < cutoff:
+            _global_failures.popleft()
+        attempts = _login_attempts.get(key)
+        if attempts is not None:
+            while attempts and attempts[0] < cutoff:
+                attempts.popleft()
+        if (attempts and len(attempts) >= LOGIN_RATE_LIMIT) or \
+                (LOGIN_GLOBAL_FAILURE_LIMIT > 0 and len(_global_failures) >= LOGIN_GLOBAL_FAILURE_LIMIT):
+            raise HTTPException(status_code=429, detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.", headers={"Retry-After": str(int(LOGIN_RATE_WINDOW))})
+
+        if attempts is None:
+            attempts = _login_attempts[key] = deque()
+        else:
+            _login_attempts.move_to_end(key)
+        attempts.append(now)
+
+# 비밀번호 확인 실패 시 워커 전체 실패 횟수에 추가
+def record_login_failure():
+    if LOGIN_GLOBAL_FAILURE_LIMIT <= 0:
+        return
+    now = time.monotonic()
+    with _lock:
+        while _global_failures and _global_failures[0] < now - LOGIN_RATE_WINDOW:
+            _global_failures.popleft()
+        _global_failures.append(now)
+
+# 로그인 성공 시 해당 (IP, 사용자)의 시도 기록 초기화
+def reset_login_rate(client_ip: str, username: str):
+    with _lock:
+        _login_attempts.pop((client_ip, username), None)
+
+def hashing_stats() -> Dict:
+    with _lock:
+        return {"pool_size": HASH_POOL_SIZE, "inflight": _inflight, "queue_limit": HASH_QUEUE_LIMIT}
@@ -0,0 +1,78 @@
+import os
+import gzip
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+import pydantic_core
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from utils import metrics
+
+try:
+    import orjson           # 선택 의존성 (pip install orjson): 없으면 pydantic-core 직렬화기 사용
+except ImportError:
+    orjson = None
+try:
+    import brotli           # 선택 의존성 (pip install brotli): 없으면 gzip만 사용
+except ImportError:
+    brotli = None
+
+# ------ 응답 압축 설정 ------
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"   # 목록 응답 압축 사용 여부
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "4096"))  # 이보다 작은 응답은 압축하지 않음
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))                     # gzip 압축 수준 (1~9)
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))             # br 압축 수준 (0~11)
+
+
+def dumps(content: Any) -> bytes:
+    # dict/list 등 일반 값을 JSON 바이트로 (orjson 또는 pydantic-core, 둘 다 표준 json 모듈보다 빠름)
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return pydantic_core.to_json(content, inf_nan_mode="null")
+
+class FastJSONResponse(JSONResponse):
+    """
+    앱 기본 응답 클래스. 직렬화 시간은 /metrics의 json_render 단계로 기록.
+    """
+    def render(self, content: Any) -> bytes:
+        with metrics.timed("json_render"):
+            return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+def _accepted_encoding(request: Request) -> Optional[str]:
+    # Accept-Encoding에서 br(설치된 경우) > gzip 순으로 선택 (q=0은 제외)
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name.lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def model_response(request: Request, model: Type[BaseModel], content: Dict, status_code: int = 200) -> Response:
+    """
+    응답 모델로 검증한 뒤 pydantic-core로 JSON 바이트를 바로 생성 (jsonable_encoder 변환 생략),
+    클라이언트가 지원하고 RESPONSE_COMPRESS_MIN_BYTES 이상이면 gzip/br 압축.
+    동기 핸들러(스레드풀)에서 호출하므로 직렬화/압축이 이벤트 루프를 막지 않음.
+    설정하지 않은 필드(예: fields=로 선택하지 않은 필드)는 응답에 포함하지 않음.
+    """
+    adapter = _adapter(model)
+    with metrics.timed("json_render"):
+        body = adapter.dump_json(adapter.validate_python(content), exclude_unset=True)
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = _accepted_encoding(request) if RESPONSE_COMPRESSION and len(body) >= RESPONSE_COMPRESS_MIN_BYTES else None
+    if encoding:
+        with metrics.timed("compress"):
+            if encoding == "br":
+                body = brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+            else:
+                body = gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+        headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
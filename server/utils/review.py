@@ -0,0 +1,131 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+import models
+
+# ------ 간격 반복(SM-2) 복습 설정 ------
+REVIEW_MAX_INTERVAL_DAYS = float(os.getenv("REVIEW_MAX_INTERVAL_DAYS", "365"))   # 복습 간격 상한 (일)
+REVIEW_QUALITY_CORRECT = 4      # 채점 결과 -> SM-2 응답 품질 (0~5, 3 이상이 정답)
+REVIEW_QUALITY_WRONG = 1
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+# 기존 일정 일괄 갱신 (Core 테이블 executemany)
+_schedules = models.ReviewSchedule.__table__
+_update_stmt = _schedules.update()\
+    .where(_schedules.c.problem_id == bindparam("b_problem_id"))\
+    .values(
+        repetitions=bindparam("b_repetitions"),
+        interval_days=bindparam("b_interval_days"),
+        ease=bindparam("b_ease"),
+        lapses=bindparam("b_lapses"),
+        due_at=bindparam("b_due_at"),
+        reviewed_at=bindparam("b_reviewed_at"),
+    )
+
+
+def next_schedule(repetitions: int, interval_days: float, ease: float, lapses: int, quality: int) -> Tuple[int, float, float, int]:
+    """
+    SM-2: 응답 품질(0~5)로 다음 (연속 정답 횟수, 간격, 난이도 계수, 틀린 횟수) 계산.
+    정답이면 1일 -> 6일 -> 이전 간격 x ease, 오답이면 1일부터 다시 시작.
+    """
+    if quality >= 3:
+        if repetitions == 0:
+            interval_days = 1.0
+        elif repetitions == 1:
+            interval_days = 6.0
+        else:
+            interval_days = min(REVIEW_MAX_INTERVAL_DAYS, round(interval_days * ease, 2))
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval_days = 1.0
+        lapses += 1
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, interval_days, round(ease, 4), lapses
+
+def apply_results(db: Session, user_id: int, results: Iterable[Tuple[str, int, bool]], now: Optional[datetime] = None) -> int:
+    """
+    채점 결과 (problem_id, folder_id, is_correct) 목록으로 복습 일정을 일괄 갱신.
+    기존 일정은 한 번에 조회하고, 신규는 일괄 insert / 기존은 executemany UPDATE. 커밋은 호출한 쪽에서.
+    """
+    results = list(results)
+    if not results:
+        return 0
+    now = now or models.utc_now()
+    S = models.ReviewSchedule
+    current = {row[0]: row[1:] for row in db.execute(
+        select(S.problem_id, S.repetitions, S.interval_days, S.ease, S.lapses)
+        .where(S.problem_id.in_([problem_id for problem_id, _, _ in results]))
+    )}
+
+    inserts, updates = [], []
+    for problem_id, folder_id, is_correct in results:
+        quality = REVIEW_QUALITY_CORRECT if is_correct else REVIEW_QUALITY_WRONG
+        repetitions, interval_days, ease, lapses = next_schedule(*current.get(problem_id, (0, 0.0, INITIAL_EASE, 0)), quality)
+        row = {"repetitions": repetitions, "interval_days": interval_days, "ease": ease, "lapses": lapses,
+               "due_at": now + timedelta(days=interval_days), "reviewed_at": now}
+        if problem_id in current:
+            updates.append({f"b_{key}": value for key, value in row.items()} | {"b_problem_id": problem_id})
+        else:
+            inserts.append({"problem_id": problem_id, "user_id": user_id, "folder_id": folder_id, **row})
+    if inserts:
+        db.execute(_insert_stmt(db), inserts)
+    if updates:
+        db.execute(_update_stmt, updates)
+    return len(results)
+
+def _insert_stmt(db: Session):
+    """
+    신규 일정 insert 문. 다른 요청이 같은 문제를 먼저 처음 채점해 일정이 생긴 경우
+    PostgreSQL/SQLite는 ON CONFLICT로 이번 결과를 덮어씀 (중복 키 오류 방지).
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return _schedules.insert()
+    stmt = dialect_insert(_schedules)
+    columns = ["repetitions", "interval_days", "ease", "lapses", "due_at", "reviewed_at"]
+    return stmt.on_conflict_do_update(index_elements=["problem_id"], set_={c: stmt.excluded[c] for c in columns})
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite는 시간대 없이 저장하므로 UTC로 간주
+    return value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+
+def due_problems(db: Session, user_id: int, limit: int, folder_id: Optional[int] = None, now: Optional[datetime] = None) -> Dict:
+    """
+    복습 시각이 지난 문제를 오래된 순으로 최대 limit개, 그리고 다음 복습 예정 시각.
+    folder_id 지정 시 (folder_id, due_at), 아니면 (user_id, due_at) 인덱스 범위만 읽음.
+    """
+    now = now or models.utc_now()
+    S = models.ReviewSchedule
+    owner = (S.folder_id == folder_id) if folder_id is not None else (S.user_id == user_id)
+    rows = db.execute(
+        select(S.problem_id, S.folder_id, S.due_at, S.interval_days, S.lapses,
+               models.Problem.problem_text, models.Problem.choices)
+        .join(models.Problem, models.Problem.id == S.problem_id)
+        .where(owner, S.due_at <= now)
+        .order_by(S.due_at)
+        .limit(limit)
+    ).all()
+    next_due_at = db.execute(select(S.due_at).where(owner, S.due_at > now).order_by(S.due_at).limit(1)).scalar()
+
+    # 정답은 채점 시 서버에서 확인하므로 응답에 포함하지 않음 (/exams/submissions로 제출)
+    return {
+        "problems": {
+            problem_id: {
+                "problem": problem_text,
+                "choices": choices,
+                "folder_id": problem_folder_id,
+                "due_at": _aware(due_at).isoformat(),
+                "interval_days": interval_days,
+                "lapses": lapses,
+            } for problem_id, problem_folder_id, due_at, interval_days, lapses, problem_text, choices in rows
+        },
+        "next_due_at": _aware(next_due_at).isoformat() if next_due_at else None,
+    }
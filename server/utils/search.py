@@ -0,0 +1,114 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+import models
+from utils.text_index import InvertedIndex, build_search_text, jaccard, ngrams, normalize
+
+# ------ 문제 검색 설정 ------
+SEARCH_MIN_SCORE = float(os.getenv("SEARCH_MIN_SCORE", "0.3"))                  # 유사도 검색 최소 점수
+SEARCH_DUPLICATE_THRESHOLD = float(os.getenv("SEARCH_DUPLICATE_THRESHOLD", "0.85"))  # 중복 문제 판정 유사도
+SEARCH_INDEX_MAX_USERS = int(os.getenv("SEARCH_INDEX_MAX_USERS", "256"))         # 메모리 역색인을 유지할 최대 사용자 수
+
+# PostgreSQL은 pg_trgm 인덱스(ix_problems_search_trgm)를 사용하고,
+# 그 외(SQLite 등)는 사용자별 메모리 역색인으로 검색
+
+def _use_trigram(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+# ------ 사용자별 메모리 역색인 캐시 ------
+_indexes: "OrderedDict[int, InvertedIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+def _user_index(db: Session, user_id: int) -> InvertedIndex:
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is not None:
+            _indexes.move_to_end(user_id)
+            return index
+
+    # 처음 검색 시 사용자의 문제로 색인 생성 (필요한 컬럼만 스트리밍 조회)
+    index = InvertedIndex()
+    rows = db.query(models.Problem.id, models.Problem.problem_text, models.Problem.choices, models.Problem.memo)\
+        .join(models.Folder, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user_id)\
+        .yield_per(1000)
+    for problem_id, problem_text, choices, memo in rows:
+        index.add(problem_id, build_search_text(problem_text, choices, memo))
+
+    with _indexes_lock:
+        _indexes[user_id] = index
+        while len(_indexes) > SEARCH_INDEX_MAX_USERS:
+            _indexes.popitem(last=False)
+    return index
+
+# 문제 1개 저장/수정/삭제는 캐시된 역색인을 제자리에서 갱신 (캐시에 없으면 다음 검색 시 생성)
+def index_problem(user_id: int, problem_id: str, search_text: str):
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is not None:
+            index.add(problem_id, search_text)
+
+def unindex_problem(user_id: int, problem_id: str):
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is not None:
+            index.remove(problem_id)
+
+# 가져오기/폴더 삭제처럼 문제가 한꺼번에 바뀌면 메모리 역색인 폐기 (다음 검색 시 재생성)
+def invalidate_user_index(user_id: int):
+    with _indexes_lock:
+        _indexes.pop(user_id, None)
+
+
+# ------ 검색 / 중복 탐지 ------
+def search_problems(db: Session, user_id: int, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+    """
+    사용자의 문제 중 query와 일치/유사한 문제의 (problem_id, score) 목록을 점수순으로 반환.
+    """
+    q = normalize(query)
+    if not q:
+        return []
+    if not _use_trigram(db):
+        index = _user_index(db, user_id)
+        with _indexes_lock:     # 다른 요청의 제자리 갱신과 동시에 순회하지 않도록
+            return index.search(q, limit=limit, min_score=SEARCH_MIN_SCORE)
+
+    doc = models.Problem.search_text
+    score = func.similarity(doc, q)
+    rows = db.query(models.Problem.id, score)\
+        .join(models.Folder, models.Problem.folder_id == models.Folder.id)\
+        .filter(models.Folder.user_id == user_id)\
+        .filter(doc.contains(q, autoescape=True) | doc.op("%")(q))\
+        .order_by(score.desc())\
+        .limit(limit).all()
+    return [(problem_id, float(s)) for problem_id, s in rows]
+
+def find_duplicate_problems(db: Session, folder_id: int, problem_text: str, choices, threshold: float = SEARCH_DUPLICATE_THRESHOLD) -> List[Tuple[str, float]]:
+    """
+    저장하려는 폴더에 이미 있는 거의 같은 문제의 (problem_id, similarity) 목록 반환.
+    워커별 메모리 역색인 대신 항상 DB의 search_text를 기준으로 비교 (다른 워커의 저장도 바로 반영).
+    """
+    text = build_search_text(problem_text, choices, None)
+    if not text:
+        return []
+    doc = models.Problem.search_text
+    if not _use_trigram(db):
+        grams = ngrams(text)
+        results = []
+        for problem_id, search_text in db.query(models.Problem.id, doc).filter(models.Problem.folder_id == folder_id):
+            score = jaccard(grams, ngrams(search_text or ""))
+            if score >= threshold:
+                results.append((problem_id, score))
+        results.sort(key=lambda item: -item[1])
+        return results[:5]
+
+    score = func.similarity(doc, text)
+    rows = db.query(models.Problem.id, score)\
+        .filter(models.Problem.folder_id == folder_id, doc.op("%")(text), score >= threshold)\
+        .order_by(score.desc())\
+        .limit(5).all()
+    return [(problem_id, float(s)) for problem_id, s in rows]
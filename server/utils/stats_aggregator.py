@@ -0,0 +1,96 @@
+import os
+import logging
+import threading
+from typing import Callable, Dict, List
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+import models
+
+logger = logging.getLogger(__name__)
+
+# ------ 통계 쓰기 지연(write-behind) 설정 ------
+STATS_WRITE_BEHIND = os.getenv("STATS_WRITE_BEHIND", "false").lower() == "true"   # 사용 여부
+STATS_FLUSH_INTERVAL = float(os.getenv("STATS_FLUSH_INTERVAL", "1.0"))            # DB 반영 주기 (초)
+
+# 사용자 이름 기준 executemany UPDATE (Core 테이블 사용)
+_users = models.User.__table__
+_increment_stmt = _users.update()\
+    .where(_users.c.username == bindparam("b_username"))\
+    .values(
+        total_solved=_users.c.total_solved + bindparam("b_solved"),
+        total_correct=_users.c.total_correct + bindparam("b_correct"),
+    )
+
+
+class StatsAggregator:
+    """
+    사용자별 통계 증가분을 메모리에서 합산해 두었다가 주기적으로 한 번의 트랜잭션으로 반영.
+    같은 사용자의 잦은 요청이 하나의 UPDATE로 합쳐짐. 반영 실패 시 증가분은 다시 합산되어 유실되지 않음.
+    """
+    def __init__(self, session_factory: Callable[[], Session], interval: float = STATS_FLUSH_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._pending: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.flushed_updates = 0   # 누적 반영 횟수 (합쳐진 UPDATE 행 수)
+
+    def add(self, username: str, solved_count: int, correct_count: int):
+        with self._lock:
+            entry = self._pending.setdefault(username, [0, 0])
+            entry[0] += solved_count
+            entry[1] += correct_count
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        # 대기 중인 증가분을 꺼내서 반영 (동시에 여러 flush가 돌지 않도록 직렬화)
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            db = self.session_factory()
+            try:
+                db.execute(_increment_stmt, [
+                    {"b_username": username, "b_solved": solved, "b_correct": correct}
+                    for username, (solved, correct) in batch.items()
+                ])
+                db.commit()
+            except Exception:
+                db.rollback()
+                # 실패한 증가분을 다시 대기열에 합산
+                for username, (solved, correct) in batch.items():
+                    self.add(username, solved, correct)
+                raise
+            finally:
+                db.close()
+            self.flushed_updates += len(batch)
+            return len(batch)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stats-aggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # 백그라운드 스레드 종료 후 남은 증가분 반영
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("통계 반영 실패 (다음 주기에 재시도)")
@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# ------ 임시 OCR 결과 저장소 설정 ------
+TEMP_STORE_BACKEND = os.getenv("TEMP_STORE_BACKEND", "memory")           # memory | sqlite
+TEMP_STORE_TTL = float(os.getenv("TEMP_STORE_TTL", "1800"))              # 항목 유효 시간 (초)
+TEMP_STORE_MAX_ITEMS = int(os.getenv("TEMP_STORE_MAX_ITEMS", "10000"))   # 최대 항목 수
+TEMP_STORE_MAX_BYTES = int(os.getenv("TEMP_STORE_MAX_BYTES", str(64 * 1024 * 1024)))  # 최대 총 크기 (바이트)
+TEMP_STORE_SQLITE_PATH = os.getenv("TEMP_STORE_SQLITE_PATH", "temp_ocr_results.db")  # sqlite 백엔드 파일 경로
+
+
+class TempStore(ABC):
+    """
+    OCR 결과를 '저장' 요청 전까지 보관하는 저장소 인터페이스.
+    pop은 조회와 삭제를 한 번에 수행하여 같은 temp_id가 두 번 저장되지 않도록 함.
+    """
+    @abstractmethod
+    def set(self, key: str, value: Dict):
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def pop(self, key: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        # 조회 통계에 집계하지 않고 항목만 제거 (캐시 무효화용)
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        ...
+
+
+# ------ 프로세스 내 LRU + TTL 저장소 ------
+class MemoryTempStore(TempStore):
+    def __init__(self, ttl: float = TEMP_STORE_TTL, max_items: int = TEMP_STORE_MAX_ITEMS, max_bytes: int = TEMP_STORE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()   # key -> (expires_at, size, value), 오래된 순서
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evicted_items": 0, "evicted_bytes": 0}
+
+    def set(self, key: str, value: Dict):
+        size = _sizeof(value)
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            self._evict()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[2]
+
+    def pop(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return None
+            self._remove(key)
+            return entry[2]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"backend": "memory", "items": len(self._data), "bytes": self._bytes, **self._counters}
+
+    def _lookup(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        if entry[0] < time.monotonic():
+            self._remove(key)
+            self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _evict(self):
+        # 앞쪽(오래된 쪽)의 만료 항목을 먼저 정리한 뒤, 용량 초과 시 가장 오래 사용되지 않은 항목부터 제거
+        # (중간에 남은 만료 항목은 조회 시점에 정리됨)
+        now = time.monotonic()
+        while self._data:
+            key, entry = next(iter(self._data.items()))
+            if entry[0] >= now:
+                break
+            self._remove(key)
+            self._counters["expired"] += 1
+        while self._data and (len(self._data) > self.max_items or self._bytes > self.max_bytes):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self._bytes -= size
+            self._counters["evicted_items"] += 1
+            self._counters["evicted_bytes"] += size
+
+
+# ------ SQLite 기반 저장소 (여러 uvicorn 워커 간 공유) ------
+class SqliteTempStore(TempStore):
+    def __init__(self, path: str = TEMP_STORE_SQLITE_PATH, ttl: float = TEMP_STORE_TTL, max_items: int = TEMP_STORE_MAX_ITEMS, max_bytes: int = TEMP_STORE_MAX_BYTES, table: str = "temp_ocr_results"):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._local = threading.local()   # 스레드별 커넥션 (sqlite 커넥션은 스레드 간 공유 불가)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evicted_items": 0, "evicted_bytes": 0}
+        self._create_schema(self._conn())
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        # 항목 수/총 크기는 트리거로 {table}_totals 한 행에 누적 (set마다 COUNT/SUM 전체 스캔 없이, 워커 간에도 정확)
+        t = self.table
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {t} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({t})")}
+            if "accessed_at" not in columns:
+                # 이전 버전 파일: 마지막 조회 시각을 생성 시각으로 채움
+                conn.execute(f"ALTER TABLE {t} ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                conn.execute(f"UPDATE {t} SET accessed_at = created_at")
+            conn.execute(f"DROP INDEX IF EXISTS ix_{t}_created_at")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{t}_accessed_at ON {t} (accessed_at)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{t}_expires_at ON {t} (expires_at)")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {t}_totals (id INTEGER PRIMARY KEY CHECK (id = 1), items INTEGER NOT NULL, bytes INTEGER NOT NULL)")
+            conn.execute(f"INSERT OR IGNORE INTO {t}_totals SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM {t}")
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {t}_totals_insert AFTER INSERT ON {t} BEGIN "
+                         f"UPDATE {t}_totals SET items = items + 1, bytes = bytes + NEW.size WHERE id = 1; END")
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {t}_totals_delete AFTER DELETE ON {t} BEGIN "
+                         f"UPDATE {t}_totals SET items = items - 1, bytes = bytes - OLD.size WHERE id = 1; END")
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {t}_totals_update AFTER UPDATE OF size ON {t} BEGIN "
+                         f"UPDATE {t}_totals SET bytes = bytes + NEW.size - OLD.size WHERE id = 1; END")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def set(self, key: str, value: Dict):
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # INSERT OR REPLACE는 삭제 트리거를 거치지 않으므로 upsert로 갱신
+            conn.execute(
+                f"INSERT INTO {self.table} (key, value, size, expires_at, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires_at = excluded.expires_at, created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+                (key, data, size, now + self.ttl, now, now),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[Dict]:
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[1] >= now:
+            # 조회 시각 갱신 -> 용량 초과 시 가장 오래 조회되지 않은 항목부터 제거 (LRU)
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._decode(row)
+
+    def pop(self, key: str) -> Optional[Dict]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self._decode(row)
+
+    def delete(self, key: str):
+        self._conn().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def stats(self) -> Dict:
+        items, total = self._conn().execute(f"SELECT items, bytes FROM {self.table}_totals WHERE id = 1").fetchone()
+        with self._lock:
+            # 카운터는 프로세스(워커)별 값
+            return {"backend": "sqlite", "items": items, "bytes": total, **self._counters}
+
+    def _decode(self, row) -> Optional[Dict]:
+        with self._lock:
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            if row[1] < time.time():
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+        return json.loads(row[0])
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (now,)).rowcount
+        items, total = conn.execute(f"SELECT items, bytes FROM {self.table}_totals WHERE id = 1").fetchone()
+        evicted_items = evicted_bytes = 0
+        # 가장 오래 조회되지 않은 항목부터 용량 한도 안으로 들어올 때까지 제거
+        while items > self.max_items or total > self.max_bytes:
+            oldest = conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at LIMIT 64").fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if items <= self.max_items and total <= self.max_bytes:
+                    break
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                items -= 1
+                total -= size
+                evicted_items += 1
+                evicted_bytes += size
+        with self._lock:
+            self._counters["expired"] += max(expired, 0)
+            self._counters["evicted_items"] += evicted_items
+            self._counters["evicted_bytes"] += evicted_bytes
+
+
+def _sizeof(value: Dict) -> int:
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+# 설정(TEMP_STORE_BACKEND)에 따라 저장소 구현 선택
+def create_temp_store() -> TempStore:
+    if TEMP_STORE_BACKEND == "sqlite":
+        return SqliteTempStore()
+    return MemoryTempStore()
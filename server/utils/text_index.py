@@ -0,0 +1,71 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# ------ 검색용 텍스트 정규화 / n-gram ------
+# 한국어는 형태소 분석 없이도 부분 일치가 잘 되도록 글자 bigram을 사용 (pg_trgm과 비슷한 방식)
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(_TOKEN_PATTERN.findall((text or "").lower()))
+
+# 문제 지문, 선지, 메모를 하나의 검색 문서로 합침 (Problem.search_text 컬럼 값)
+def build_search_text(problem_text: Optional[str], choices: Optional[Iterable[str]], memo: Optional[str]) -> str:
+    parts = [problem_text or ""] + list(choices or []) + [memo or ""]
+    return normalize(" ".join(parts))
+
+def ngrams(text: str, n: int = 2) -> Set[str]:
+    grams = set()
+    for token in normalize(text).split():
+        if len(token) < n:
+            grams.add(token)
+        else:
+            grams.update(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ------ 프로세스 내 역색인 (PostgreSQL이 아닌 환경의 검색 대체 구현) ------
+class InvertedIndex:
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = defaultdict(set)   # n-gram -> 문서 ID 집합
+        self.docs: Dict[str, Set[str]] = {}                      # 문서 ID -> n-gram 집합
+
+    def add(self, doc_id: str, text: str):
+        self.remove(doc_id)
+        grams = ngrams(text)
+        self.docs[doc_id] = grams
+        for gram in grams:
+            self.postings[gram].add(doc_id)
+
+    def remove(self, doc_id: str):
+        for gram in self.docs.pop(doc_id, ()):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def _candidates(self, grams: Set[str]) -> Dict[str, int]:
+        # 질의 n-gram을 하나 이상 포함하는 문서별 일치 개수
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for doc_id in self.postings.get(gram, ()):
+                counts[doc_id] += 1
+        return counts
+
+    def search(self, query: str, limit: int = 20, min_score: float = 0.5) -> List[Tuple[str, float]]:
+        """
+        질의 n-gram이 문서에 포함된 비율(score)이 min_score 이상인 문서를 점수순으로 반환.
+        """
+        grams = ngrams(query)
+        if not grams:
+            return []
+        scored = [(doc_id, count / len(grams)) for doc_id, count in self._candidates(grams).items()]
+        scored = [item for item in scored if item[1] >= min_score]
+        scored.sort(key=lambda item: (-item[1], -jaccard(grams, self.docs[item[0]])))
+        return scored[:limit]
@@ -0,0 +1,271 @@
+import os
+import gzip
+import json
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+import models, schemas
+from utils.text_index import build_search_text
+from utils.analytics import record_scores
+
+# ------ 백업(내보내기/가져오기) 설정 ------
+TRANSFER_BATCH_SIZE = int(os.getenv("TRANSFER_BATCH_SIZE", "1000"))        # 한 번에 읽고/쓰는 행 수 (yield_per, executemany 단위)
+TRANSFER_CHUNK_BYTES = int(os.getenv("TRANSFER_CHUNK_BYTES", "65536"))     # 응답 스트림 청크 크기
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "20"))              # 가져오기 결과에 포함할 거부 레코드 사유 최대 개수
+
+EXPORT_FORMAT = "snapsolve-export"
+EXPORT_VERSION = 1
+
+# 파일 형식: 한 줄에 JSON 객체 하나 (NDJSON), 첫 줄은 meta, 이후 folder -> problem -> history 순서
+#   {"type": "meta", "format": "snapsolve-export", "version": 1, ...}
+#   {"type": "folder", "id": 3, "name": "...", "color": "..."}
+#   {"type": "problem", "id": "uuid", "folder_id": 3, "problem_text": "...", ...}
+#   {"type": "history", "score": 80, "solved_date": "2024-05-01T12:00:00+00:00"}
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # 시간대 없는 값은 UTC로 간주
+    if value is None:
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _same_instant(value: Optional[datetime]) -> Optional[datetime]:
+    # DB마다 시간대 포함 여부가 달라 비교용으로 UTC 기준 naive 값으로 통일
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+# ------ 내보내기 (서버 측 커서로 스트리밍) ------
+def export_records(db: Session, user_id: int, username: str) -> Iterator[Dict]:
+    yield {"type": "meta", "format": EXPORT_FORMAT, "version": EXPORT_VERSION, "username": username,
+           "exported_at": models.utc_now().isoformat()}
+
+    folders = db.execute(select(models.Folder.id, models.Folder.name, models.Folder.color)
+                         .where(models.Folder.user_id == user_id).order_by(models.Folder.id))
+    for folder_id, name, color in folders:
+        yield {"type": "folder", "id": folder_id, "name": name, "color": color}
+
+    # ORM 객체 대신 필요한 컬럼만 TRANSFER_BATCH_SIZE 단위로 가져와 메모리 사용량 일정하게 유지
+    P = models.Problem
+    problems = db.execute(
+        select(P.id, P.folder_id, P.problem_text, P.choices, P.correct_answer, P.is_wrong_note, P.memo, P.created_at)
+        .join(models.Folder, P.folder_id == models.Folder.id)
+        .where(models.Folder.user_id == user_id)
+        .order_by(P.folder_id, P.created_at, P.id)
+        .execution_options(yield_per=TRANSFER_BATCH_SIZE)
+    )
+    for problem_id, folder_id, problem_text, choices, correct_answer, is_wrong_note, memo, created_at in problems:
+        yield {"type": "problem", "id": problem_id, "folder_id": folder_id, "problem_text": problem_text,
+               "choices": choices or [], "correct_answer": correct_answer, "is_wrong_note": bool(is_wrong_note),
+               "memo": memo, "created_at": _iso(created_at)}
+
+    histories = db.execute(
+        select(models.ExamHistory.score, models.ExamHistory.solved_date)
+        .where(models.ExamHistory.user_id == user_id)
+        .order_by(models.ExamHistory.solved_date, models.ExamHistory.id)
+        .execution_options(yield_per=TRANSFER_BATCH_SIZE)
+    )
+    for score, solved_date in histories:
+        yield {"type": "history", "score": score, "solved_date": _iso(solved_date)}
+
+def encode_ndjson(records: Iterable[Dict], compress: bool = False) -> Iterator[bytes]:
+    """
+    레코드를 NDJSON 바이트 청크(TRANSFER_CHUNK_BYTES 단위)로 변환. compress=True면 gzip 스트림.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer: List[bytes] = []
+    size = 0
+    for record in records:
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        buffer.append(line)
+        size += len(line)
+        if size >= TRANSFER_CHUNK_BYTES:
+            chunk = b"".join(buffer)
+            buffer, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    chunk = b"".join(buffer)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+# ------ 가져오기 (일괄 insert, Problem.id 기준 멱등) ------
+def _insert_ignoring_existing(db: Session, table, rows: List[Dict]):
+    # 동시에 같은 파일을 가져오는 경우에도 충돌 없이 건너뛰도록 ON CONFLICT DO NOTHING 사용 (지원 DB만)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        db.execute(insert(table), rows)
+        return
+    db.execute(dialect_insert(table).on_conflict_do_nothing(index_elements=["id"]), rows)
+
+def read_lines(fileobj: BinaryIO) -> Iterator[bytes]:
+    # gzip 여부는 매직 바이트로 판별, 한 줄씩 읽어 파일 전체를 메모리에 올리지 않음
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    stream = gzip.GzipFile(fileobj=fileobj, mode="rb") if head == b"\x1f\x8b" else fileobj
+    try:
+        for line in stream:
+            if line.strip():
+                yield line
+    except (OSError, EOFError) as e:
+        raise HTTPException(status_code=400, detail=f"백업 파일을 읽을 수 없습니다: {e}")
+
+# 다른 계정에 이미 있는 Problem.id는 사용자별로 고정된 새 ID로 바꿔 저장 (같은 파일을 다시 가져와도 같은 ID)
+_REMAP_NAMESPACE = uuid.UUID("6f1c1f0e-8a43-4d53-9a8e-3b0f6a1d2c57")
+
+def _remapped_id(user_id: int, problem_id: str) -> str:
+    return str(uuid.uuid5(_REMAP_NAMESPACE, f"{user_id}/{problem_id}"))
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+
+RECORD_MODELS = {"folder": schemas.ImportFolderRecord, "problem": schemas.ImportProblemRecord,
+                 "history": schemas.ImportHistoryRecord}
+
+def import_records(db: Session, user_id: int, lines: Iterable[bytes]) -> Dict:
+    """
+    내보내기 파일을 사용자 계정으로 가져오고 처리 결과 개수를 반환.
+    - 폴더: 같은 이름의 폴더가 있으면 재사용, 없으면 생성
+    - 문제: 이 계정에 이미 있는 Problem.id는 건너뜀 (같은 파일을 여러 번 가져와도 중복 생성 없음),
+            다른 계정에 있는 ID는 새 ID로 바꿔 저장 (problems_remapped)
+    - 기록: 같은 (점수, 날짜) 기록이 있으면 건너뜀
+    - 필드가 빠졌거나 형식이 맞지 않는 레코드는 저장하지 않고 records_rejected/errors로 보고
+    TRANSFER_BATCH_SIZE 단위로 커밋하므로 중간에 실패해도 다시 가져오면 이어서 반영됨.
+    """
+    result = {"folders_created": 0, "folders_reused": 0, "problems_inserted": 0, "problems_skipped": 0,
+              "problems_remapped": 0, "histories_inserted": 0, "histories_skipped": 0,
+              "records_rejected": 0, "errors": []}
+    existing_folders = {name: folder_id for folder_id, name in
+                        db.execute(select(models.Folder.id, models.Folder.name).where(models.Folder.user_id == user_id))}
+    folder_map: Dict[int, int] = {}
+    problems: List[Dict] = []
+    histories: List[Dict] = []
+    history_keys = None
+
+    def reject(number: int, message: str):
+        result["records_rejected"] += 1
+        if len(result["errors"]) < IMPORT_MAX_ERRORS:
+            result["errors"].append({"line": number, "error": message})
+
+    def existing_owners(ids: List[str]) -> Dict[str, Optional[int]]:
+        # Problem.id -> 소유 사용자 ID (폴더가 없으면 None)
+        return dict(db.execute(
+            select(models.Problem.id, models.Folder.user_id)
+            .outerjoin(models.Folder, models.Problem.folder_id == models.Folder.id)
+            .where(models.Problem.id.in_(ids))
+        ).all())
+
+    def flush_problems():
+        owners = existing_owners([row["id"] for row in problems])
+        conflicting = [row for row in problems if row["id"] in owners and owners[row["id"]] != user_id]
+        for row in conflicting:
+            row["id"] = _remapped_id(user_id, row["id"])
+        if conflicting:
+            owners.update(existing_owners([row["id"] for row in conflicting]))
+        rows = [row for row in problems if row["id"] not in owners]
+        if rows:
+            _insert_ignoring_existing(db, models.Problem.__table__, rows)
+        db.commit()
+        result["problems_inserted"] += len(rows)
+        result["problems_skipped"] += len(problems) - len(rows)
+        result["problems_remapped"] += sum(1 for row in conflicting if row["id"] not in owners)
+        problems.clear()
+
+    def flush_histories():
+        nonlocal history_keys
+        if history_keys is None:
+            history_keys = {(score, _same_instant(date)) for score, date in db.execute(
+                select(models.ExamHistory.score, models.ExamHistory.solved_date).where(models.ExamHistory.user_id == user_id))}
+        rows = []
+        for row in histories:
+            key = (row["score"], _same_instant(row["solved_date"]))
+            if key in history_keys:
+                result["histories_skipped"] += 1
+                continue
+            history_keys.add(key)
+            rows.append(row)
+        if rows:
+            db.execute(insert(models.ExamHistory.__table__), rows)
+            record_scores(db, user_id, [(row["score"], row["solved_date"]) for row in rows])
+        db.commit()
+        result["histories_inserted"] += len(rows)
+        histories.clear()
+
+    for number, line in enumerate(lines, start=1):
+        try:
+            record = json.loads(line)
+            kind = record["type"]
+        except (ValueError, KeyError, TypeError) as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"{number}번째 줄을 처리할 수 없습니다: {e!r}")
+        if number == 1 and kind != "meta":
+            raise HTTPException(status_code=400, detail="백업 파일의 첫 줄에 meta 정보가 없습니다.")
+        if kind == "meta":
+            if record.get("format") != EXPORT_FORMAT or record.get("version") != EXPORT_VERSION:
+                raise HTTPException(status_code=400, detail="지원하지 않는 백업 파일 형식입니다.")
+            continue
+        if kind not in RECORD_MODELS:
+            reject(number, f"알 수 없는 레코드 종류: {kind!r}")
+            continue
+        try:
+            item = RECORD_MODELS[kind].model_validate(record)
+        except ValidationError as e:
+            reject(number, _validation_message(e))
+            continue
+
+        if kind == "folder":
+            if item.name in existing_folders:
+                result["folders_reused"] += 1
+            else:
+                folder = models.Folder(name=item.name, color=item.color or "0xFF1E2B58", user_id=user_id)
+                db.add(folder)
+                db.flush()
+                existing_folders[item.name] = folder.id
+                result["folders_created"] += 1
+            folder_map[item.id] = existing_folders[item.name]
+        elif kind == "problem":
+            if item.folder_id not in folder_map:
+                reject(number, f"folder_id: 파일에 없는 폴더 {item.folder_id}")
+                continue
+            choices = item.choices or []
+            # Core insert는 ORM 이벤트를 거치지 않으므로 search_text도 직접 채움
+            problems.append({
+                "id": item.id,
+                "folder_id": folder_map[item.folder_id],
+                "problem_text": item.problem_text,
+                "choices": choices,
+                "correct_answer": item.correct_answer,
+                "is_wrong_note": item.is_wrong_note,
+                "memo": item.memo,
+                "created_at": _aware(item.created_at) or models.utc_now(),
+                "search_text": build_search_text(item.problem_text, choices, item.memo),
+            })
+            if len(problems) >= TRANSFER_BATCH_SIZE:
+                flush_problems()
+        else:
+            histories.append({"user_id": user_id, "score": item.score,
+                              "solved_date": _aware(item.solved_date) or models.utc_now()})
+            if len(histories) >= TRANSFER_BATCH_SIZE:
+                flush_histories()
+
+    if problems:
+        flush_problems()
+    if histories:
+        flush_histories()
+    db.commit()
+    return result
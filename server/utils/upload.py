@@ -0,0 +1,60 @@
+import os
+from typing import Dict
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+# ------ 업로드 크기 제한 설정 ------
+OCR_MAX_UPLOAD_BYTES = int(os.getenv("OCR_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))            # 이미지 1장 최대 크기
+OCR_MAX_BATCH_UPLOAD_BYTES = int(os.getenv("OCR_MAX_BATCH_UPLOAD_BYTES", str(100 * 1024 * 1024)))  # 배치 요청 전체 최대 크기
+IMPORT_MAX_UPLOAD_BYTES = int(os.getenv("IMPORT_MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))      # 백업 가져오기 파일 최대 크기
+
+TOO_LARGE_DETAIL = "업로드 용량 제한을 초과했습니다."
+INVALID_IMAGE_DETAIL = "이미지를 읽을 수 없습니다. 손상되었거나 지원하지 않는 형식입니다."
+
+class BodySizeLimitMiddleware:
+    """
+    경로별 요청 본문 크기 제한 (ASGI 미들웨어, 초과 시 413).
+    Content-Length가 제한보다 크면 본문을 읽지 않고 바로 413,
+    Content-Length가 없는 chunked 요청은 수신한 바이트를 세다가 제한을 넘는 순간 중단
+    -> multipart 파서가 본문 전체를 디스크에 스풀링하기 전에 차단.
+    """
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits    # 경로 -> 최대 바이트
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            return await self.app(scope, receive, send)
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            response = JSONResponse({"detail": TOO_LARGE_DETAIL}, status_code=413, headers={"Connection": "close"})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # 본문 파싱 중 발생 -> FastAPI가 HTTPException은 그대로 전달하므로 413 응답
+                    raise HTTPException(status_code=413, detail=TOO_LARGE_DETAIL)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+# 업로드 파일 크기 검사 (Content-Length가 없는 chunked 요청 대비)
+def check_upload_size(upload: UploadFile, max_bytes: int = OCR_MAX_UPLOAD_BYTES):
+    if upload.size is not None and upload.size > max_bytes:
+        raise HTTPException(status_code=413, detail=TOO_LARGE_DETAIL)
+    if upload.size == 0:
+        raise HTTPException(status_code=400, detail="빈 이미지 파일입니다.")
+
+# 업로드 파일의 이미지 포맷 추출 (Content-Type 우선, 없으면 확장자)
+def image_format_of(upload: UploadFile) -> str:
+    if upload.content_type and upload.content_type.startswith("image/"):
+        return upload.content_type.split('/')[-1]
+    return os.path.splitext(upload.filename or "")[1].lstrip('.') or "jpg"